@@ -0,0 +1,154 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from scipy import sparse
+from src.features import FeatureFrame, key_frame, numeric_columns, select_columns
+
+
+def candidate_share_matrix(
+    primary_results: DataFrame, share: str = "party"
+) -> tuple[sparse.csr_matrix, pd.Index, DataFrame]:
+    """
+    Build a sparse county x candidate vote share matrix from primary_results in one pass.
+
+    A candidate only has entries in the counties where they were on the ballot; zero
+    shares there are stored explicitly, so the sparsity pattern tells "no votes" apart
+    from "not on the ballot".
+
+    Args:
+        primary_results (DataFrame): DataFrame containing primary vote results.
+        share (str): "party" for the share of the party's primary vote (fraction_votes), "county" for the
+            share of all primary votes in the county.
+
+    Returns:
+        tuple[sparse.csr_matrix, pd.Index, DataFrame]: The matrix, the fips code of every row and the
+        candidate and party of every column.
+    """
+    results = primary_results.dropna(subset=["fips"])
+    results = (
+        results.groupby(["fips", "party", "candidate"], sort=False)["votes"]
+        .sum()
+        .reset_index()
+    )
+    if share == "party":
+        total = results.groupby(["fips", "party"])["votes"].transform("sum")
+    elif share == "county":
+        total = results.groupby("fips")["votes"].transform("sum")
+    else:
+        raise ValueError(f"Unknown share {share!r}, use 'party' or 'county'.")
+    values = (results["votes"] / total.where(total > 0)).fillna(0).to_numpy()
+    row, fips = pd.factorize(results["fips"].astype(int), sort=True)
+    column, candidates = pd.factorize(
+        pd.MultiIndex.from_frame(results[["candidate", "party"]]), sort=True
+    )
+    matrix = sparse.csr_matrix(
+        (values, (row, column)), shape=(len(fips), len(candidates))
+    )
+    candidates = pd.DataFrame(list(candidates), columns=["candidate", "party"])
+    return matrix, pd.Index(fips, name="fips"), candidates
+
+
+def _correlate_candidates(args: tuple) -> list[dict]:
+    from scipy.stats import rankdata, t as t_dist
+
+    features, columns, names, feature_names = args
+    rows = []
+    for (county_rows, shares), (candidate, party) in zip(columns, names):
+        n = len(county_rows)
+        if n < 3:
+            continue
+        x = features[county_rows]
+        x_ranks = rankdata(x, axis=0)
+        y_ranks = rankdata(shares)
+        x_centered = x_ranks - x_ranks.mean(axis=0)
+        y_centered = y_ranks - y_ranks.mean()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rho = (x_centered.T @ y_centered) / np.sqrt(
+                (x_centered**2).sum(axis=0) * (y_centered**2).sum()
+            )
+            t_stat = rho * np.sqrt((n - 2) / (1 - rho**2))
+            x_raw = x - x.mean(axis=0)
+            slope = (x_raw.T @ (shares - shares.mean())) / (x_raw**2).sum(axis=0)
+        p_value = 2 * t_dist.sf(np.abs(t_stat), n - 2)
+        for i, feature in enumerate(feature_names):
+            rows.append(
+                {
+                    "candidate": candidate,
+                    "party": party,
+                    "feature": feature,
+                    "n": n,
+                    "Slope": slope[i],
+                    "Corr Coeff": rho[i],
+                    "p-value": p_value[i],
+                }
+            )
+    return rows
+
+
+def candidate_correlations(
+    demographics: DataFrame | FeatureFrame,
+    primary_results: DataFrame,
+    features: list[str] | None = None,
+    share: str = "party",
+    n_jobs: int | None = None,
+) -> DataFrame:
+    """
+    Correlate every demographic feature with every candidate's vote share.
+
+    The share matrix is built once and each candidate is correlated with all features
+    in one matrix product over the counties where the candidate was on the ballot.
+    Spearman correlations are computed on ranks with a t-test p-value, as spearmanr
+    does; the slope is that of the least-squares line of the share on the feature.
+    Candidates are split into chunks that run in worker processes.
+
+    Args:
+        demographics (DataFrame | FeatureFrame): Cleaned county_facts data with fips, County, state_abbreviation and State.
+        primary_results (DataFrame): DataFrame containing primary vote results.
+        features (list[str] | None): The features to correlate, all numeric columns when None.
+        share (str): "party" or "county", see candidate_share_matrix.
+        n_jobs (int | None): The number of worker processes, all CPUs when None, 1 runs in this process.
+
+    Returns:
+        DataFrame: One row per candidate and feature with party, number of counties, slope,
+        correlation coefficient and p-value.
+    """
+    feature_names = list(
+        numeric_columns(demographics) if features is None else features
+    )
+    matrix, fips, candidates = candidate_share_matrix(primary_results, share)
+    county_fips = key_frame(demographics)["fips"].astype(int).to_numpy()
+    position = pd.Index(county_fips).get_indexer(fips)
+    matched = position >= 0
+    features_block = select_columns(demographics, feature_names).to_numpy(
+        dtype=np.float64
+    )[position[matched]]
+    by_candidate = matrix[matched].tocsc()
+    columns = [
+        (
+            by_candidate.indices[by_candidate.indptr[j] : by_candidate.indptr[j + 1]],
+            by_candidate.data[by_candidate.indptr[j] : by_candidate.indptr[j + 1]],
+        )
+        for j in range(by_candidate.shape[1])
+    ]
+    names = list(candidates.itertuples(index=False, name=None))
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    chunks = np.array_split(np.arange(len(columns)), min(n_jobs, len(columns)))
+    tasks = [
+        (
+            features_block,
+            [columns[j] for j in chunk],
+            [names[j] for j in chunk],
+            feature_names,
+        )
+        for chunk in chunks
+    ]
+    if n_jobs == 1:
+        results = list(map(_correlate_candidates, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(_correlate_candidates, tasks))
+    return pd.DataFrame([row for chunk in results for row in chunk])
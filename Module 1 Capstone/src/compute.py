@@ -0,0 +1,834 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from src.features import (
+    FeatureFrame,
+    column_values,
+    feature_columns,
+    select_columns,
+)
+from src.instrumentation import traced
+
+__all__ = [
+    "extract_state_code",
+    "new_column_names",
+    "state_abbreviations_map",
+    "features_to_calculate",
+    "new_feature_names",
+    "clean_demographics",
+    "clean_primary_results",
+    "merge_demographics_with_votes",
+    "merge_demographics_with_votes_frame",
+    "merge_by_state",
+    "correlations_by_state",
+    "election_outcomes",
+    "swing_sweep",
+    "swing_sensitivity",
+    "iqr",
+    "iqr_return_outliers",
+    "calculate_correlations",
+    "no_iqr_calculate_correlations",
+    "correlations_only",
+    "no_iqr_correlations_only",
+    "feature_research",
+    "state_info",
+    "regression_residuals",
+    "residual_matrix",
+    "underperforming_counties",
+]
+
+
+def extract_state_code(x: str) -> str:
+    """
+    Extract the state code from a given input value.
+
+    Args:
+        x (str): The input value (individual element in a specific feature) from which to extract the state code.
+
+    Returns:
+        str: The extracted state code.
+
+    Examples:
+        >>> extract_state_code("1005")
+        '10'
+        >>> extract_state_code("90200126")
+        '02'
+        >>> extract_state_code("13071")
+        '13'
+    """
+    x_str = str(x)
+    if len(x_str) > 7:
+        return x_str[1:3]
+    elif len(x_str) == 6:
+        return "0" + x_str[0]
+    else:
+        return x_str[0:2]
+
+
+new_column_names = {
+    "PST045214": "Population 2014",
+    "PST120214": "Population Change 10to14 %",
+    "AGE295214": "Age Under 18 %",
+    "AGE135214": "Age Under 5 %",
+    "AGE775214": "Age Over 65 %",
+    "SEX255214": "Female %",
+    "RHI125214": "White %",
+    "RHI225214": "Black %",
+    "RHI325214": "Native %",
+    "RHI425214": "Asian %",
+    "RHI625214": "Two Or More Race %",
+    "RHI725214": "Hispanic %",
+    "RHI825214": "White Non Hispanic %",
+    "POP715213": "Same House Live 1 Year %",
+    "POP645213": "Foreign Born %",
+    "POP815213": "Non English Home %",
+    "EDU635213": "HS Grad Or Higher %",
+    "EDU685213": "Bachelor Degree Or Higher %",
+    "VET605213": "Veterans",
+    "LFE305213": "Mean Travel Time To Work",
+    "HSG010214": "Housing Units",
+    "HSG445213": "Homeownership %",
+    "HSG096213": "Multi Unit Structures %",
+    "HSG495213": "Median Housing Value",
+    "HSD410213": "Households",
+    "HSD310213": "Persons Per Household",
+    "INC910213": "Per Capita Income",
+    "INC110213": "Median Household Income",
+    "PVY020213": "Persons Below Poverty Level %",
+    "BZA010213": "Private Nonfarm Establishments",
+    "BZA110213": "Private Nonfarm Employment",
+    "BZA115213": "Private Nonfarm Employment Change",
+    "NES010213": "Nonemployer Establishments",
+    "SBO001207": "Total Firms",
+    "SBO315207": "Black Owned Firms %",
+    "SBO115207": "Native American Owned Firms %",
+    "SBO215207": "Asian Owned Firms %",
+    "SBO415207": "Hispanic Owned Firms %",
+    "SBO015207": "Women Owned Firms %",
+    "MAN450207": "Manufacturers Shipments",
+    "WTN220207": "Merchant Wholesaler Sales",
+    "RTN131207": "Retail Sales Per Capita",
+    "AFN120207": "Accommodation Food Services Sales",
+    "BPS030214": "Building Permits",
+    "LND110210": "Land Area SqMiles",
+    "POP060210": "Population Per SqMile",
+}
+
+
+state_abbreviations_map = {
+    "AL": "Alabama",
+    "AK": "Alaska",
+    "AZ": "Arizona",
+    "AR": "Arkansas",
+    "CA": "California",
+    "CO": "Colorado",
+    "CT": "Connecticut",
+    "DE": "Delaware",
+    "FL": "Florida",
+    "GA": "Georgia",
+    "HI": "Hawaii",
+    "ID": "Idaho",
+    "IL": "Illinois",
+    "IN": "Indiana",
+    "IA": "Iowa",
+    "KS": "Kansas",
+    "KY": "Kentucky",
+    "LA": "Louisiana",
+    "ME": "Maine",
+    "MD": "Maryland",
+    "MA": "Massachusetts",
+    "MI": "Michigan",
+    "MN": "Minnesota",
+    "MS": "Mississippi",
+    "MO": "Missouri",
+    "MT": "Montana",
+    "NE": "Nebraska",
+    "NV": "Nevada",
+    "NH": "New Hampshire",
+    "NJ": "New Jersey",
+    "NM": "New Mexico",
+    "NY": "New York",
+    "NC": "North Carolina",
+    "ND": "North Dakota",
+    "OH": "Ohio",
+    "OK": "Oklahoma",
+    "OR": "Oregon",
+    "PA": "Pennsylvania",
+    "RI": "Rhode Island",
+    "SC": "South Carolina",
+    "SD": "South Dakota",
+    "TN": "Tennessee",
+    "TX": "Texas",
+    "UT": "Utah",
+    "VT": "Vermont",
+    "VA": "Virginia",
+    "WA": "Washington",
+    "WV": "West Virginia",
+    "WI": "Wisconsin",
+    "WY": "Wyoming",
+}
+
+
+features_to_calculate = [
+    "Private Nonfarm Establishments",
+    "Private Nonfarm Employment",
+    "Nonemployer Establishments",
+    "Housing Units",
+    "Manufacturers Shipments",
+    "Merchant Wholesaler Sales",
+    "Retail Sales Per Capita",
+    "Accommodation Food Services Sales",
+    "Building Permits",
+]
+
+
+new_feature_names = [
+    "Private Nonfarm Establishments %",
+    "Private Nonfarm Employment %",
+    "Nonemployer Establishments %",
+    "Housing Units Per Capita",
+    "Manufacturers Shipments Per Capita",
+    "Merchant Wholesaler Sales Per Capita",
+    "Retail Sales Per Capita",
+    "Accommodation Food Services Sales Per Capita",
+    "Building Permits Per Capita",
+]
+
+
+columns_to_drop = ["PST040210", "POP010210", "RHI525214", "SBO515207", "RTN130207"]
+
+
+correlated_features = ["Total Firms", "Households", "Population Per SqMile"]
+
+
+@traced("compute")
+def clean_demographics(
+    demographics: DataFrame,
+    columns_to_drop: list[str] = columns_to_drop,
+    correlated_features: list[str] = correlated_features,
+    rows_to_drop: list[int] = [2964],
+) -> DataFrame:
+    """
+    Clean the raw county_facts table as in the notebook.
+
+    Columns are renamed to readable names, rows with missing values dropped, the state
+    name and county name added, count features turned into per-capita features and
+    strongly correlated features removed.
+
+    Args:
+        demographics (DataFrame): The raw county_facts.csv table.
+        columns_to_drop (list[str]): Raw column codes to drop before renaming.
+        correlated_features (list[str]): Features dropped after the per-capita features are calculated.
+        rows_to_drop (list[int]): Row labels of the raw table to drop, missing labels are ignored.
+
+    Returns:
+        DataFrame: fips, County, state_abbreviation, the demographic features and State.
+    """
+    demographics = demographics.drop(columns=columns_to_drop)
+    demographics = demographics.rename(columns=new_column_names).dropna()
+    demographics["State"] = demographics["state_abbreviation"].map(
+        state_abbreviations_map
+    )
+    demographics["area_name"] = demographics["area_name"].apply(
+        lambda x: " ".join(x.split()[:-1])
+    )
+    demographics = demographics.rename(columns={"area_name": "County"})
+    demographics = demographics.drop(index=rows_to_drop, errors="ignore")
+    demographics[new_feature_names] = demographics[features_to_calculate].div(
+        demographics["Population 2014"], axis=0
+    )
+    demographics[new_feature_names[:3]] *= 100
+    demographics = demographics.drop(columns=features_to_calculate)
+    demographics["Veterans"] = (
+        demographics["Veterans"] / demographics["Population 2014"]
+    ) * 100
+    demographics = demographics.rename(columns={"Veterans": "Veterans %"})
+    return demographics.drop(columns=correlated_features)
+
+
+def clean_primary_results(primary_results: DataFrame) -> DataFrame:
+    """
+    Add the two digit state FIPS code (statefp) to the raw primary_results table.
+
+    Args:
+        primary_results (DataFrame): The raw primary_results.csv table.
+
+    Returns:
+        DataFrame: primary_results with a statefp column.
+    """
+    primary_results = primary_results.copy()
+    primary_results["statefp"] = primary_results["fips"].apply(extract_state_code)
+    primary_results.loc[primary_results["state"] == "New Hampshire", "statefp"] = "33"
+    return primary_results
+
+
+@traced("compute")
+def merge_demographics_with_votes(
+    demographics_dataframe: DataFrame,
+    primary_results: DataFrame,
+    state_names: list[str],
+) -> DataFrame:
+    """
+    Merge demographic data with primary vote results for selected states.
+
+    Args:
+        demographics_dataframe (DataFrame): DataFrame containing USA county demographic data.
+        primary_results (DataFrame): DataFrame containing primary vote results.
+        state_names (List[str]): List of state names to include in the merged data.
+
+    Returns:
+        DataFrame: Merged DataFrame containing demographic data and primary vote results for selected states.
+    """
+    selected_states_primary = primary_results[
+        primary_results["state"].isin(state_names)
+    ]
+    grouped_votes = (
+        selected_states_primary.groupby(["county", "party"])["votes"]
+        .sum()
+        .reset_index()
+    )
+    votes_by_county = grouped_votes.pivot(
+        index="county", columns="party", values="votes"
+    ).reset_index()
+    votes_by_county.columns = ["County", "Democrat Votes", "Republican Votes"]
+
+    selected_states_demographics = demographics_dataframe[
+        demographics_dataframe["State"].isin(state_names)
+    ]
+    merged_data = selected_states_demographics.merge(votes_by_county, on="County")
+    merged_data["Democrat Vote %"] = (
+        merged_data["Democrat Votes"] / merged_data["Population 2014"] * 100
+    )
+    merged_data["Republican Vote %"] = (
+        merged_data["Republican Votes"] / merged_data["Population 2014"] * 100
+    )
+    return merged_data
+
+
+def merge_demographics_with_votes_frame(
+    demographics_dataframe: DataFrame,
+    primary_results: DataFrame,
+    state_names: list[str],
+    dtype=np.float64,
+) -> FeatureFrame:
+    """
+    Merge demographic data with primary vote results for selected states into a FeatureFrame.
+
+    Build the container once and pass it to calculate_correlations,
+    no_iqr_calculate_correlations and feature_research, which then take column views
+    instead of copying columns out of the merged DataFrame.
+
+    Args:
+        demographics_dataframe (DataFrame): DataFrame containing USA county demographic data.
+        primary_results (DataFrame): DataFrame containing primary vote results.
+        state_names (List[str]): List of state names to include in the merged data.
+        dtype: The dtype of the numeric block, np.float32 halves its memory.
+
+    Returns:
+        FeatureFrame: The merged data of merge_demographics_with_votes in the compact container.
+    """
+    return FeatureFrame.from_merged(
+        merge_demographics_with_votes(
+            demographics_dataframe, primary_results, state_names
+        ),
+        dtype,
+    )
+
+
+@traced("compute")
+def merge_by_state(
+    demographics_dataframe: DataFrame,
+    primary_results: DataFrame,
+    state_names: list[str],
+    min_counties: int = 3,
+) -> dict[str, DataFrame]:
+    """
+    Merge demographic data with primary vote results separately for every state.
+
+    Args:
+        demographics_dataframe (DataFrame): DataFrame containing USA county demographic data.
+        primary_results (DataFrame): DataFrame containing primary vote results.
+        state_names (list[str]): The states to merge.
+        min_counties (int): States with fewer merged counties are left out, as no correlation can be calculated.
+
+    Returns:
+        dict[str, DataFrame]: Merged data of every state, as returned by merge_demographics_with_votes.
+    """
+    merged = {
+        state: merge_demographics_with_votes(
+            demographics_dataframe, primary_results, [state]
+        )
+        for state in state_names
+    }
+    return {state: data for state, data in merged.items() if len(data) >= min_counties}
+
+
+def correlations_by_state(
+    merged_by_state: dict[str, DataFrame], remove_outliers: bool = True
+) -> DataFrame:
+    """
+    Calculate the correlations of demographic features with vote shares in every state.
+
+    Args:
+        merged_by_state (dict[str, DataFrame]): Merged data by state, as returned by merge_by_state.
+        remove_outliers (bool): Use calculate_correlations, which removes IQR outliers, instead of no_iqr_calculate_correlations.
+
+    Returns:
+        DataFrame: Correlation results indexed by State and Feature, empty when there are no states.
+    """
+    correlate = (
+        calculate_correlations if remove_outliers else no_iqr_calculate_correlations
+    )
+    tables = {
+        state: correlate(data).astype(float) for state, data in merged_by_state.items()
+    }
+    if not tables:
+        return pd.DataFrame(
+            index=pd.MultiIndex.from_tuples([], names=["State", "Feature"])
+        )
+    return pd.concat(tables, names=["State", "Feature"])
+
+
+outcome_keys = {
+    "state": ["statefp", "state_abbreviation"],
+    "county": ["fips", "county", "state_abbreviation"],
+}
+outcome_labels = {"state": "state_abbreviation", "county": "fips"}
+
+
+@traced("compute")
+def election_outcomes(
+    primary_results: DataFrame,
+    level: str = "state",
+    margins: tuple[float, ...] = (0.1,),
+) -> DataFrame:
+    """
+    Calculate the winning party, the margin and swing status of every state or county.
+
+    Votes are pivoted once into a party matrix. The margin is the difference between
+    the two largest parties divided by their mean, which for two parties is the
+    absolute relative difference used for swing states. Areas where a party has no
+    recorded votes (e.g. caucus states with only Democratic results), or that have
+    results for a single party only, get no winner or margin instead of being dropped
+    by hand.
+
+    Args:
+        primary_results (DataFrame): DataFrame containing primary vote results, with a statefp column for level "state".
+        level (str): "state" or "county".
+        margins (tuple[float, ...]): Margin thresholds, one swing column is returned for each.
+
+    Returns:
+        DataFrame: Votes per party, parties_reported, the winning party, margin and one boolean swing column per threshold.
+    """
+    keys = outcome_keys[level]
+    votes = primary_results.pivot_table(
+        index=keys, columns="party", values="votes", aggfunc="sum"
+    )
+    parties = votes.columns.to_numpy()
+    matrix = votes.to_numpy(dtype=np.float64)
+    reported = np.nan_to_num(matrix) > 0
+    complete = reported.all(axis=1) & (reported.sum(axis=1) >= 2)
+    ordered = np.sort(np.nan_to_num(matrix), axis=1)
+    ordered = np.pad(ordered, ((0, 0), (max(2 - ordered.shape[1], 0), 0)))
+    first, second = ordered[:, -1], ordered[:, -2]
+    outcomes = votes.reset_index()
+    outcomes.columns.name = None
+    outcomes["parties_reported"] = reported.sum(axis=1)
+    outcomes["party"] = np.where(
+        complete, parties[np.nan_to_num(matrix).argmax(axis=1)], None
+    )
+    outcomes["margin"] = np.where(
+        complete, (first - second) / ((first + second) / 2), np.nan
+    )
+    swing = swing_sweep(outcomes["margin"].to_numpy(), margins)
+    for margin, column in zip(margins, swing.T):
+        outcomes[f"swing_{margin:g}"] = column
+    return outcomes
+
+
+def swing_sweep(margin: np.ndarray, margins: list[float]) -> np.ndarray:
+    """
+    Classify areas as swing areas for many margin thresholds at once.
+
+    Args:
+        margin (np.ndarray): The margin of every area, NaN where it is undefined.
+        margins (list[float]): The thresholds to evaluate.
+
+    Returns:
+        np.ndarray: Boolean matrix with one row per area and one column per threshold.
+    """
+    return np.asarray(margin)[:, None] <= np.asarray(margins)[None, :]
+
+
+@traced("compute")
+def swing_sensitivity(
+    outcomes: DataFrame, margins: list[float], level: str = "state"
+) -> DataFrame:
+    """
+    Count swing areas and list them for a range of margin thresholds.
+
+    Args:
+        outcomes (DataFrame): DataFrame returned by election_outcomes.
+        margins (list[float]): The thresholds to evaluate.
+        level (str): The level outcomes were calculated at, "state" or "county".
+
+    Returns:
+        DataFrame: One row per threshold with the number of swing areas and their state
+        abbreviations or county fips codes, one per area.
+    """
+    swing = swing_sweep(outcomes["margin"].to_numpy(), margins)
+    labels = outcomes[outcome_labels[level]].to_numpy()
+    return pd.DataFrame(
+        {
+            "Swing Count": swing.sum(axis=0),
+            "Swing Areas": [list(labels[column]) for column in swing.T],
+        },
+        index=pd.Index(margins, name="Margin"),
+    )
+
+
+def iqr(df: DataFrame) -> DataFrame:
+    """
+    Filter outliers from a two-dimensional DataFrame using the Interquartile Range (IQR) method.
+
+    Args:
+        df (DataFrame): Input DataFrame containing numerical data. It should be called on a dataframe with two dimensions.
+
+    Returns:
+        DataFrame: Filtered DataFrame with outliers removed.
+    """
+    Q1 = df.quantile(0.25)
+    Q3 = df.quantile(0.75)
+    IQR = Q3 - Q1
+    lower_bound = Q1 - 1.5 * IQR
+    upper_bound = Q3 + 1.5 * IQR
+    filtered_df = df[
+        (df.iloc[:, 0] >= lower_bound.iloc[0])
+        & (df.iloc[:, 0] <= upper_bound.iloc[0])
+        & (df.iloc[:, 1] >= lower_bound.iloc[1])
+        & (df.iloc[:, 1] <= upper_bound.iloc[1])
+    ]
+    return filtered_df
+
+
+def iqr_return_outliers(df: DataFrame) -> DataFrame:
+    """
+    Identify outliers in a two-dimensional DataFrame using the Interquartile Range (IQR) method.
+
+    Args:
+        df (DataFrame): Input DataFrame containing numerical data. It should be called on a dataframe with two dimensions.
+
+    Returns:
+        DataFrame: DataFrame containing outliers identified using the IQR method.
+    """
+    Q1 = df.quantile(0.25)
+    Q3 = df.quantile(0.75)
+    IQR = Q3 - Q1
+    lower_bound = Q1 - 1.5 * IQR
+    upper_bound = Q3 + 1.5 * IQR
+    outlier_df = df[
+        (df.iloc[:, 0] < lower_bound.iloc[0])
+        | (df.iloc[:, 0] > upper_bound.iloc[0])
+        | (df.iloc[:, 1] < lower_bound.iloc[1])
+        | (df.iloc[:, 1] > upper_bound.iloc[1])
+    ]
+    return outlier_df
+
+
+@traced("compute")
+def calculate_correlations(merged_data: DataFrame | FeatureFrame) -> DataFrame:
+    """
+    Calculate correlations between demographic features and voting patterns.
+
+    Args:
+        merged_data (DataFrame | FeatureFrame): Merged demographic and voting data.
+
+    Returns:
+        DataFrame: DataFrame with correlation results for each demographic feature.
+    """
+    from scipy.stats import spearmanr
+
+    columns_to_correlate = feature_columns(merged_data)
+    columns = [
+        "Democrat Slope",
+        "Democrat Corr Coeff",
+        "Democrat p-value",
+        "Republican Slope",
+        "Republican Corr Coeff",
+        "Republican p-value",
+    ]
+    correlation_df = pd.DataFrame(index=columns_to_correlate, columns=columns)
+    for column in columns_to_correlate:
+        iqr_democrat_vote = iqr(
+            select_columns(merged_data, [column, "Democrat Vote %"])
+        )
+        iqr_republican_vote = iqr(
+            select_columns(merged_data, [column, "Republican Vote %"])
+        )
+        if iqr_democrat_vote[column].sum() < 1:
+            continue
+        D_cor_coeff, D_p_value = spearmanr(
+            iqr_democrat_vote[column], iqr_democrat_vote["Democrat Vote %"]
+        )
+        R_cor_coeff, R_p_value = spearmanr(
+            iqr_republican_vote[column], iqr_republican_vote["Republican Vote %"]
+        )
+        d_slope, _ = np.polyfit(
+            iqr_democrat_vote[column], iqr_democrat_vote["Democrat Vote %"], deg=1
+        )
+        r_slope, _ = np.polyfit(
+            iqr_republican_vote[column], iqr_republican_vote["Republican Vote %"], deg=1
+        )
+        correlation_df.at[column, "Democrat Slope"] = round(d_slope, 2)
+        correlation_df.at[column, "Republican Slope"] = round(r_slope, 2)
+        correlation_df.at[column, "Democrat Corr Coeff"] = round(D_cor_coeff, 2)
+        correlation_df.at[column, "Democrat p-value"] = round(D_p_value, 2)
+        correlation_df.at[column, "Republican Corr Coeff"] = round(R_cor_coeff, 2)
+        correlation_df.at[column, "Republican p-value"] = round(R_p_value, 2)
+    return correlation_df
+
+
+@traced("compute")
+def no_iqr_calculate_correlations(merged_data: DataFrame | FeatureFrame) -> DataFrame:
+    """
+    Calculate correlations between demographic features and voting patterns without using IQR filtering.
+
+    Args:
+        merged_data (DataFrame | FeatureFrame): Merged demographic and voting data.
+
+    Returns:
+        DataFrame: A DataFrame with correlation results for each demographic feature.
+    """
+    from scipy.stats import spearmanr
+
+    columns_to_correlate = feature_columns(merged_data)
+    democrat_vote = column_values(merged_data, "Democrat Vote %")
+    republican_vote = column_values(merged_data, "Republican Vote %")
+    columns = [
+        "Democrat Slope",
+        "Democrat Corr Coeff",
+        "Democrat p-value",
+        "Republican Slope",
+        "Republican Corr Coeff",
+        "Republican p-value",
+    ]
+    correlation_df = pd.DataFrame(index=columns_to_correlate, columns=columns)
+    for column in columns_to_correlate:
+        feature = column_values(merged_data, column)
+        if feature.sum() < 1:
+            continue
+        D_cor_coeff, D_p_value = spearmanr(feature, democrat_vote)
+        R_cor_coeff, R_p_value = spearmanr(feature, republican_vote)
+        d_slope, _ = np.polyfit(feature, democrat_vote, deg=1)
+        r_slope, _ = np.polyfit(feature, republican_vote, deg=1)
+        correlation_df.at[column, "Democrat Slope"] = round(d_slope, 2)
+        correlation_df.at[column, "Republican Slope"] = round(r_slope, 2)
+        correlation_df.at[column, "Democrat Corr Coeff"] = round(D_cor_coeff, 2)
+        correlation_df.at[column, "Democrat p-value"] = round(D_p_value, 2)
+        correlation_df.at[column, "Republican Corr Coeff"] = round(R_cor_coeff, 2)
+        correlation_df.at[column, "Republican p-value"] = round(R_p_value, 2)
+    return correlation_df
+
+
+def correlations_only(
+    demographics: DataFrame, primary_res: DataFrame, selected_states: list[str]
+) -> DataFrame:
+    """
+    Calculate correlations between demographic features and voting patterns for selected states.
+
+    Args:
+        demographics (DataFrame): DataFrame containing USA county demographic data.
+        primary_res (DataFrame): DataFrame containing primary vote results.
+        selected_states (list[str]): List of state names to include in the analysis.
+
+    Returns:
+        DataFrame: DataFrame with correlation results for each demographic feature.
+    """
+    merged_data = merge_demographics_with_votes(
+        demographics, primary_res, selected_states
+    )
+    states_correlation = calculate_correlations(merged_data)
+    return states_correlation
+
+
+def no_iqr_correlations_only(
+    demographics: DataFrame, primary_res: DataFrame, selected_states: list[str]
+) -> DataFrame:
+    """
+    Calculate correlations between demographic features and voting patterns for selected states without using IQR filtering.
+
+    Args:
+        demographics (DataFrame): DataFrame containing USA county demographic data.
+        primary_res (DataFrame): DataFrame containing primary vote results.
+        selected_states (list[str]): List of state names to include in the analysis.
+
+    Returns:
+        DataFrame: DataFrame with correlation results for each demographic feature.
+    """
+    merged_data = merge_demographics_with_votes(
+        demographics, primary_res, selected_states
+    )
+    states_correlation = no_iqr_calculate_correlations(merged_data)
+    return states_correlation
+
+
+@traced("compute")
+def feature_research(merged_data: DataFrame | FeatureFrame, feature: str) -> DataFrame:
+    """
+    Conduct research on a feature in relation to other features in the merged dataset.
+
+    Args:
+        merged_data (DataFrame | FeatureFrame): Merged demographic and voting data.
+        feature (str): The feature to research.
+
+    Returns:
+        DataFrame: DataFrame with correlation coefficients, slope, and p-values for each feature.
+    """
+    from scipy.stats import spearmanr
+
+    columns_to_correlate = feature_columns(merged_data)
+    columns_to_correlate = columns_to_correlate.drop(feature)
+    columns = ["Slope", "Corr Coeff", "p-value"]
+    correlation_df = pd.DataFrame(index=columns_to_correlate, columns=columns)
+
+    for column in columns_to_correlate:
+        iqr_merged_data = iqr(select_columns(merged_data, [column, feature]))
+        if np.all(np.round(iqr_merged_data[column], 2) == 0):
+            continue
+        slope, _ = np.polyfit(iqr_merged_data[column], iqr_merged_data[feature], deg=1)
+        cor_coeff, p_value = spearmanr(
+            iqr_merged_data[column], iqr_merged_data[feature]
+        )
+        correlation_df.at[column, "Slope"] = round(slope, 2)
+        correlation_df.at[column, "Corr Coeff"] = np.round(cor_coeff, decimals=2)
+        correlation_df.at[column, "p-value"] = np.round(p_value, decimals=2)
+    return correlation_df
+
+
+def state_info(single_state_merged: DataFrame) -> None:
+    """
+    Display information about a single state's population and voting statistics.
+
+    Args:
+        single_state_merged (DataFrame): DataFrame containing merged data for a single state.
+
+    Returns:
+        None
+    """
+    population = single_state_merged["Population 2014"].sum()
+    democrat_votes = single_state_merged["Democrat Votes"].sum()
+    democrat_vote_percent = round(democrat_votes / population * 100, 2)
+    republican_votes = single_state_merged["Republican Votes"].sum()
+    republican_vote_percent = round(republican_votes / population * 100, 2)
+    print(f"2014 State Population: {population}")
+    print(
+        f"Votes for Democrats: {democrat_votes}, {democrat_vote_percent}% of the population."
+    )
+    print(
+        f"Votes for Republicans: {republican_votes}, {republican_vote_percent}% of the population."
+    )
+
+
+def regression_residuals(data: DataFrame, feature: str) -> pd.Series:
+    """
+    Calculate each county's distance from the regression line used by point_selector.
+
+    The line is fitted on the IQR-filtered data, like in point_selector, and residuals
+    are calculated for all counties, including the outliers.
+
+    Args:
+        data (DataFrame): DataFrame containing the data.
+        feature (str): The feature on the x axis of the regression.
+
+    Returns:
+        pd.Series: Democrat Vote % minus the fitted value, indexed like data.
+    """
+    from sklearn.linear_model import LinearRegression
+
+    iqr_data = iqr(data[[feature, "Democrat Vote %"]])
+    model = LinearRegression()
+    model.fit(iqr_data[[feature]].values, iqr_data["Democrat Vote %"].values)
+    fitted = model.intercept_ + model.coef_[0] * data[feature]
+    return data["Democrat Vote %"] - fitted
+
+
+@traced("compute")
+def residual_matrix(
+    data: DataFrame, features: list[str], target: str = "Democrat Vote %"
+) -> tuple[DataFrame, DataFrame]:
+    """
+    Fit one regression line per feature in a single batched solve and return the residuals.
+
+    Every line is fitted like in point_selector: target against one feature on the
+    counties inside the IQR bounds of both. All features are solved together with
+    masked closed-form least squares, and residuals are calculated for every county.
+
+    Args:
+        data (DataFrame): DataFrame containing the data.
+        features (list[str]): The features to regress the target on.
+        target (str): The column on the y axis.
+
+    Returns:
+        tuple[DataFrame, DataFrame]: County x feature residuals and the residuals divided by
+        the residual standard deviation of the IQR-filtered counties.
+    """
+    x = data[features].to_numpy(dtype=np.float64)
+    y = data[target].to_numpy(dtype=np.float64)
+    q1, q3 = np.quantile(x, [0.25, 0.75], axis=0)
+    y_q1, y_q3 = np.quantile(y, [0.25, 0.75])
+    inside_x = (x >= q1 - 1.5 * (q3 - q1)) & (x <= q3 + 1.5 * (q3 - q1))
+    inside_y = (y >= y_q1 - 1.5 * (y_q3 - y_q1)) & (y <= y_q3 + 1.5 * (y_q3 - y_q1))
+    weights = (inside_x & inside_y[:, None]).astype(np.float64)
+
+    n = weights.sum(axis=0)
+    mean_x = (weights * x).sum(axis=0) / n
+    mean_y = weights.T @ y / n
+    dx = (x - mean_x) * weights
+    dy = (y[:, None] - mean_y) * weights
+    slope = (dx * dy).sum(axis=0) / (dx**2).sum(axis=0)
+    intercept = mean_y - slope * mean_x
+    residuals = y[:, None] - (intercept + slope * x)
+    scale = np.sqrt((weights * residuals**2).sum(axis=0) / (n - 2))
+    residuals = pd.DataFrame(residuals, index=data.index, columns=features)
+    return residuals, residuals / scale
+
+
+@traced("compute")
+def underperforming_counties(
+    data: DataFrame,
+    features: list[str],
+    threshold: float = 1.0,
+    min_features: int = 1,
+    target: str = "Democrat Vote %",
+) -> DataFrame:
+    """
+    Select counties that fall below the regression lines of several features.
+
+    Replaces hand-tuned intercept_subtract values with one standardized threshold that
+    applies to every feature.
+
+    Args:
+        data (DataFrame): DataFrame containing the data.
+        features (list[str]): The features to regress the target on.
+        threshold (float): Number of residual standard deviations below the line.
+        min_features (int): Minimum number of features on which a county must underperform.
+        target (str): The column on the y axis.
+
+    Returns:
+        DataFrame: Selected counties with the number of features they underperform on, their
+        mean standardized residual and the standardized residual for each feature.
+    """
+    _, standardized = residual_matrix(data, features, target)
+    below = standardized < -threshold
+    selected = standardized.assign(
+        County=data["County"],
+        **{
+            "Features Below": below.sum(axis=1),
+            "Mean Residual": standardized.mean(axis=1),
+        },
+    )
+    selected = selected[selected["Features Below"] >= min_features]
+    columns = ["County", "Features Below", "Mean Residual", *features]
+    return selected[columns].sort_values(
+        by=["Features Below", "Mean Residual"], ascending=[False, True]
+    )
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from pandas import DataFrame
+
+from src.compute import election_outcomes
+
+if TYPE_CHECKING:
+    from geopandas import GeoDataFrame
+    from matplotlib.axes._axes import Axes
+
+
+def county_votes(primary_results: DataFrame) -> DataFrame:
+    """
+    Sum primary votes per county and party, keyed by integer FIPS code.
+
+    Args:
+        primary_results (DataFrame): DataFrame containing primary vote results.
+
+    Returns:
+        DataFrame: County outcomes from election_outcomes with an integer fips column.
+    """
+    with_fips = primary_results.dropna(subset=["fips"])
+    outcomes = election_outcomes(with_fips, level="county")
+    outcomes["fips"] = outcomes["fips"].astype(int)
+    return outcomes.drop(columns=["county", "state_abbreviation"])
+
+
+def county_map_data(
+    geo_counties: GeoDataFrame, demographics: DataFrame, primary_results: DataFrame
+) -> GeoDataFrame:
+    """
+    Join county votes and demographics to county geometries on the integer FIPS code.
+
+    Counties are matched on GEOID == fips rather than on names, which repeat across
+    states. Counties without data keep their geometry and get missing values.
+
+    Args:
+        geo_counties (GeoDataFrame): County polygons with an integer GEOID, e.g. geometry.load_layer(..., "counties").
+        demographics (DataFrame): DataFrame containing USA county demographic data with a fips column.
+        primary_results (DataFrame): DataFrame containing primary vote results.
+
+    Returns:
+        GeoDataFrame: County polygons with demographic features, party votes and vote percentages.
+    """
+    data = demographics.merge(county_votes(primary_results), on="fips", how="left")
+    data["Democrat Vote %"] = data["Democrat"] / data["Population 2014"] * 100
+    data["Republican Vote %"] = data["Republican"] / data["Population 2014"] * 100
+    return geo_counties.merge(data, left_on="GEOID", right_on="fips", how="left")
+
+
+def add_county_values(
+    geo_data: GeoDataFrame, values: DataFrame, columns: list[str]
+) -> GeoDataFrame:
+    """
+    Add per-county values, e.g. regression residuals, to the map data by FIPS code.
+
+    Args:
+        geo_data (GeoDataFrame): Map data returned by county_map_data.
+        values (DataFrame): DataFrame with a fips column and the columns to add.
+        columns (list[str]): The columns to add.
+
+    Returns:
+        GeoDataFrame: The map data with the added columns, missing where a county has no value.
+    """
+    values = values[["fips", *columns]].astype({"fips": int})
+    return geo_data.drop(columns=columns, errors="ignore").merge(
+        values, on="fips", how="left"
+    )
+
+
+def plot_county_choropleth(
+    geo_data: GeoDataFrame,
+    column: str,
+    ax: Axes | None = None,
+    cmap: str = "coolwarm",
+    center: float | None = None,
+    rasterized: bool = True,
+) -> Axes:
+    """
+    Plot a county-level choropleth of any column of the map data.
+
+    With rasterized=True the county polygons are drawn as one raster image inside the
+    figure, which keeps saved figures small and fast to display for ~3,000 counties.
+    Use pre-simplified geometries from geometry.load_layer for the fastest drawing.
+
+    Args:
+        geo_data (GeoDataFrame): Map data returned by county_map_data or add_county_values.
+        column (str): The column to color by, e.g. "Democrat Vote %" or a residual column.
+        ax (Axes | None): The Axes to draw on, a new figure is created when None.
+        cmap (str): The Matplotlib colormap.
+        center (float | None): Value placed at the middle of the colormap, e.g. 0 for residuals.
+        rasterized (bool): Draw the polygons as a raster image.
+
+    Returns:
+        Axes: Axes of the generated map.
+    """
+    import matplotlib.pyplot as plt
+
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(12, 7))
+    limits = {}
+    if center is not None:
+        spread = np.nanmax(np.abs(geo_data[column] - center))
+        limits = {"vmin": center - spread, "vmax": center + spread}
+    geo_data.plot(
+        column=column,
+        ax=ax,
+        cmap=cmap,
+        linewidth=0,
+        legend=True,
+        legend_kwds={"shrink": 0.6},
+        missing_kwds={"color": "lightgrey"},
+        rasterized=rasterized,
+        **limits,
+    )
+    ax.set_title(f"{column} By County")
+    ax.set_xlim(-125, -66)
+    ax.set_ylim(24, 50)
+    ax.set_axis_off()
+    return ax
@@ -0,0 +1,179 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+key_columns = ["fips", "County", "state_abbreviation", "State"]
+
+
+class FeatureFrame:
+    """
+    Compact container for the merged election data.
+
+    All numeric columns are stored in one column-major NumPy block, so every column is
+    a contiguous zero-copy view, and the key columns are kept separately with County,
+    State and state_abbreviation as categoricals. Build it once with
+    merge_demographics_with_votes_frame, or FeatureFrame.from_merged, and pass it to
+    the analysis functions, which take column views from the block instead of
+    dropping the key columns; they also accept the plain DataFrame, without
+    converting it.
+    """
+
+    def __init__(self, values: np.ndarray, columns: list[str], keys: DataFrame):
+        self.values = np.asfortranarray(values)
+        self.columns = pd.Index(columns)
+        self.keys = keys
+        self.index = keys.index
+        self._positions = {column: i for i, column in enumerate(columns)}
+
+    @classmethod
+    def from_merged(cls, merged_data: DataFrame, dtype=np.float64) -> "FeatureFrame":
+        """
+        Build the container from the DataFrame returned by merge_demographics_with_votes.
+
+        Args:
+            merged_data (DataFrame): DataFrame containing merged demographic and voting data.
+            dtype: The dtype of the numeric block, np.float32 halves its memory.
+
+        Returns:
+            FeatureFrame: The container, numeric columns in their original order.
+        """
+        columns = [
+            column for column in merged_data.columns if column not in key_columns
+        ]
+        values = np.empty((len(merged_data), len(columns)), dtype=dtype, order="F")
+        for i, column in enumerate(columns):
+            values[:, i] = merged_data[column].to_numpy()
+        keys = merged_data[key_columns].astype(
+            {
+                "County": "category",
+                "state_abbreviation": "category",
+                "State": "category",
+            }
+        )
+        return cls(values, columns, keys)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """
+        Number of rows and numeric columns.
+        """
+        return self.values.shape
+
+    @property
+    def feature_columns(self) -> pd.Index:
+        """
+        Demographic feature columns, all numeric columns except the last four vote columns.
+        """
+        return self.columns[:-4]
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Return a zero-copy view of one numeric column.
+
+        Args:
+            name (str): The column name.
+
+        Returns:
+            np.ndarray: The column values.
+        """
+        return self.values[:, self._positions[name]]
+
+    def frame(self, names: list[str]) -> DataFrame:
+        """
+        Return a DataFrame with only the requested numeric columns and the original index.
+
+        Args:
+            names (list[str]): The column names.
+
+        Returns:
+            DataFrame: The selected columns.
+        """
+        return pd.DataFrame(
+            {name: self.column(name) for name in names}, index=self.index
+        )
+
+    def to_frame(self) -> DataFrame:
+        """
+        Wrap the whole numeric block in a DataFrame without copying it.
+
+        Returns:
+            DataFrame: All numeric columns.
+        """
+        return pd.DataFrame(
+            self.values, index=self.index, columns=self.columns, copy=False
+        )
+
+
+def numeric_columns(data: DataFrame | FeatureFrame) -> pd.Index:
+    """
+    Return the numeric columns of merged or cleaned data, all columns except the key columns.
+
+    Args:
+        data (DataFrame | FeatureFrame): Merged demographic and voting data, or cleaned county_facts data.
+
+    Returns:
+        pd.Index: The column names in their original order.
+    """
+    if isinstance(data, FeatureFrame):
+        return data.columns
+    return data.columns[~data.columns.isin(key_columns)]
+
+
+def feature_columns(data: DataFrame | FeatureFrame) -> pd.Index:
+    """
+    Return the demographic feature columns of merged data, all numeric columns except the last four vote columns.
+
+    Args:
+        data (DataFrame | FeatureFrame): Merged demographic and voting data.
+
+    Returns:
+        pd.Index: The column names in their original order.
+    """
+    return numeric_columns(data)[:-4]
+
+
+def column_values(data: DataFrame | FeatureFrame, name: str) -> np.ndarray:
+    """
+    Return the values of one numeric column without copying them.
+
+    Args:
+        data (DataFrame | FeatureFrame): Merged demographic and voting data, or cleaned county_facts data.
+        name (str): The column name.
+
+    Returns:
+        np.ndarray: The column values.
+    """
+    if isinstance(data, FeatureFrame):
+        return data.column(name)
+    return data[name].to_numpy()
+
+
+def select_columns(data: DataFrame | FeatureFrame, names: list[str]) -> DataFrame:
+    """
+    Return a DataFrame with only the requested numeric columns and the original index.
+
+    Args:
+        data (DataFrame | FeatureFrame): Merged demographic and voting data, or cleaned county_facts data.
+        names (list[str]): The column names.
+
+    Returns:
+        DataFrame: The selected columns.
+    """
+    if isinstance(data, FeatureFrame):
+        return data.frame(names)
+    return data[names]
+
+
+def key_frame(data: DataFrame | FeatureFrame) -> DataFrame:
+    """
+    Return the fips, County, state_abbreviation and State columns.
+
+    Args:
+        data (DataFrame | FeatureFrame): Merged demographic and voting data, or cleaned county_facts data.
+
+    Returns:
+        DataFrame: The key columns.
+    """
+    if isinstance(data, FeatureFrame):
+        return data.keys
+    return data[key_columns]
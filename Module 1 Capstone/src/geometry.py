@@ -0,0 +1,151 @@
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+import geopandas as gpd
+from geopandas import GeoDataFrame
+
+shapefile_extensions = [".shp", ".shx", ".dbf", ".prj"]
+
+default_tolerances = [0.005, 0.02, 0.05]
+
+
+def shapefile_hash(shapefile_path: str) -> str:
+    """
+    Calculate a hash of a shapefile and its sidecar files.
+
+    The hash is remembered for the path and the size and modification time of every
+    file, so repeated load_layer calls do not read the shapefile again.
+
+    Args:
+        shapefile_path (str): Path to the .shp file.
+
+    Returns:
+        str: The first 16 characters of the SHA-256 hex digest.
+    """
+    path = Path(shapefile_path).resolve()
+    parts = [path.with_suffix(extension) for extension in shapefile_extensions]
+    stamps = tuple(
+        (part.stat().st_size, part.stat().st_mtime_ns) if part.exists() else None
+        for part in parts
+    )
+    return _hash_files(tuple(parts), stamps)
+
+
+@lru_cache(maxsize=None)
+def _hash_files(parts: tuple[Path, ...], stamps: tuple) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        if part.exists():
+            with open(part, "rb") as file:
+                for block in iter(lambda: file.read(1 << 20), b""):
+                    digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def read_counties(shapefile_path: str) -> GeoDataFrame:
+    """
+    Read the county shapefile, keeping the identifiers used in the analysis.
+
+    GEOID is kept as an integer FIPS code so it can be joined to county_facts and
+    primary_results without float casts.
+
+    Args:
+        shapefile_path (str): Path to the county .shp file.
+
+    Returns:
+        GeoDataFrame: Counties with STATEFP, GEOID, NAME and geometry columns.
+    """
+    geo_counties = gpd.read_file(shapefile_path)
+    geo_counties["GEOID"] = geo_counties["GEOID"].astype(int)
+    return geo_counties[["STATEFP", "GEOID", "NAME", "geometry"]]
+
+
+def build_layers(
+    shapefile_path: str,
+    tolerances: list[float] = default_tolerances,
+    cache_dir: str = "geometry_cache",
+) -> Path:
+    """
+    Dissolve counties into states once, simplify both layers and store them as GeoParquet.
+
+    Layers are written to a folder named after the shapefile hash, so a changed shapefile
+    gets a new cache and an unchanged one is never processed twice. Each polygon is
+    simplified on its own, so small gaps between neighbours can appear at the coarser
+    tolerances, which are meant for small figures.
+
+    Args:
+        shapefile_path (str): Path to the county .shp file.
+        tolerances (list[float]): Simplification tolerances in degrees, 0 keeps full resolution.
+        cache_dir (str): Folder in which the cached layers are stored.
+
+    Returns:
+        Path: The folder with the cached layers.
+    """
+    folder = Path(cache_dir) / shapefile_hash(shapefile_path)
+    expected = [
+        folder / f"{level}_{tolerance:g}.parquet"
+        for level in ["counties", "states"]
+        for tolerance in [0, *tolerances]
+    ]
+    if all(path.exists() for path in expected):
+        return folder
+    folder.mkdir(parents=True, exist_ok=True)
+    geo_counties = read_counties(shapefile_path)
+    geo_states = (
+        geo_counties[["STATEFP", "geometry"]].dissolve(by="STATEFP").reset_index()
+    )
+    for level, layer in [("counties", geo_counties), ("states", geo_states)]:
+        for tolerance in [0, *tolerances]:
+            simplified = layer.copy()
+            if tolerance:
+                simplified["geometry"] = simplified.simplify(
+                    tolerance, preserve_topology=True
+                )
+            simplified.to_parquet(folder / f"{level}_{tolerance:g}.parquet")
+    return folder
+
+
+def load_layer(
+    shapefile_path: str,
+    level: str = "states",
+    tolerance: float = 0.02,
+    cache_dir: str = "geometry_cache",
+) -> GeoDataFrame:
+    """
+    Load a cached state or county layer, building the cache first if it is missing.
+
+    Args:
+        shapefile_path (str): Path to the county .shp file.
+        level (str): "states" or "counties".
+        tolerance (float): One of the cached simplification tolerances, 0 for full resolution.
+        cache_dir (str): Folder in which the cached layers are stored.
+
+    Returns:
+        GeoDataFrame: The requested layer.
+    """
+    path = (
+        Path(cache_dir)
+        / shapefile_hash(shapefile_path)
+        / f"{level}_{tolerance:g}.parquet"
+    )
+    if not path.exists():
+        tolerances = sorted(set(default_tolerances) | {tolerance} - {0})
+        build_layers(shapefile_path, tolerances, cache_dir)
+    return gpd.read_parquet(path)
+
+
+def tolerance_for_width(width_inches: float, extent_degrees: float = 59) -> float:
+    """
+    Pick the coarsest cached tolerance that is still below one pixel at a given figure width.
+
+    Args:
+        width_inches (float): The width of the figure in inches.
+        extent_degrees (float): The longitude range shown, 59 degrees for the contiguous USA.
+
+    Returns:
+        float: The tolerance to pass to load_layer.
+    """
+    pixel = extent_degrees / (width_inches * 100)
+    fitting = [tolerance for tolerance in default_tolerances if tolerance <= pixel]
+    return max(fitting) if fitting else 0
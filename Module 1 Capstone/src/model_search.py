@@ -0,0 +1,335 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+key_columns = ["fips", "County", "state_abbreviation", "State"]
+
+
+def feature_columns(merged_data: DataFrame) -> list[str]:
+    """
+    List the demographic feature columns of a merged DataFrame.
+
+    Like calculate_correlations, the last four columns (votes and vote percentages) and
+    the key columns are excluded, as are features that are constant in the selection.
+
+    Args:
+        merged_data (DataFrame): DataFrame containing merged demographic and voting data.
+
+    Returns:
+        list[str]: The feature names.
+    """
+    columns = [column for column in merged_data.columns if column not in key_columns]
+    features = merged_data[columns[:-4]]
+    return features.columns[features.std() > 0].tolist()
+
+
+class RegressionMoments:
+    """
+    Cached first and second moments of features and target, split into folds.
+
+    Sums of x, y, x x' and x y are stored per fold, so the Gram matrix of any feature
+    subset, and of any training split, is obtained by indexing and subtracting cached
+    sums instead of touching the rows again. Adding or removing a feature only changes
+    which rows and columns of the cached matrices are used.
+    """
+
+    def __init__(
+        self,
+        merged_data: DataFrame,
+        target: str = "Democrat Vote %",
+        features: list[str] | None = None,
+        n_folds: int = 5,
+        seed: int = 0,
+    ):
+        self.features = features or feature_columns(merged_data)
+        x = merged_data[self.features].to_numpy(dtype=np.float64)
+        y = merged_data[target].to_numpy(dtype=np.float64)
+        n_folds = min(n_folds, len(y))
+        fold = np.random.default_rng(seed).permutation(len(y)) % n_folds
+        self.n = np.bincount(fold, minlength=n_folds).astype(np.float64)
+        self.sx = np.stack([x[fold == f].sum(axis=0) for f in range(n_folds)])
+        self.sy = np.array([y[fold == f].sum() for f in range(n_folds)])
+        self.sxx = np.stack([x[fold == f].T @ x[fold == f] for f in range(n_folds)])
+        self.sxy = np.stack([x[fold == f].T @ y[fold == f] for f in range(n_folds)])
+        self.syy = np.array([y[fold == f] @ y[fold == f] for f in range(n_folds)])
+
+    def moments(self, folds: np.ndarray) -> tuple:
+        """
+        Add up the cached sums of the selected folds.
+
+        Args:
+            folds (np.ndarray): Boolean mask of the folds to include.
+
+        Returns:
+            tuple: n, sum of x, sum of y, sum of x x', sum of x y and sum of y y.
+        """
+        return (
+            self.n[folds].sum(),
+            self.sx[folds].sum(axis=0),
+            self.sy[folds].sum(),
+            self.sxx[folds].sum(axis=0),
+            self.sxy[folds].sum(axis=0),
+            self.syy[folds].sum(),
+        )
+
+    def fit(
+        self, features: list[str] | None = None, alpha: float = 0.0, folds=None
+    ) -> tuple[float, pd.Series]:
+        """
+        Fit a ridge regression on a feature subset from the cached moments.
+
+        Args:
+            features (list[str] | None): The features to use, all features when None.
+            alpha (float): Ridge penalty on standardized coefficients, 0 for least squares.
+            folds (np.ndarray | None): Boolean mask of the folds to fit on, all folds when None.
+
+        Returns:
+            tuple[float, pd.Series]: Intercept and coefficients in the original units.
+        """
+        features = features or self.features
+        index = [self.features.index(feature) for feature in features]
+        folds = np.ones(len(self.n), dtype=bool) if folds is None else folds
+        intercept, coef = _ridge(self.moments(folds), np.array(index), alpha)
+        return intercept, pd.Series(coef, index=features)
+
+    def score(self, features: list[str] | None = None, alpha: float = 0.0) -> dict:
+        """
+        Calculate the in-sample R squared and cross-validated RMSE of a feature subset.
+
+        Args:
+            features (list[str] | None): The features to use, all features when None.
+            alpha (float): Ridge penalty on standardized coefficients.
+
+        Returns:
+            dict: r2 on all counties and cv_rmse over the folds.
+        """
+        features = features or self.features
+        index = np.array([self.features.index(feature) for feature in features])
+        return _score_subset(self._arrays(), index, alpha)
+
+    def _arrays(self) -> tuple:
+        return (self.n, self.sx, self.sy, self.sxx, self.sxy, self.syy)
+
+
+def _standardized(moments: tuple, index: np.ndarray) -> tuple:
+    """
+    Build the correlation matrix of the selected features and their correlation with the target.
+
+    Args:
+        moments (tuple): n, sums of x, y, x x', x y and y y.
+        index (np.ndarray): Positions of the selected features.
+
+    Returns:
+        tuple: Feature means, target mean, feature standard deviations, correlation matrix and target vector.
+    """
+    n, sx, sy, sxx, sxy, syy = moments
+    mean_x = sx[index] / n
+    mean_y = sy / n
+    cov_xx = sxx[np.ix_(index, index)] / n - np.outer(mean_x, mean_x)
+    cov_xy = sxy[index] / n - mean_x * mean_y
+    scale = np.sqrt(np.maximum(np.diag(cov_xx), 1e-12))
+    return mean_x, mean_y, scale, cov_xx / np.outer(scale, scale), cov_xy / scale
+
+
+def _ridge(moments: tuple, index: np.ndarray, alpha: float) -> tuple[float, np.ndarray]:
+    """
+    Solve a ridge regression from moments.
+
+    Args:
+        moments (tuple): n, sums of x, y, x x', x y and y y.
+        index (np.ndarray): Positions of the selected features.
+        alpha (float): Ridge penalty on standardized coefficients.
+
+    Returns:
+        tuple[float, np.ndarray]: Intercept and coefficients in the original units.
+    """
+    mean_x, mean_y, scale, gram, target = _standardized(moments, index)
+    penalty = alpha * np.eye(len(index))
+    beta = np.linalg.lstsq(gram + penalty, target, rcond=None)[0] / scale
+    return mean_y - mean_x @ beta, beta
+
+
+def _sse(moments: tuple, index: np.ndarray, intercept: float, beta: np.ndarray):
+    """
+    Calculate the sum of squared errors of a linear model on the rows behind the moments.
+
+    Args:
+        moments (tuple): n, sums of x, y, x x', x y and y y.
+        index (np.ndarray): Positions of the features used by the model.
+        intercept (float): The model intercept.
+        beta (np.ndarray): The model coefficients.
+
+    Returns:
+        float: The sum of squared errors.
+    """
+    n, sx, sy, sxx, sxy, syy = moments
+    sx, sxy, sxx = sx[index], sxy[index], sxx[np.ix_(index, index)]
+    return (
+        syy
+        - 2 * intercept * sy
+        - 2 * beta @ sxy
+        + n * intercept**2
+        + 2 * intercept * beta @ sx
+        + beta @ sxx @ beta
+    )
+
+
+def _score_subset(arrays: tuple, index: np.ndarray, alpha: float) -> dict:
+    """
+    Score one feature subset with in-sample R squared and cross-validated RMSE.
+
+    Args:
+        arrays (tuple): Per-fold n and sums of x, y, x x', x y and y y.
+        index (np.ndarray): Positions of the selected features.
+        alpha (float): Ridge penalty on standardized coefficients.
+
+    Returns:
+        dict: r2 and cv_rmse of the subset.
+    """
+    n_folds = len(arrays[0])
+    every = np.ones(n_folds, dtype=bool)
+    total = tuple(array[every].sum(axis=0) for array in arrays)
+    intercept, beta = _ridge(total, index, alpha)
+    n, _, sy, _, _, syy = total
+    r2 = 1 - _sse(total, index, intercept, beta) / (syy - sy**2 / n)
+    errors = 0.0
+    for fold in range(n_folds):
+        test = np.arange(n_folds) == fold
+        train = tuple(array[~test].sum(axis=0) for array in arrays)
+        held_out = tuple(array[test].sum(axis=0) for array in arrays)
+        intercept, beta = _ridge(train, index, alpha)
+        errors += _sse(held_out, index, intercept, beta)
+    return {"r2": r2, "cv_rmse": np.sqrt(max(errors, 0) / n)}
+
+
+def _score_chunk(arrays: tuple, subsets: list[tuple], alpha: float) -> list[dict]:
+    return [_score_subset(arrays, np.array(subset), alpha) for subset in subsets]
+
+
+def best_subset_search(
+    moments: RegressionMoments,
+    max_size: int = 3,
+    alpha: float = 0.0,
+    n_jobs: int | None = None,
+    chunk_size: int = 2000,
+) -> DataFrame:
+    """
+    Rank every feature combination up to max_size features by cross-validated RMSE.
+
+    Each combination is scored from the cached fold moments, and chunks of
+    combinations are scored in parallel worker processes.
+
+    Args:
+        moments (RegressionMoments): The cached moments of the state selection.
+        max_size (int): The largest number of features in a combination.
+        alpha (float): Ridge penalty on standardized coefficients.
+        n_jobs (int | None): The number of worker processes, all CPUs when None, 1 runs in this process.
+        chunk_size (int): The number of combinations scored per task.
+
+    Returns:
+        DataFrame: Features, number of features, R squared and CV RMSE, best first.
+    """
+    subsets = [
+        subset
+        for size in range(1, max_size + 1)
+        for subset in itertools.combinations(range(len(moments.features)), size)
+    ]
+    chunks = [
+        subsets[start : start + chunk_size]
+        for start in range(0, len(subsets), chunk_size)
+    ]
+    arrays = moments._arrays()
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1 or len(chunks) == 1:
+        scores = [_score_chunk(arrays, chunk, alpha) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            scores = list(
+                executor.map(
+                    _score_chunk,
+                    [arrays] * len(chunks),
+                    chunks,
+                    [alpha] * len(chunks),
+                )
+            )
+    result = pd.DataFrame([score for chunk in scores for score in chunk]).rename(
+        columns={"r2": "R2", "cv_rmse": "CV RMSE"}
+    )
+    result.insert(0, "Features", [[moments.features[i] for i in s] for s in subsets])
+    result.insert(1, "Size", [len(subset) for subset in subsets])
+    return result.sort_values(by="CV RMSE").reset_index(drop=True)
+
+
+def ridge_path(moments: RegressionMoments, alphas: list[float]) -> DataFrame:
+    """
+    Calculate standardized ridge coefficients of all features for a range of penalties.
+
+    Args:
+        moments (RegressionMoments): The cached moments of the state selection.
+        alphas (list[float]): The ridge penalties.
+
+    Returns:
+        DataFrame: One row per penalty and one column per feature.
+    """
+    every = np.ones(len(moments.n), dtype=bool)
+    index = np.arange(len(moments.features))
+    _, _, _, gram, target = _standardized(moments.moments(every), index)
+    values, vectors = np.linalg.eigh(gram)
+    projected = vectors.T @ target
+    path = [vectors @ (projected / (values + alpha)) for alpha in alphas]
+    return pd.DataFrame(
+        path, index=pd.Index(alphas, name="alpha"), columns=moments.features
+    )
+
+
+def lasso_path(
+    moments: RegressionMoments,
+    alphas: list[float] | None = None,
+    max_iter: int = 1000,
+    tol: float = 1e-6,
+) -> DataFrame:
+    """
+    Calculate standardized lasso coefficients for a decreasing range of penalties.
+
+    Coordinate descent runs on the cached correlation matrix (covariance updates), so
+    each sweep costs one pass over the features instead of one pass over the counties,
+    and each penalty starts from the solution of the previous one.
+
+    Args:
+        moments (RegressionMoments): The cached moments of the state selection.
+        alphas (list[float] | None): The penalties, 30 log-spaced values when None.
+        max_iter (int): The maximum number of coordinate descent sweeps per penalty.
+        tol (float): Stop when no coefficient changes by more than this.
+
+    Returns:
+        DataFrame: One row per penalty and one column per feature; zero means the feature is dropped.
+    """
+    every = np.ones(len(moments.n), dtype=bool)
+    index = np.arange(len(moments.features))
+    _, _, _, gram, target = _standardized(moments.moments(every), index)
+    if alphas is None:
+        alpha_max = np.abs(target).max()
+        alphas = alpha_max * np.logspace(0, -3, 30)
+    beta = np.zeros(len(index))
+    diagonal = np.maximum(np.diag(gram), 1e-12)
+    path = []
+    for alpha in sorted(alphas, reverse=True):
+        for _ in range(max_iter):
+            largest_change = 0.0
+            for j in range(len(beta)):
+                partial = target[j] - gram[j] @ beta + diagonal[j] * beta[j]
+                updated = np.sign(partial) * max(abs(partial) - alpha, 0) / diagonal[j]
+                largest_change = max(largest_change, abs(updated - beta[j]))
+                beta[j] = updated
+            if largest_change < tol:
+                break
+        path.append(beta.copy())
+    return pd.DataFrame(
+        path,
+        index=pd.Index(sorted(alphas, reverse=True), name="alpha"),
+        columns=moments.features,
+    )
@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+from pandas import DataFrame
+from src.compute import iqr, iqr_return_outliers
+from src.features import select_columns
+from src.instrumentation import traced
+
+if TYPE_CHECKING:
+    from matplotlib.axes._axes import Axes
+
+__all__ = [
+    "plot_features_with_outliers_annotated",
+    "plot_features_no_outliers",
+    "individual_point_selector",
+    "point_selector",
+    "plot_state_winners",
+    "highlight_counties",
+]
+
+
+@traced("render")
+def plot_features_with_outliers_annotated(data: DataFrame, features: list[str]):
+    """
+    Plot features against Democrat Vote Percentage with outliers annotated.
+
+    Args:
+        data (DataFrame): DataFrame containing the data to plot.
+        features (list[str]): List of feature names to plot against Democrat Vote Percentage.
+
+    Returns:
+        axes: Axes of the generated plots.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    num_features = len(features)
+    num_cols = 2
+    num_rows = (num_features + 1) // num_cols
+    if num_features % num_cols != 0:
+        num_rows += 1
+    fig, axes = plt.subplots(num_rows, num_cols, figsize=(12, 4 * num_rows))
+    normalized_population = np.log1p(data["Population 2014"])
+    for i, feature in enumerate(features):
+        if num_rows > 1:
+            row, col = divmod(i, num_cols)
+            ax = axes[row, col]
+        else:
+            ax = axes[i]
+        ax = sns.scatterplot(
+            x=feature,
+            y="Democrat Vote %",
+            data=data,
+            size=normalized_population * 2,
+            color="#1f77b4",
+            legend=False,
+            ax=ax,
+        )
+        sns.regplot(
+            x=feature,
+            y="Democrat Vote %",
+            data=data,
+            scatter=False,
+            ci=None,
+            line_kws={"color": "skyblue"},
+            ax=ax,
+        )
+        for line in range(0, data.shape[0]):
+            ax.annotate(
+                data["County"].iloc[line],
+                (data[feature].iloc[line], data["Democrat Vote %"].iloc[line]),
+                textcoords="offset points",
+                xytext=(0, 3),
+                ha="center",
+                fontsize="small",
+            )
+        ax.set_title(f"{feature} vs. Democrat Vote Percentage")
+
+        x_padding = 0.03 * (ax.get_xlim()[1] - ax.get_xlim()[0])
+        y_padding = 0.03 * (ax.get_ylim()[1] - ax.get_ylim()[0])
+        ax.set_xlim(ax.get_xlim()[0] - x_padding, ax.get_xlim()[1] + x_padding)
+        ax.set_ylim(ax.get_ylim()[0] - y_padding, ax.get_ylim()[1] + y_padding)
+
+    for i in range(num_features, num_rows * num_cols):
+        if num_rows > 1:
+            fig.delaxes(axes.flatten()[i])
+        else:
+            fig.delaxes(axes[i])
+    plt.tight_layout(h_pad=2)
+    return axes
+
+
+@traced("render")
+def plot_features_no_outliers(data: DataFrame, features: list[str]):
+    """
+    Plot features against Democrat Vote Percentage with regression lines and no outliers.
+
+    Args:
+        data (DataFrame): DataFrame containing the data to plot.
+        features (list[str]): List of feature names to plot against Democrat Vote Percentage.
+
+    Returns:
+        axes: Axes of the generated plots.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from sklearn.linear_model import LinearRegression
+
+    num_features = len(features)
+    num_cols = 2
+    num_rows = (num_features + 1) // num_cols
+    if num_features % num_cols != 0:
+        num_rows += 1
+    fig, axes = plt.subplots(num_rows, num_cols, figsize=(12, 4 * num_rows))
+    normalized_population = np.log1p(data["Population 2014"])
+    for i, feature in enumerate(features):
+        if num_rows > 1:
+            row, col = divmod(i, num_cols)
+            ax = axes[row, col]
+        else:
+            ax = axes[i]
+        ax = sns.scatterplot(
+            x=feature,
+            y="Democrat Vote %",
+            data=data,
+            size=normalized_population * 2,
+            legend=False,
+            ax=ax,
+        )
+        feature_vote = select_columns(data, [feature, "Democrat Vote %"])
+        iqr_data = iqr(feature_vote)
+        X = iqr_data[[feature]]
+        y = iqr_data["Democrat Vote %"]
+        model = LinearRegression().fit(X, y)
+        slope = model.coef_[0]
+        intercept = model.intercept_
+        x_values = np.array([data[feature].min(), data[feature].max()])
+        y_values = slope * x_values + intercept
+        ax.plot(x_values, y_values, color="skyblue")
+
+        outliers = iqr_return_outliers(feature_vote)
+        sns.scatterplot(
+            x=feature,
+            y="Democrat Vote %",
+            data=outliers,
+            size=normalized_population,
+            legend=False,
+            ax=ax,
+            color="Turquoise",
+        )
+        ax.set_title(f"{feature} vs. Democrat Vote Percentage")
+    for i in range(num_features, num_rows * num_cols):
+        if num_rows > 1:
+            fig.delaxes(axes.flatten()[i])
+        else:
+            fig.delaxes(axes[i])
+    plt.tight_layout(h_pad=2)
+    return axes
+
+
+def individual_point_selector(
+    data: DataFrame, ax: Axes, county_names: list[str]
+) -> None:
+    """
+    Select and highlight individual data points from specified counties on a scatter plot.
+
+    Args:
+        data (DataFrame): DataFrame containing the data.
+        ax (Axes): The Axes object representing the scatter plot.
+        county_names (list[str]): List of county names to select and highlight.
+
+    Returns:
+        None
+    """
+    import seaborn as sns
+
+    feature = ax.get_xlabel()
+    normalized_population = np.log1p(data["Population 2014"])
+    filtered_data = data[data["County"].isin(county_names)]
+    sns.scatterplot(
+        x=feature,
+        y="Democrat Vote %",
+        data=filtered_data,
+        size=normalized_population * 2,
+        color="red",
+        legend=False,
+        ax=ax,
+    )
+
+
+def point_selector(data: DataFrame, ax: Axes, intercept_subtract: float) -> list[str]:
+    """
+    Select data points below a regression line on a scatter plot.
+
+    Args:
+        data (DataFrame): DataFrame containing the data.
+        ax (Axes): The Axes object representing the scatter plot.
+        intercept_subtract (float): Value to subtract from the intercept of the regression line.
+
+    Returns:
+        list[str]: List of county names for data points below the regression line.
+    """
+    from sklearn.linear_model import LinearRegression
+
+    feature = ax.get_xlabel()
+    iqr_data = iqr(data[[feature, "Democrat Vote %"]])
+    X = iqr_data[feature].values.reshape(-1, 1)
+    y = iqr_data["Democrat Vote %"].values
+    model = LinearRegression()
+    model.fit(X, y)
+    intercept = model.intercept_ - intercept_subtract
+    slope = model.coef_[0]
+    below_line = data[data["Democrat Vote %"] < (intercept + slope * data[feature])]
+    ax.scatter(
+        below_line[feature],
+        below_line["Democrat Vote %"],
+        color="none",
+        edgecolor="red",
+        linewidth=1.2,
+        s=120,
+        alpha=0.7,
+    )
+    return below_line["County"].tolist()
+
+
+@traced("render")
+def plot_state_winners(
+    geo_states: DataFrame, state_winner: DataFrame, swing_states: DataFrame
+) -> Axes:
+    """
+    Plot a map of primary winners by state with swing states hatched.
+
+    Args:
+        geo_states (DataFrame): State polygons with a STATEFP column, e.g. a cached layer from geometry.load_layer.
+        state_winner (DataFrame): DataFrame with statefp, state_abbreviation and party of the winner.
+        swing_states (DataFrame): DataFrame with statefp of the swing states.
+
+    Returns:
+        Axes: Axes of the generated map.
+    """
+    import matplotlib.pyplot as plt
+
+    geo_state_winners = geo_states.merge(
+        state_winner, left_on="STATEFP", right_on="statefp", how="inner"
+    )
+    geo_swing_states = geo_states.merge(
+        swing_states, left_on="STATEFP", right_on="statefp", how="inner"
+    )
+    fig, ax = plt.subplots(figsize=(10, 6))
+    geo_state_winners.plot(
+        ax=ax,
+        color=geo_state_winners["party"].map(
+            {"Democrat": "#5d5dd9", "Republican": "#d95d5d"}
+        ),
+        edgecolor="white",
+        linewidth=1,
+    )
+    geo_swing_states.plot(
+        ax=ax, color="none", edgecolor="yellow", linewidth=0, hatch="//", alpha=1
+    )
+    points = geo_state_winners.representative_point()
+    for x, y, abbv in zip(points.x, points.y, geo_state_winners["state_abbreviation"]):
+        ax.annotate(
+            text=abbv,
+            xy=(x, y),
+            fontsize=8,
+            color="black",
+            ha="center",
+            va="center",
+            weight="light",
+        )
+    ax.set_title("State Winners with Swing States Overlay According to Primary Results")
+    ax.set_xlim(-125, -66)
+    ax.set_ylim(24, 50)
+    ax.set_axis_off()
+    return ax
+
+
+@traced("render")
+def highlight_counties(
+    data: DataFrame, axes, features: list[str], county_names: list[str]
+) -> None:
+    """
+    Circle selected counties on the plots made by plot_features_no_outliers.
+
+    Args:
+        data (DataFrame): DataFrame containing the data.
+        axes: Axes returned by plot_features_no_outliers, in the same order as features.
+        features (list[str]): The features plotted on the axes.
+        county_names (list[str]): The counties to circle.
+
+    Returns:
+        None
+    """
+    selected = data[data["County"].isin(county_names)]
+    for ax, feature in zip(np.ravel(axes), features):
+        ax.scatter(
+            selected[feature],
+            selected["Democrat Vote %"],
+            color="none",
+            edgecolor="red",
+            linewidth=1.2,
+            s=120,
+            alpha=0.7,
+        )
@@ -0,0 +1,179 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from src.features import FeatureFrame, key_frame, numeric_columns, select_columns
+
+
+class CountySimilarity:
+    """
+    Exact nearest-neighbour index of counties on their standardized demographic features.
+
+    The feature block is standardized once and kept as one contiguous matrix together
+    with the squared row norms, so a query is a single matrix-vector product and an
+    argpartition. With around 50 features a KD-tree or ball tree prunes almost nothing,
+    so the exact batched search is as fast and needs no extra dependency; a national
+    query over all counties takes well under a millisecond.
+    """
+
+    def __init__(
+        self,
+        demographics: DataFrame | FeatureFrame,
+        outcomes: DataFrame | None = None,
+        features: list[str] | None = None,
+        scaling: str = "rank",
+    ):
+        """
+        Build the index.
+
+        Args:
+            demographics (DataFrame | FeatureFrame): Cleaned county_facts data with fips, County, state_abbreviation and State.
+            outcomes (DataFrame | None): County results from election_outcomes(primary_results, level="county"), joined on fips.
+            features (list[str] | None): The features to compare counties on, all numeric columns when None.
+            scaling (str): "rank" standardizes percentile ranks, which keeps heavy-tailed counts such as population
+                from dominating the distance, "zscore" standardizes the raw values.
+        """
+        self.features = list(
+            numeric_columns(demographics) if features is None else features
+        )
+        values = select_columns(demographics, self.features)
+        if scaling == "rank":
+            values = values.rank(pct=True)
+        elif scaling != "zscore":
+            raise ValueError(f"Unknown scaling {scaling!r}, use 'rank' or 'zscore'.")
+        values = values.to_numpy(dtype=np.float64)
+        std = values.std(axis=0)
+        self.matrix = np.ascontiguousarray(
+            (values - values.mean(axis=0)) / np.where(std > 0, std, 1)
+        )
+        self.norms = np.einsum("ij,ij->i", self.matrix, self.matrix)
+        self.counties = (
+            key_frame(demographics)
+            .reset_index(drop=True)
+            .astype({"County": str, "state_abbreviation": str, "State": str})
+        )
+        self.counties["fips"] = self.counties["fips"].astype(int)
+        self.outcomes = None
+        if outcomes is not None:
+            self.outcomes = (
+                outcomes.assign(fips=outcomes["fips"].astype(int))
+                .drop(columns=["county", "state_abbreviation"], errors="ignore")
+                .set_index("fips")
+                .reindex(self.counties["fips"])
+                .reset_index(drop=True)
+            )
+        self._by_fips = {fips: row for row, fips in enumerate(self.counties["fips"])}
+        self._by_name = self.counties.groupby("County").indices
+        self._states = self.counties[["state_abbreviation", "State"]].to_numpy()
+        self._subsets = {}
+
+    def locate(self, counties: list[str | int], state: str | None = None) -> np.ndarray:
+        """
+        Find the rows of counties given by fips code or by name.
+
+        Args:
+            counties (list[str | int]): fips codes or county names, e.g. ["La Paz", "Mohave", "Yuma"].
+            state (str | None): State name or abbreviation for names that exist in several states.
+
+        Returns:
+            np.ndarray: Row positions in the index.
+        """
+        rows = []
+        for county in counties:
+            if isinstance(county, (int, np.integer)):
+                found = [self._by_fips[county]] if county in self._by_fips else []
+            else:
+                found = self._by_name.get(county, [])
+                if state is not None:
+                    found = [row for row in found if state in self._states[row]]
+            if len(found) != 1:
+                where = f" in {state}" if state else ""
+                raise ValueError(
+                    f"{county!r}{where} matches {len(found)} counties, pass a fips code or a state."
+                )
+            rows.append(found[0])
+        return np.array(rows)
+
+    def _in_states(self, states: list[str]) -> pd.Series:
+        return self.counties["state_abbreviation"].isin(states) | self.counties[
+            "State"
+        ].isin(states)
+
+    def _candidates(self, states: list[str] | None) -> np.ndarray | None:
+        if states is None:
+            return None
+        key = frozenset(states)
+        if key not in self._subsets:
+            self._subsets[key] = np.flatnonzero(self._in_states(states))
+        return self._subsets[key]
+
+    def neighbours(
+        self, rows: np.ndarray, k: int = 5, states: list[str] | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Exact k nearest neighbours of a batch of indexed counties, excluding each county itself.
+
+        Args:
+            rows (np.ndarray): Row positions of the query counties.
+            k (int): The number of neighbours.
+            states (list[str] | None): Only search counties in these states, names or abbreviations.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Neighbour rows and Euclidean distances, one row per query, nearest first.
+        """
+        rows = np.atleast_1d(rows)
+        candidates = self._candidates(states)
+        if candidates is None:
+            matrix, norms = self.matrix, self.norms
+        else:
+            matrix, norms = self.matrix[candidates], self.norms[candidates]
+        queries = self.matrix[rows]
+        distances = norms[None, :] - 2 * queries @ matrix.T + self.norms[rows, None]
+        positions = np.arange(len(norms)) if candidates is None else candidates
+        distances[positions[None, :] == rows[:, None]] = np.inf
+        k = min(k, len(positions) - np.isin(rows, positions).any())
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        nearest_distances = np.take_along_axis(distances, nearest, axis=1)
+        order = np.argsort(nearest_distances, axis=1)
+        nearest = np.take_along_axis(nearest, order, axis=1)
+        nearest_distances = np.take_along_axis(nearest_distances, order, axis=1)
+        return positions[nearest], np.sqrt(np.maximum(nearest_distances, 0))
+
+    def similar(
+        self,
+        counties: list[str | int],
+        k: int = 5,
+        states: list[str] | None = None,
+        state: str | None = None,
+    ) -> DataFrame:
+        """
+        List the k most similar counties to each given county, with how they voted.
+
+        Args:
+            counties (list[str | int]): fips codes or county names.
+            k (int): The number of similar counties per county.
+            states (list[str] | None): Only search counties in these states, nationally when None.
+            state (str | None): State of the named counties, needed when a name exists in several states.
+
+        Returns:
+            DataFrame: One row per query county and neighbour with the rank, distance, neighbour keys and,
+            when outcomes were given, the neighbour's county results.
+        """
+        rows = self.locate(counties, state)
+        nearest, distances = self.neighbours(rows, k, states)
+        query = self.counties.iloc[np.repeat(rows, nearest.shape[1])]
+        neighbour = self.counties.iloc[nearest.ravel()]
+        result = pd.DataFrame(
+            {
+                "Query County": query["County"].to_numpy(),
+                "Query State": query["state_abbreviation"].to_numpy(),
+                "Rank": np.tile(np.arange(1, nearest.shape[1] + 1), len(rows)),
+                "Distance": distances.ravel(),
+                "fips": neighbour["fips"].to_numpy(),
+                "County": neighbour["County"].to_numpy(),
+                "state_abbreviation": neighbour["state_abbreviation"].to_numpy(),
+            }
+        )
+        if self.outcomes is not None:
+            votes = self.outcomes.iloc[nearest.ravel()].reset_index(drop=True)
+            result = pd.concat([result, votes], axis=1)
+        return result
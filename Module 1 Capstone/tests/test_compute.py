@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+from src.compute import (
+    election_outcomes,
+    feature_research,
+    no_iqr_calculate_correlations,
+    swing_sensitivity,
+)
+from src.features import FeatureFrame
+
+
+def county_results() -> pd.DataFrame:
+    rows = []
+    for fips, county, democrat, republican in [
+        (4001, "Apache", 100, 105),
+        (4003, "Cochise", 100, 300),
+        (4005, "Coconino", 210, 200),
+        (55001, "Adams", 150, 160),
+    ]:
+        state = "AZ" if fips < 50000 else "WI"
+        rows.append((fips, county, state, "Democrat", democrat))
+        rows.append((fips, county, state, "Republican", republican))
+    return pd.DataFrame(
+        rows, columns=["fips", "county", "state_abbreviation", "party", "votes"]
+    )
+
+
+def test_county_swing_areas_match_count():
+    outcomes = election_outcomes(county_results(), level="county")
+    sensitivity = swing_sensitivity(outcomes, [0.01, 0.1, 1.0], level="county")
+    for count, areas in zip(sensitivity["Swing Count"], sensitivity["Swing Areas"]):
+        assert len(areas) == count
+    assert sensitivity.loc[0.1, "Swing Areas"] == [4001, 4005, 55001]
+
+
+def test_default_margin_column():
+    outcomes = election_outcomes(county_results(), level="county")
+    assert outcomes["swing_0.1"].tolist() == [True, False, True, True]
+
+
+def test_single_party_results_have_no_winner():
+    results = county_results()
+    outcomes = election_outcomes(results[results["party"] == "Democrat"], "county")
+    assert outcomes["party"].isna().all()
+    assert outcomes["margin"].isna().all()
+    assert not outcomes["swing_0.1"].any()
+
+
+def merged_data() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n = 40
+    population = rng.integers(1000, 100000, n)
+    democrat = (population * rng.uniform(0.05, 0.2, n)).astype(int)
+    republican = (population * rng.uniform(0.05, 0.2, n)).astype(int)
+    return pd.DataFrame(
+        {
+            "fips": np.arange(4001, 4001 + n),
+            "County": [f"County {i}" for i in range(n)],
+            "state_abbreviation": "AZ",
+            "Population 2014": population,
+            "White %": rng.uniform(20, 90, n),
+            "Veterans %": rng.uniform(2, 15, n),
+            "State": "Arizona",
+            "Democrat Votes": democrat,
+            "Republican Votes": republican,
+            "Democrat Vote %": democrat / population * 100,
+            "Republican Vote %": republican / population * 100,
+        }
+    )
+
+
+def test_feature_frame_matches_dataframe():
+    merged = merged_data()
+    features = FeatureFrame.from_merged(merged)
+    pd.testing.assert_frame_equal(
+        no_iqr_calculate_correlations(merged), no_iqr_calculate_correlations(features)
+    )
+    pd.testing.assert_frame_equal(
+        feature_research(merged, "White %"), feature_research(features, "White %")
+    )
@@ -0,0 +1,89 @@
+import sqlite3
+import pandas as pd
+import numpy as np
+from utils.instrumentation import read_sql_query, span, traced
+
+__all__ = [
+    "print_chi_square",
+    "no_plot_relationship",
+    "possible_answers",
+]
+
+@traced("compute")
+def print_chi_square(merged_df: pd.DataFrame) -> None:
+    """
+    Run a chi-square test of independence between two answered questions and print the results.
+
+    Parameters:
+        merged_df (pd.DataFrame): One row per respondent with the answers in AnswerText_x and AnswerText_y.
+
+    Returns:
+        None: Prints the chi-square statistic, p-value, critical value and Cramer's V.
+    """
+    from scipy.stats import chi2_contingency, chi2
+
+    with span("chi2_contingency", "compute") as stage:
+        stage.rows = len(merged_df)
+        cross_tab = pd.crosstab(merged_df["AnswerText_y"], merged_df["AnswerText_x"])
+        chi2_stat, p_val, dof, expected = chi2_contingency(cross_tab)
+        alpha = 0.05
+        critical_value = chi2.ppf(1 - alpha, dof)
+        n = cross_tab.sum().sum()
+        r, c = cross_tab.shape
+        cramers_v = np.sqrt(chi2_stat / (n * (min(r, c) - 1)))
+    print("Chi-square statistic:", round(chi2_stat, 2))
+    print("p-value:", round(p_val, 3))
+    print("Critical value is", round(critical_value, 2))
+    if chi2_stat > critical_value:
+        print(
+            "The chi-square statistic exceeds the critical value, suggesting a significant association between the variables."
+        )
+    else:
+        print(
+            "The chi-square statistic does not exceed the critical value, indicating no significant association between the variables."
+        )
+    print("Cramer's V:", round(cramers_v, 2))
+
+@traced("compute")
+def no_plot_relationship(con: sqlite3.Connection, question_number: int) -> None:
+    """
+    Analyze the relationship numericly between two categorical questions in the survey data.
+
+    Parameters:
+        con (sqlite3.Connection): SQLite database connection.
+        question_number (int): The question number to analyze.
+
+    Returns:
+        None
+    """
+    query = f"""
+    SELECT a.UserID, a.AnswerText AS AnswerText_x, b.AnswerText AS AnswerText_y
+    FROM answer AS a
+    INNER JOIN answer AS b ON a.UserID = b.UserID
+    WHERE a.QuestionID = {question_number} AND b.QuestionID = 33
+    AND a.SurveyID NOT IN (2014, 2016) AND b.SurveyID NOT IN (2014, 2016)
+    """
+    merged_df = read_sql_query(query, con)
+    print_chi_square(merged_df)
+
+@traced("query")
+def possible_answers(con: sqlite3.Connection, QuestionID: int) -> pd.DataFrame:
+    """
+    Retrieve the possible answers and their frequencies for a given question from the database.
+
+    Parameters:
+        con (sqlite3.Connection): SQLite database connection.
+        QuestionID (int): The ID of the question for which to retrieve possible answers.
+
+    Returns:
+        pd.DataFrame: A DataFrame containing the possible answers and their frequencies.
+    """
+    query = f"""
+    SELECT AnswerText, COUNT(*) AS Count
+    FROM answer
+    WHERE QuestionID = {QuestionID}
+    AND SurveyID NOT IN (2014, 2016)
+    GROUP BY AnswerText
+    ORDER BY count DESC
+    """
+    return read_sql_query(query, con)
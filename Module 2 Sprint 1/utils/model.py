@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+import numpy as np
+import pandas as pd
+from utils.instrumentation import read_sql_query, traced
+
+if TYPE_CHECKING:
+    from scipy import sparse
+
+disorder_question = 33
+
+@traced("query")
+def respondent_matrix(
+    con: sqlite3.Connection,
+    excluded_surveys: tuple[int, ...] = (2014, 2016),
+    min_count: int = 10,
+) -> tuple[sparse.csr_matrix, pd.DataFrame, pd.DataFrame]:
+    """
+    Build a one-hot respondent x answer matrix from the whole answer table in one pass.
+
+    Every (QuestionID, AnswerText) pair becomes a column, so questions with several
+    answers per respondent are multi-hot. Answers given by fewer than min_count
+    respondents, mostly free text, are dropped.
+
+    Parameters:
+        con (sqlite3.Connection): SQLite database connection.
+        excluded_surveys (tuple[int, ...]): Survey years to leave out.
+        min_count (int): The minimum number of respondents for an answer to become a column.
+
+    Returns:
+        tuple[sparse.csr_matrix, pd.DataFrame, pd.DataFrame]: The matrix, its rows (UserID, SurveyID)
+        and its columns (QuestionID, AnswerText, Count, questiontext).
+    """
+    from scipy import sparse
+
+    excluded = ", ".join(str(survey) for survey in excluded_surveys) or "NULL"
+    answers = read_sql_query(
+        f"""
+        SELECT UserID, SurveyID, QuestionID, AnswerText
+        FROM answer
+        WHERE SurveyID NOT IN ({excluded})
+        """,
+        con,
+    )
+    row, users = pd.factorize(answers["UserID"], sort=True)
+    grouped = answers.groupby(["QuestionID", "AnswerText"], sort=True)
+    column = grouped.ngroup().to_numpy()
+    columns = grouped.size().reset_index(name="Count")
+    keep = columns["Count"].to_numpy() >= min_count
+    new_column = np.cumsum(keep) - 1
+    selected = keep[column]
+    matrix = sparse.csr_matrix(
+        (
+            np.ones(selected.sum(), dtype=np.float32),
+            (row[selected], new_column[column[selected]]),
+        ),
+        shape=(len(users), keep.sum()),
+    )
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+    respondents = pd.DataFrame(
+        {
+            "UserID": users,
+            "SurveyID": answers.groupby("UserID", sort=True)["SurveyID"]
+            .first()
+            .to_numpy(),
+        }
+    )
+    questions = read_sql_query("SELECT questionid, questiontext FROM question", con)
+    columns = (
+        columns[keep]
+        .merge(questions, left_on="QuestionID", right_on="questionid", how="left")
+        .drop(columns="questionid")
+    )
+    return matrix, respondents, columns
+
+def disorder_target(
+    matrix: sparse.csr_matrix,
+    columns: pd.DataFrame,
+    excluded_questions: tuple[int, ...] = (),
+    group_uncertain: bool = True,
+) -> tuple[sparse.csr_matrix, np.ndarray, np.ndarray, pd.DataFrame]:
+    """
+    Split the respondent matrix into predictors and the answer to the disorder question (33).
+
+    Parameters:
+        matrix (sparse.csr_matrix): The matrix returned by respondent_matrix.
+        columns (pd.DataFrame): The columns returned by respondent_matrix.
+        excluded_questions (tuple[int, ...]): Questions to leave out of the predictors, e.g. ones that restate the target.
+        group_uncertain (bool): Merge 'Possibly' and 'Don't Know' into 'Uncertain', like analyze_relationship.
+
+    Returns:
+        tuple[sparse.csr_matrix, np.ndarray, np.ndarray, pd.DataFrame]: Predictors, target, the matrix rows
+        that answered the question and the predictor columns.
+    """
+    question = columns["QuestionID"].to_numpy()
+    is_target = question == disorder_question
+    target_answers = matrix[:, is_target]
+    answered = np.flatnonzero(np.diff(target_answers.indptr) == 1)
+    labels = columns.loc[is_target, "AnswerText"].to_numpy()
+    y = labels[target_answers[answered].indices]
+    if group_uncertain:
+        y = np.where(np.isin(y, ["Possibly", "Don't Know"]), "Uncertain", y)
+    is_predictor = ~is_target & ~np.isin(question, excluded_questions)
+    X = matrix[answered][:, is_predictor]
+    return X, y, answered, columns[is_predictor].reset_index(drop=True)
+
+def _make_model(model: str, seed: int):
+    if model == "logistic":
+        from sklearn.linear_model import LogisticRegression
+
+        return LogisticRegression(max_iter=2000)
+    if model == "gradient_boosting":
+        from sklearn.ensemble import GradientBoostingClassifier
+
+        return GradientBoostingClassifier(random_state=seed)
+    raise ValueError(f"Unknown model {model!r}, use 'logistic' or 'gradient_boosting'.")
+
+def _fit_fold(args: tuple) -> tuple[dict, np.ndarray]:
+    from sklearn.metrics import accuracy_score, balanced_accuracy_score, log_loss
+
+    X, y, train, test, model, seed = args
+    estimator = _make_model(model, seed).fit(X[train], y[train])
+    probabilities = estimator.predict_proba(X[test])
+    predicted = estimator.classes_[probabilities.argmax(axis=1)]
+    scores = {
+        "Accuracy": accuracy_score(y[test], predicted),
+        "Balanced Accuracy": balanced_accuracy_score(y[test], predicted),
+        "Log Loss": log_loss(y[test], probabilities, labels=estimator.classes_),
+    }
+    if model == "logistic":
+        importance = np.abs(estimator.coef_).mean(axis=0)
+    else:
+        importance = estimator.feature_importances_
+    return scores, importance
+
+@traced("compute")
+def cross_validate_disorder(
+    X: sparse.csr_matrix,
+    y: np.ndarray,
+    columns: pd.DataFrame,
+    model: str = "logistic",
+    n_folds: int = 5,
+    n_jobs: int | None = None,
+    seed: int = 0,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Cross-validate a model predicting the disorder answer, one fold per worker process.
+
+    Importances are the absolute logistic coefficients averaged over classes, or the
+    gradient boosting impurity importances, summed over the answer columns of each
+    question and normalized to sum to 1 in every fold.
+
+    Parameters:
+        X (sparse.csr_matrix): Predictors returned by disorder_target.
+        y (np.ndarray): Target returned by disorder_target.
+        columns (pd.DataFrame): Predictor columns returned by disorder_target.
+        model (str): "logistic" or "gradient_boosting".
+        n_folds (int): The number of stratified folds.
+        n_jobs (int | None): The number of worker processes, all CPUs when None, 1 runs in this process.
+        seed (int): Seed for the fold split and the model.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: Scores per fold and the importance of every question,
+        highest first, with its mean and standard deviation over folds.
+    """
+    from sklearn.model_selection import StratifiedKFold
+
+    folds = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=seed)
+    tasks = [(X, y, train, test, model, seed) for train, test in folds.split(X, y)]
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1:
+        results = list(map(_fit_fold, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_jobs, n_folds)) as executor:
+            results = list(executor.map(_fit_fold, tasks))
+
+    scores = pd.DataFrame([fold_scores for fold_scores, _ in results])
+    scores.index.name = "Fold"
+    question, question_ids = pd.factorize(columns["QuestionID"], sort=True)
+    per_question = np.array(
+        [
+            np.bincount(question, weights=importance, minlength=len(question_ids))
+            for _, importance in results
+        ]
+    )
+    per_question /= per_question.sum(axis=1, keepdims=True)
+    texts = columns.groupby("QuestionID")["questiontext"].first()
+    importances = pd.DataFrame(
+        {
+            "questiontext": texts.reindex(question_ids).to_numpy(),
+            "Importance": per_question.mean(axis=0),
+            "Importance Std": per_question.std(axis=0),
+        },
+        index=pd.Index(question_ids, name="QuestionID"),
+    )
+    return scores, importances.sort_values(by="Importance", ascending=False)
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import sqlite3
+from typing import TYPE_CHECKING
+import pandas as pd
+from utils.compute import print_chi_square
+from utils.instrumentation import read_sql_query, span, traced
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+__all__ = [
+    "feature_count_figure",
+    "feature_count_plot",
+    "relationship_figure",
+    "analyze_relationship",
+    "single_feature_figure",
+    "plot_single_feature",
+]
+
+def feature_count_figure(data: pd.DataFrame, column_name: str, title: str) -> go.Figure:
+    """
+    Build the bar plot of value counts drawn by feature_count_plot.
+
+    Parameters:
+        data (pd.DataFrame): The values of the column and their count.
+        column_name (str): The name of the column.
+        title (str): The title of the plot.
+
+    Returns:
+        go.Figure: The figure.
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                x=data[column_name],
+                y=data["count"],
+                marker_color="#1f77b4",
+                marker=dict(line=dict(width=1)),
+            )
+        ]
+    )
+    fig.update_layout(
+        title={
+            "text": title,
+            "x": 0.5,
+            "y": 0.95,
+            "xanchor": "center",
+            "yanchor": "top",
+        },
+        margin=dict(t=50, l=100, r=100, b=90),
+        xaxis_title=column_name,
+        yaxis_title="Number of Answers",
+        plot_bgcolor="rgba(0,0,0,0)",
+        template="plotly_white",
+        height=320,
+    )
+    return fig
+
+@traced("render")
+def feature_count_plot(con: sqlite3.Connection, column_name: str, title: str) -> None:
+    """
+    Generate a bar plot showing the count of occurrences for each unique value in a column from a SQL database.
+
+    Parameters:
+        con (sqlite3.Connection): A SQLite connection object.
+        column_name (str): The name of the column to be plotted.
+        title (str): The title of the plot.
+
+    Returns:
+        None: This function does not return anything. It displays the plot using Plotly.
+    """
+    query = (
+        f"SELECT {column_name}, COUNT(*) AS count FROM answer GROUP BY {column_name}"
+    )
+    data = read_sql_query(query, con)
+    fig = feature_count_figure(data, column_name, title)
+    with span("fig.show", "render"):
+        fig.show()
+
+def relationship_figure(cross_tab: pd.DataFrame, title: str) -> go.Figure:
+    """
+    Build the stacked bar plot of answer proportions drawn by analyze_relationship.
+
+    Parameters:
+        cross_tab (pd.DataFrame): Proportions of the predictor answers (columns) within every disorder answer (rows).
+        title (str): The title of the plot, usually the question text.
+
+    Returns:
+        go.Figure: The figure.
+    """
+    import plotly.graph_objects as go
+
+    index_names = cross_tab.index.tolist()
+    column_names = cross_tab.columns.tolist()
+    data = []
+    for col_name in column_names:
+        trace = go.Bar(x=index_names, y=cross_tab[col_name], name=col_name)
+        data.append(trace)
+    layout = go.Layout(
+        title={
+            "text": title,
+            "x": 0.49,
+            "y": 0.93,
+            "xanchor": "center",
+            "yanchor": "top",
+            "font": {"size": 15},
+        },
+        margin=dict(t=50, l=90, r=90, b=90),
+        xaxis=dict(title="Disorder Status"),
+        yaxis=dict(title="Proportion of Predictor<br>Categories"),
+        legend_title_text="Predictor Categories",
+        plot_bgcolor="rgba(0,0,0,0)",
+        barmode="stack",
+        height=320,
+    )
+    return go.Figure(data=data, layout=layout)
+
+@traced("render")
+def analyze_relationship(con: sqlite3.Connection, question_number: int) -> None:
+    """
+    Analyze the relationship numericly and visually between two categorical questions in the survey data.
+
+    Parameters:
+        con (sqlite3.Connection): SQLite database connection.
+        question_number (int): The question number to analyze.
+
+    Returns:
+        None: Displays a plot and prints statistical analysis results.
+    """
+    query = f"""
+    SELECT 
+        CASE 
+            WHEN a.AnswerText = 'Possibly' OR a.AnswerText = 'Don''t Know' THEN 'Uncertain'
+            ELSE a.AnswerText
+        END AS AnswerText_x,
+        CASE 
+            WHEN b.AnswerText = 'Possibly' OR b.AnswerText = 'Don''t Know' THEN 'Uncertain'
+            ELSE b.AnswerText
+        END AS AnswerText_y
+    FROM 
+        answer AS a
+    INNER JOIN 
+        answer AS b ON a.UserID = b.UserID
+    WHERE 
+        a.QuestionID = {question_number} AND b.QuestionID = 33
+        AND a.SurveyID NOT IN (2014, 2016) AND b.SurveyID NOT IN (2014, 2016)
+    """
+    merged_df = read_sql_query(query, con)
+    cross_tab = pd.crosstab(merged_df["AnswerText_y"], merged_df["AnswerText_x"])
+    cross_tab = cross_tab.div(cross_tab.sum(axis=1), axis=0)
+    title_query = f"SELECT DISTINCT questiontext FROM question WHERE questionid = {question_number}"
+    fig = relationship_figure(cross_tab, con.execute(title_query).fetchall()[0][0])
+    with span("fig.show", "render"):
+        fig.show()
+    print_chi_square(merged_df)
+
+def single_feature_figure(data: pd.DataFrame, title: str) -> go.Figure:
+    """
+    Build the bar plot of answer counts drawn by plot_single_feature.
+
+    Parameters:
+        data (pd.DataFrame): The answers (AnswerText) and their count (Count).
+        title (str): The title of the plot, usually the question text.
+
+    Returns:
+        go.Figure: The figure.
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure(
+        data=[go.Bar(x=data["AnswerText"], y=data["Count"], marker_color="#1f77b4")]
+    )
+    fig.update_layout(
+        title={
+            "text": title,
+            "x": 0.5,
+            "y": 0.9,
+            "xanchor": "center",
+            "yanchor": "top",
+        },
+        margin=dict(t=50, l=100, r=100, b=0),
+        xaxis_title="Possible Answers",
+        yaxis_title="Number of Answers",
+        plot_bgcolor="rgba(0,0,0,0)",
+        template="plotly_white",
+        height=270,
+    )
+    return fig
+
+@traced("render")
+def plot_single_feature(con: sqlite3.Connection, question_number: int) -> None:
+    """
+    Plot a single feature from the database.
+
+    Parameters:
+        df (pd.DataFrame): The DataFrame containing the survey data.
+        question_number (int): The ID of the feature to plot.
+
+    Returns:
+        None: Displays the plot.
+    """
+    query = f"""
+    SELECT AnswerText, COUNT(*) AS Count
+    FROM answer
+    WHERE QuestionID = {question_number}
+    AND SurveyID NOT IN (2014, 2016)
+    GROUP BY AnswerText
+    ORDER BY count DESC
+    """
+    data = read_sql_query(query, con)
+    title_query = f"SELECT DISTINCT questiontext FROM question WHERE questionid = {question_number}"
+    fig = single_feature_figure(data, con.execute(title_query).fetchall()[0][0])
+    with span("fig.show", "render"):
+        fig.show()
@@ -0,0 +1,27 @@
+# The profiled connection and query plan analysis are shared by the projects and
+# live in the top-level instrumentation package; this module loads them by file path
+# with utils.instrumentation.load_shared, re-exports them and flags full scans of
+# the survey's answer table by default.
+from utils.instrumentation import load_shared
+
+profiling = load_shared("profiling")
+__all__ = profiling.__all__
+globals().update({name: getattr(profiling, name) for name in __all__})
+
+def connect(
+    database: str,
+    threshold: float = 0.1,
+    watched_tables: tuple[str, ...] = ("answer",),
+) -> ProfiledConnection:
+    """
+    Open a SQLite database with statement profiling, flagging full scans of the answer table.
+
+    Parameters:
+        database (str): The path of the database.
+        threshold (float): Statements taking at least this many seconds are explained, 0 explains all of them.
+        watched_tables (tuple[str, ...]): Tables whose full scans are flagged.
+
+    Returns:
+        ProfiledConnection: The connection.
+    """
+    return profiling.connect(database, threshold, watched_tables)
@@ -0,0 +1,247 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+from utils.instrumentation import read_sql_query, traced
+
+def stratified_query(
+    excluded_surveys: tuple[int, ...] = (2014, 2016), group_uncertain: bool = True
+) -> str:
+    """
+    Build the grouped self-join counting every question's answers against question 33 per survey year.
+
+    Parameters:
+        excluded_surveys (tuple[int, ...]): Survey years to leave out.
+        group_uncertain (bool): Merge 'Possibly' and 'Don't Know' into 'Uncertain', like analyze_relationship.
+
+    Returns:
+        str: The SQL query.
+    """
+    excluded = ", ".join(str(survey) for survey in excluded_surveys) or "NULL"
+    if group_uncertain:
+        x = "CASE WHEN a.AnswerText IN ('Possibly', 'Don''t Know') THEN 'Uncertain' ELSE a.AnswerText END"
+        y = "CASE WHEN b.AnswerText IN ('Possibly', 'Don''t Know') THEN 'Uncertain' ELSE b.AnswerText END"
+    else:
+        x, y = "a.AnswerText", "b.AnswerText"
+    return f"""
+    SELECT a.QuestionID, a.SurveyID, {x} AS AnswerText_x, {y} AS AnswerText_y, COUNT(*) AS count
+    FROM answer AS a
+    INNER JOIN answer AS b ON a.UserID = b.UserID AND b.QuestionID = 33
+    WHERE a.QuestionID != 33 AND a.SurveyID NOT IN ({excluded})
+    GROUP BY a.QuestionID, a.SurveyID, AnswerText_x, AnswerText_y
+    """
+
+def count_tensor(
+    counts: pd.DataFrame, max_answers: int = 20
+) -> tuple[np.ndarray, dict]:
+    """
+    Arrange grouped counts into a question x survey x answer x Q33 answer tensor.
+
+    Every question's answers are numbered from 0, and tables with fewer answers than the
+    largest one are padded with zero rows. Questions with more than max_answers distinct
+    answers (free text such as age or country) are left out.
+
+    Parameters:
+        counts (pd.DataFrame): Result of stratified_query.
+        max_answers (int): The largest number of distinct answers a question may have.
+
+    Returns:
+        tuple[np.ndarray, dict]: The tensor and its labels: QuestionID, SurveyID, answers per question and Q33 answers.
+    """
+    codes = counts.groupby(["QuestionID", "AnswerText_x"], sort=True).ngroup()
+    x = codes - codes.groupby(counts["QuestionID"]).transform("min")
+    n_answers = x.groupby(counts["QuestionID"]).transform("max") + 1
+    counts = counts[n_answers <= max_answers].assign(x=x)
+    question, questions = pd.factorize(counts["QuestionID"], sort=True)
+    survey, surveys = pd.factorize(counts["SurveyID"], sort=True)
+    y, y_answers = pd.factorize(counts["AnswerText_y"], sort=True)
+    tensor = np.zeros(
+        (len(questions), len(surveys), counts["x"].max() + 1, len(y_answers))
+    )
+    tensor[question, survey, counts["x"].to_numpy(), y] = counts["count"].to_numpy()
+    x_answers = (
+        counts.drop_duplicates(["QuestionID", "x"])
+        .sort_values(by="x")
+        .groupby("QuestionID")["AnswerText_x"]
+        .agg(list)
+    )
+    labels = {
+        "QuestionID": questions.to_numpy(),
+        "SurveyID": surveys.to_numpy(),
+        "AnswerText_x": x_answers.reindex(questions).tolist(),
+        "AnswerText_y": y_answers.tolist(),
+    }
+    return tensor, labels
+
+def pooled_crosstabs(
+    counts: pd.DataFrame, max_answers: int = 20
+) -> dict[int, pd.DataFrame]:
+    """
+    Build every question's crosstab against question 33, pooled over survey years.
+
+    Parameters:
+        counts (pd.DataFrame): Result of stratified_query.
+        max_answers (int): Questions with more distinct answers are left out.
+
+    Returns:
+        dict[int, pd.DataFrame]: Answer counts by QuestionID, Q33 answers as rows and the question's
+        answers as columns, without Q33 answers nobody gave.
+    """
+    tensor, labels = count_tensor(counts, max_answers)
+    crosstabs = {}
+    for question, table, answers in zip(
+        labels["QuestionID"], tensor.sum(axis=1), labels["AnswerText_x"]
+    ):
+        cross_tab = pd.DataFrame(
+            table[: len(answers)].T, index=labels["AnswerText_y"], columns=answers
+        )
+        crosstabs[question] = cross_tab[cross_tab.sum(axis=1) > 0]
+    return crosstabs
+
+def chi_square_tensor(tensor: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Chi-square test of independence for every table in a stack of contingency tables.
+
+    Empty rows and columns, including padding, do not count towards the degrees of
+    freedom. Yates' correction is applied to tables with one degree of freedom, as in
+    scipy's chi2_contingency.
+
+    Parameters:
+        tensor (np.ndarray): Counts with the two table dimensions last.
+
+    Returns:
+        dict[str, np.ndarray]: chi2_statistic, p_value, dof, cramers_v and n for every table.
+    """
+    from scipy.stats import chi2
+
+    rows = tensor.sum(axis=-1)
+    columns = tensor.sum(axis=-2)
+    n = rows.sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = rows[..., :, None] * columns[..., None, :] / n[..., None, None]
+        r = (rows > 0).sum(axis=-1)
+        c = (columns > 0).sum(axis=-1)
+        dof = (r - 1).clip(min=0) * (c - 1).clip(min=0)
+        difference = tensor - expected
+        yates = (dof == 1)[..., None, None]
+        difference = np.where(
+            yates,
+            np.sign(difference) * np.maximum(np.abs(difference) - 0.5, 0),
+            difference,
+        )
+        terms = np.where(expected > 0, difference**2 / expected, 0)
+        statistic = np.where(dof > 0, terms.sum(axis=(-2, -1)), np.nan)
+        cramers_v = np.sqrt(statistic / (n * (np.minimum(r, c) - 1)))
+    return {
+        "chi2_statistic": statistic,
+        "p_value": chi2.sf(statistic, np.maximum(dof, 1)),
+        "dof": dof,
+        "cramers_v": cramers_v,
+        "n": n,
+    }
+
+def cochran_mantel_haenszel(tensor: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Generalized Cochran-Mantel-Haenszel test of general association for every question.
+
+    Each stratum contributes its deviation from the expected counts and the covariance
+    of its counts under independence with fixed margins,
+    n^2 / (n - 1) * (diag(r) - r r') kron (diag(c) - c c'). The statistic is the
+    summed deviation in the pseudo-inverse of the summed covariance, with degrees of
+    freedom equal to its rank, so padded and empty answers drop out.
+
+    Parameters:
+        tensor (np.ndarray): Counts of shape question x stratum x answer x answer.
+
+    Returns:
+        dict[str, np.ndarray]: cmh_statistic, dof, p_value and n for every question.
+    """
+    from scipy.stats import chi2
+
+    Q, S, I, J = tensor.shape
+    n = tensor.sum(axis=(-2, -1))
+    usable = n > 1
+    safe_n = np.where(usable, n, 1)
+    row_share = tensor.sum(axis=-1) / safe_n[..., None]
+    column_share = tensor.sum(axis=-2) / safe_n[..., None]
+    expected = n[..., None, None] * row_share[..., :, None] * column_share[..., None, :]
+    deviation = np.where(usable[..., None, None], tensor - expected, 0).sum(axis=1)
+    weight = np.where(usable, n**2 / np.where(usable, n - 1, 1), 0)
+    row_cov = np.einsum("qsi,ik->qsik", row_share, np.eye(I)) - np.einsum(
+        "qsi,qsk->qsik", row_share, row_share
+    )
+    column_cov = np.einsum("qsj,jl->qsjl", column_share, np.eye(J)) - np.einsum(
+        "qsj,qsl->qsjl", column_share, column_share
+    )
+    covariance = np.einsum("qs,qsik,qsjl->qijkl", weight, row_cov, column_cov)
+    covariance = covariance.reshape(Q, I * J, I * J)
+    eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+    keep = eigenvalues > 1e-9 * eigenvalues.max(axis=-1, keepdims=True)
+    projected = np.einsum("qki,qk->qi", eigenvectors, deviation.reshape(Q, I * J))
+    statistic = np.where(keep, projected**2 / np.where(keep, eigenvalues, 1), 0).sum(
+        axis=-1
+    )
+    dof = keep.sum(axis=-1)
+    return {
+        "cmh_statistic": statistic,
+        "dof": dof,
+        "p_value": chi2.sf(statistic, np.maximum(dof, 1)),
+        "n": n.sum(axis=1),
+    }
+
+@traced("compute")
+def stratified_relationships(
+    con: sqlite3.Connection,
+    excluded_surveys: tuple[int, ...] = (2014, 2016),
+    group_uncertain: bool = True,
+    max_answers: int = 20,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Test every question's association with question 33 per survey year and pooled across years.
+
+    One grouped self-join scan counts all questions at once; the tests are vectorized
+    over the resulting count tensor. The per-year chi-square and Cramer's V show how the
+    association changes between years, the Cochran-Mantel-Haenszel statistic tests it
+    while controlling for the year, and the pooled chi-square is what
+    analyze_relationship reports. no_plot_relationship does not merge answers, so it
+    reports the same pooled chi-square only with group_uncertain=False.
+
+    Parameters:
+        con (sqlite3.Connection): SQLite database connection.
+        excluded_surveys (tuple[int, ...]): Survey years to leave out.
+        group_uncertain (bool): Merge 'Possibly' and 'Don't Know' into 'Uncertain', like analyze_relationship.
+        max_answers (int): Questions with more distinct answers are left out.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: Per question and survey year results, and per question
+        pooled chi-square and Cochran-Mantel-Haenszel results sorted by the CMH statistic.
+    """
+    counts = read_sql_query(stratified_query(excluded_surveys, group_uncertain), con)
+    tensor, labels = count_tensor(counts, max_answers)
+    questions = read_sql_query("SELECT questionid, questiontext FROM question", con)
+    texts = questions.set_index("questionid")["questiontext"]
+
+    per_year = chi_square_tensor(tensor)
+    index = pd.MultiIndex.from_product(
+        [labels["QuestionID"], labels["SurveyID"]], names=["QuestionID", "SurveyID"]
+    )
+    by_year = pd.DataFrame(
+        {name: values.ravel() for name, values in per_year.items()}, index=index
+    )
+    by_year = by_year[by_year["n"] > 0]
+
+    pooled_chi = chi_square_tensor(tensor.sum(axis=1))
+    cmh = cochran_mantel_haenszel(tensor)
+    pooled = pd.DataFrame(
+        {
+            "questiontext": texts.reindex(labels["QuestionID"]).to_numpy(),
+            "pooled_chi2": pooled_chi["chi2_statistic"],
+            "pooled_p_value": pooled_chi["p_value"],
+            "pooled_cramers_v": pooled_chi["cramers_v"],
+            "cmh_statistic": cmh["cmh_statistic"],
+            "cmh_dof": cmh["dof"],
+            "cmh_p_value": cmh["p_value"],
+            "n": cmh["n"],
+        },
+        index=pd.Index(labels["QuestionID"], name="QuestionID"),
+    )
+    return by_year, pooled.sort_values(by="cmh_statistic", ascending=False)
@@ -0,0 +1,29 @@
+import sqlite3
+
+from utils.dedup import detect_near_duplicates
+
+episode = "this episode on the history of the printing press was fascinating"
+
+
+def reviews_database(path, rows: list[tuple[str, str | None]]) -> sqlite3.Connection:
+    con = sqlite3.connect(path / "reviews.sqlite")
+    con.execute("CREATE TABLE reviews (title TEXT, content TEXT)")
+    con.executemany("INSERT INTO reviews VALUES (?, ?)", rows)
+    con.commit()
+    return con
+
+
+def test_texts_without_shingles_are_not_grouped(tmp_path):
+    con = reviews_database(tmp_path, [("ok", ""), ("no", None), ("Yes", "")])
+    flagged = detect_near_duplicates(con, min_length=0, n_jobs=1)
+    assert flagged.empty
+
+
+def test_near_duplicates_are_grouped(tmp_path):
+    rows = [("Great", episode), ("ok", ""), ("great", episode + "!"), ("no", "")]
+    con = reviews_database(tmp_path, rows)
+    flagged = detect_near_duplicates(con, min_length=0, n_jobs=1)
+    assert flagged["review_rowid"].tolist() == [1, 3]
+    assert flagged["quality"].tolist() == ["original", "duplicate"]
+    stored = con.execute("SELECT review_rowid FROM review_quality").fetchall()
+    assert stored == [(1,), (3,)]
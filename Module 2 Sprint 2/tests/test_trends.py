@@ -0,0 +1,26 @@
+import pandas as pd
+
+from utils.trends import fit_trends, monthly_matrix
+
+
+def test_single_month_has_no_changepoint():
+    reviews = pd.DataFrame(
+        {
+            "category": ["comedy", "news"],
+            "year_month": ["2023-01", "2023-01"],
+            "num_reviews": [3, 5],
+        }
+    )
+    trends = fit_trends(monthly_matrix(reviews))
+    assert trends["changepoint"].isna().all()
+    assert (trends["changepoint_strength"] == 0).all()
+    assert (trends["trend"] == "no trend").all()
+
+
+def test_changepoint_month():
+    months = [f"2023-{month:02d}" for month in range(1, 9)]
+    matrix = pd.DataFrame([[1, 1, 1, 1, 9, 9, 9, 9]], index=["news"], columns=months)
+    trends = fit_trends(matrix)
+    assert trends.loc["news", "changepoint"] == "2023-05"
+    assert trends.loc["news", "mean_before"] == 1
+    assert trends.loc["news", "mean_after"] == 9
@@ -0,0 +1,403 @@
+import json
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.core.frame import DataFrame
+from utils.dedup import quality_levels
+
+store_directory = "review_store"
+
+review_columns = {
+    "rowid": np.int64,
+    "podcast": np.int32,
+    "author": np.int32,
+    "rating": np.int8,
+    "day": np.int32,
+}
+
+def _encode(values: pd.Series, mapping: dict) -> np.ndarray:
+    """
+    Dictionary-encode values, adding unseen values to the mapping.
+
+    Args:
+        values (pd.Series): The values to encode.
+        mapping (dict): Value to code mapping shared by all chunks, updated in place.
+
+    Returns:
+        np.ndarray: int32 code of every value.
+    """
+    local, uniques = pd.factorize(values)
+    codes = np.array(
+        [mapping.setdefault(value, len(mapping)) for value in uniques], dtype=np.int32
+    )
+    return codes[local]
+
+def _day_numbers(created_at: pd.Series) -> np.ndarray:
+    """
+    Convert created_at timestamps to days since 1970-01-01 of their local date.
+
+    Args:
+        created_at (pd.Series): Timestamps such as "2018-04-24T12:05:16-07:00".
+
+    Returns:
+        np.ndarray: int32 day numbers.
+    """
+    days = np.array(created_at.str.slice(0, 10).to_numpy(), dtype="datetime64[D]")
+    return days.astype(np.int32)
+
+def _source_state(con: sqlite3.Connection) -> dict:
+    count, max_rowid = con.execute(
+        "SELECT COUNT(*), MAX(rowid) FROM reviews"
+    ).fetchone()
+    return {"reviews": count, "max_rowid": max_rowid}
+
+def export_columnar(
+    con: sqlite3.Connection,
+    directory: str | Path = store_directory,
+    chunksize: int = 500000,
+) -> Path:
+    """
+    Convert the reviews, podcasts and categories tables into memory-mappable .npy columns.
+
+    Reviews become int32 podcast and author codes, int8 ratings, int32 day numbers and
+    the SQLite rowid; the podcast, author and category strings are kept once in
+    dictionary files. Reviews are read in chunks and written straight into
+    memory-mapped files, so memory use does not grow with the table.
+
+    Args:
+        con (sqlite3.Connection): Connection to the podcast reviews database.
+        directory (str | Path): The folder for the store, created if missing.
+        chunksize (int): The number of reviews read at a time.
+
+    Returns:
+        Path: The store folder.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    state = _source_state(con)
+    tables = {row[0] for row in con.execute("SELECT name FROM sqlite_master")}
+
+    podcasts = {}
+    if "podcasts" in tables:
+        _encode(
+            pd.read_sql_query("SELECT podcast_id FROM podcasts", con)["podcast_id"],
+            podcasts,
+        )
+    pairs = pd.read_sql_query(
+        "SELECT DISTINCT podcast_id, category FROM categories", con
+    )
+    pair_podcast = _encode(pairs["podcast_id"], podcasts)
+    pair_category, categories = pd.factorize(pairs["category"], sort=True)
+
+    columns = {
+        name: np.lib.format.open_memmap(
+            directory / f"{name}.npy", mode="w+", dtype=dtype, shape=(state["reviews"],)
+        )
+        for name, dtype in review_columns.items()
+    }
+    authors = {}
+    start = 0
+    for chunk in pd.read_sql_query(
+        "SELECT rowid, podcast_id, author_id, rating, created_at FROM reviews ORDER BY rowid",
+        con,
+        chunksize=chunksize,
+    ):
+        end = start + len(chunk)
+        columns["rowid"][start:end] = chunk["rowid"].to_numpy()
+        columns["podcast"][start:end] = _encode(chunk["podcast_id"], podcasts)
+        columns["author"][start:end] = _encode(chunk["author_id"], authors)
+        columns["rating"][start:end] = chunk["rating"].to_numpy()
+        columns["day"][start:end] = _day_numbers(chunk["created_at"])
+        start = end
+    for column in columns.values():
+        column.flush()
+
+    order = np.argsort(pair_podcast, kind="stable")
+    np.save(directory / "pair_podcast.npy", pair_podcast[order])
+    np.save(directory / "pair_category.npy", pair_category[order].astype(np.int16))
+    np.save(directory / "podcast_ids.npy", np.array(list(podcasts), dtype=str))
+    np.save(directory / "author_ids.npy", np.array(list(authors), dtype=str))
+    np.save(directory / "categories.npy", np.array(categories, dtype=str))
+    (directory / "metadata.json").write_text(json.dumps(state))
+    if "review_quality" in tables:
+        export_quality(con, directory)
+    return directory
+
+def export_quality(
+    con: sqlite3.Connection, directory: str | Path = store_directory
+) -> Path:
+    """
+    Write the review_quality flags of detect_near_duplicates as an int8 column of the store.
+
+    Codes index quality_levels (0 unique, 1 original, 2 duplicate). Only the flagged
+    reviews are read and matched on rowid, so refreshing the flags does not need a
+    full export.
+
+    Args:
+        con (sqlite3.Connection): Connection to the podcast reviews database with a review_quality table.
+        directory (str | Path): The store folder.
+
+    Returns:
+        Path: The store folder.
+    """
+    directory = Path(directory)
+    rowid = np.load(directory / "rowid.npy", mmap_mode="r")
+    flagged = pd.read_sql_query("SELECT review_rowid, quality FROM review_quality", con)
+    position = np.searchsorted(rowid, flagged["review_rowid"].to_numpy())
+    found = position < len(rowid)
+    found[found] = rowid[position[found]] == flagged["review_rowid"].to_numpy()[found]
+    quality = np.zeros(len(rowid), dtype=np.int8)
+    quality[position[found]] = pd.Categorical(
+        flagged["quality"], categories=quality_levels
+    ).codes[found]
+    np.save(directory / "quality.npy", quality)
+    return directory
+
+class ReviewStore:
+    """
+    Read-only columnar copy of the podcast reviews database.
+
+    Columns are memory-mapped, so opening the store is instant and only the pages a
+    query touches are read. Every aggregate is a np.bincount over integer codes. Joins
+    with categories first reduce reviews to per-podcast counts or expand them through
+    the (podcast, category) pairs, which like the SQL INNER JOIN counts a review once
+    for every category of its podcast.
+
+    With drop_duplicates the reviews flagged "duplicate" by detect_near_duplicates are
+    left out of every aggregate; the kept rows are copied into memory once when the
+    store is opened.
+    """
+
+    def __init__(
+        self, directory: str | Path = store_directory, drop_duplicates: bool = False
+    ):
+        self.directory = Path(directory)
+        for name in review_columns:
+            setattr(self, name, np.load(self.directory / f"{name}.npy", mmap_mode="r"))
+        quality_path = self.directory / "quality.npy"
+        self.quality = (
+            np.load(quality_path, mmap_mode="r")
+            if quality_path.exists()
+            else np.zeros(len(self.rowid), dtype=np.int8)
+        )
+        if drop_duplicates:
+            if not quality_path.exists():
+                raise FileNotFoundError(
+                    f"{quality_path} is missing, run detect_near_duplicates and export_quality first."
+                )
+            keep = self.quality != quality_levels.index("duplicate")
+            for name in [*review_columns, "quality"]:
+                setattr(self, name, np.asarray(getattr(self, name))[keep])
+        self.pair_podcast = np.load(self.directory / "pair_podcast.npy")
+        self.pair_category = np.load(self.directory / "pair_category.npy")
+        self.podcast_ids = np.load(self.directory / "podcast_ids.npy", mmap_mode="r")
+        self.author_ids = np.load(self.directory / "author_ids.npy", mmap_mode="r")
+        self.categories = pd.Index(
+            np.load(self.directory / "categories.npy"), name="category"
+        )
+        self.metadata = json.loads((self.directory / "metadata.json").read_text())
+        podcast_count = len(self.podcast_ids)
+        self.pair_count = np.bincount(self.pair_podcast, minlength=podcast_count)
+        self.pair_start = np.cumsum(self.pair_count) - self.pair_count
+
+    def is_stale(self, con: sqlite3.Connection) -> bool:
+        """
+        Check whether reviews were added to or removed from the database since the export.
+
+        Args:
+            con (sqlite3.Connection): Connection to the podcast reviews database.
+
+        Returns:
+            bool: True if the store should be exported again.
+        """
+        return _source_state(con) != self.metadata
+
+    def _category_rows(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Join reviews with categories.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Review position and category code of every joined row.
+        """
+        repeats = self.pair_count[self.podcast]
+        review = np.repeat(np.arange(len(self.podcast)), repeats)
+        within = np.arange(len(review)) - np.repeat(
+            np.cumsum(repeats) - repeats, repeats
+        )
+        pair = self.pair_start[self.podcast[review]] + within
+        return review, self.pair_category[pair]
+
+    def _months(self, days: np.ndarray) -> tuple[np.ndarray, pd.Index]:
+        """
+        Convert day numbers to month codes counted from the first month in the data.
+
+        Args:
+            days (np.ndarray): int32 day numbers.
+
+        Returns:
+            tuple[np.ndarray, pd.Index]: Month code of every day and the "YYYY-MM" label of every code.
+        """
+        months = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        first = months.min() if len(months) else 0
+        labels = np.arange(first, months.max() + 1 if len(months) else 0).astype(
+            "datetime64[M]"
+        )
+        return months - first, pd.Index(labels.astype(str), name="year_month")
+
+    def ratings(self) -> DataFrame:
+        """
+        Input of plot_hist: the rating of every review.
+
+        Returns:
+            DataFrame: A rating column.
+        """
+        return pd.DataFrame({"rating": np.asarray(self.rating)})
+
+    def weekly_reviews(self) -> DataFrame:
+        """
+        Input of plot_line: the number of reviews per week, weeks starting on Monday.
+
+        Returns:
+            DataFrame: review_week and num_reviews.
+        """
+        monday = (self.day - (self.day + 3) % 7).astype(np.int64)
+        first = monday.min()
+        counts = np.bincount((monday - first) // 7)
+        weeks = first + 7 * np.arange(len(counts))
+        return pd.DataFrame(
+            {"review_week": weeks.astype("datetime64[D]"), "num_reviews": counts}
+        )[counts > 0].reset_index(drop=True)
+
+    def podcasts_per_category(self) -> DataFrame:
+        """
+        Input of plot_counts: the number of podcasts in every category.
+
+        Returns:
+            DataFrame: category and counts, largest first.
+        """
+        counts = np.bincount(self.pair_category, minlength=len(self.categories))
+        return (
+            pd.DataFrame({"category": self.categories, "counts": counts})
+            .sort_values(by="counts", ascending=False)
+            .reset_index(drop=True)
+        )
+
+    def largest_category_counts(self) -> pd.Series:
+        """
+        Input of plot_counts_series: podcasts per category after keeping only the largest category of every podcast.
+
+        Returns:
+            pd.Series: Number of podcasts per category, largest first.
+        """
+        size = np.bincount(self.pair_category, minlength=len(self.categories))
+        pair_size = size[self.pair_category]
+        order = np.lexsort((-pair_size, self.pair_podcast))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = self.pair_podcast[order][1:] != self.pair_podcast[order][:-1]
+        chosen = self.pair_category[order][first]
+        counts = np.bincount(chosen, minlength=len(self.categories))
+        series = pd.Series(counts, index=self.categories, name="count")
+        return series[series > 0].sort_values(ascending=False)
+
+    def review_categories(self) -> DataFrame:
+        """
+        Input of plot_box: the category of every review joined with categories.
+
+        Returns:
+            DataFrame: A categorical category column.
+        """
+        _, category = self._category_rows()
+        return pd.DataFrame(
+            {"category": pd.Categorical.from_codes(category, self.categories)}
+        )
+
+    def ratings_by_category(self) -> DataFrame:
+        """
+        Input of plot_ratings_categories: the share of every rating in every category.
+
+        Returns:
+            DataFrame: category and one column per rating 1 to 5.
+        """
+        per_podcast = np.bincount(
+            self.podcast.astype(np.int64) * 5 + self.rating - 1,
+            minlength=len(self.podcast_ids) * 5,
+        ).reshape(-1, 5)
+        counts = np.zeros((len(self.categories), 5), dtype=np.int64)
+        np.add.at(counts, self.pair_category, per_podcast[self.pair_podcast])
+        keep = counts.sum(axis=1) > 0
+        shares = counts[keep] / counts[keep].sum(axis=1, keepdims=True)
+        table = pd.DataFrame(shares, columns=[1, 2, 3, 4, 5])
+        table.insert(0, "category", self.categories[keep])
+        return table
+
+    def monthly_reviews(self) -> DataFrame:
+        """
+        Input of plot_reviews_month: the number of reviews per category and month.
+
+        Returns:
+            DataFrame: category, year_month and num_reviews.
+        """
+        review, category = self._category_rows()
+        month, labels = self._months(np.asarray(self.day))
+        counts = np.bincount(
+            category.astype(np.int64) * len(labels) + month[review],
+            minlength=len(self.categories) * len(labels),
+        )
+        nonzero = np.flatnonzero(counts)
+        return pd.DataFrame(
+            {
+                "category": self.categories[nonzero // len(labels)],
+                "year_month": labels[nonzero % len(labels)],
+                "num_reviews": counts[nonzero],
+            }
+        )
+
+    def category_month_ratings(self, category: str = "true-crime") -> DataFrame:
+        """
+        Input of plot_true_crime_month: the share of every rating per month in one category.
+
+        Args:
+            category (str): The category.
+
+        Returns:
+            DataFrame: year_month, rating and proportion.
+        """
+        code = self.categories.get_loc(category)
+        members = np.zeros(len(self.podcast_ids), dtype=bool)
+        members[self.pair_podcast[self.pair_category == code]] = True
+        selected = members[self.podcast]
+        month, labels = self._months(np.asarray(self.day)[selected])
+        rating = np.asarray(self.rating)[selected].astype(np.int64)
+        counts = np.bincount(month * 5 + rating - 1, minlength=len(labels) * 5)
+        counts = counts.reshape(-1, 5)
+        totals = counts.sum(axis=1)
+        table = pd.DataFrame(
+            counts[totals > 0] / totals[totals > 0, None],
+            index=labels[totals > 0],
+            columns=pd.Index([1, 2, 3, 4, 5], name="rating"),
+        )
+        return table.stack().rename("proportion").reset_index()
+
+    def podcasts_reviews(self) -> DataFrame:
+        """
+        Input of plot_podcasts_reviews: the number of podcasts and reviews in every category.
+
+        Returns:
+            DataFrame: category, num_podcasts and total_reviews.
+        """
+        per_podcast = np.bincount(self.podcast, minlength=len(self.podcast_ids))
+        reviews = np.bincount(
+            self.pair_category,
+            weights=per_podcast[self.pair_podcast],
+            minlength=len(self.categories),
+        )
+        podcasts = np.bincount(self.pair_category, minlength=len(self.categories))
+        return pd.DataFrame(
+            {
+                "category": self.categories,
+                "num_podcasts": podcasts,
+                "total_reviews": reviews.astype(np.int64),
+            }
+        )
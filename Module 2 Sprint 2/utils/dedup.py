@@ -0,0 +1,333 @@
+import os
+import sqlite3
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.core.frame import DataFrame
+
+quality_levels = ["unique", "original", "duplicate"]
+
+def without_duplicates(alias: str = "r") -> str:
+    """
+    SQL condition that leaves out the reviews flagged as duplicates by detect_near_duplicates.
+
+    Args:
+        alias (str): The alias of the reviews table in the query.
+
+    Returns:
+        str: The condition, e.g. for "SELECT ... FROM reviews AS r WHERE " + without_duplicates("r").
+    """
+    return f"{alias}.rowid NOT IN (SELECT review_rowid FROM review_quality WHERE quality = 'duplicate')"
+
+def shingle_hashes(texts: list[str], k: int = 5) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Hash the character k-shingles of a batch of texts at once.
+
+    The texts are concatenated into one byte array and the hash of the k bytes
+    starting at every position is built with k vectorized passes; positions whose
+    window crosses into the next text are dropped.
+
+    Args:
+        texts (list[str]): Normalized review texts.
+        k (int): The shingle length in bytes, at most 7.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The 32-bit hash of every shingle and the position of its text in texts,
+        ordered by text.
+    """
+    encoded = [text.encode() for text in texts]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    if len(data) < k:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)
+    windows = np.lib.stride_tricks.sliding_window_view(data, k)
+    hashes = np.zeros(len(windows), dtype=np.uint64)
+    for j in range(k):
+        hashes = hashes * np.uint64(257) + windows[:, j]
+    hashes = (hashes * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(32)
+    text = np.repeat(np.arange(len(texts)), lengths)[: len(windows)]
+    starts = np.cumsum(lengths) - lengths
+    valid = np.arange(len(windows)) - starts[text] <= lengths[text] - k
+    return hashes[valid], text[valid]
+
+def minhash(
+    hashes: np.ndarray,
+    text: np.ndarray,
+    n_texts: int,
+    a: np.ndarray,
+    b: np.ndarray,
+    block_size: int = 32768,
+) -> np.ndarray:
+    """
+    MinHash signatures of a batch of texts from their shingle hashes.
+
+    Every permutation is a multiply-shift hash (a * x + b) >> 32 with odd 64-bit a,
+    which needs no modulo. The shift is monotonic, so it is applied to the minimum
+    per text, a np.minimum.reduceat over the shingles grouped by text, instead of to
+    every shingle. Texts are processed in blocks of about block_size shingles so the
+    working arrays stay in the CPU cache across permutations.
+
+    Args:
+        hashes (np.ndarray): Shingle hashes from shingle_hashes.
+        text (np.ndarray): Text position of every shingle, sorted.
+        n_texts (int): The number of texts in the batch.
+        a (np.ndarray): Odd uint64 multipliers, one per permutation.
+        b (np.ndarray): uint64 offsets, one per permutation.
+        block_size (int): The approximate number of shingles hashed at a time.
+
+    Returns:
+        np.ndarray: uint32 signatures of shape n_texts x permutations; texts without shingles get the
+        maximum value everywhere.
+    """
+    signatures = np.full((n_texts, len(a)), np.iinfo(np.uint32).max, dtype=np.uint32)
+    if len(hashes) == 0:
+        return signatures
+    present, first = np.unique(text, return_index=True)
+    blocks = np.searchsorted(first, np.arange(0, len(hashes), block_size))
+    for lo, hi in zip(blocks, [*blocks[1:], len(first)]):
+        if lo == hi:
+            continue
+        end = first[hi] if hi < len(first) else len(hashes)
+        block = hashes[first[lo] : end]
+        offsets = first[lo:hi] - first[lo]
+        permuted = np.empty_like(block)
+        for i in range(len(a)):
+            np.multiply(block, a[i], out=permuted)
+            np.add(permuted, b[i], out=permuted)
+            signatures[present[lo:hi], i] = np.minimum.reduceat(
+                permuted, offsets
+            ) >> np.uint64(32)
+    return signatures
+
+def _normalize(titles: pd.Series, contents: pd.Series) -> pd.Series:
+    text = titles.fillna("") + " " + contents.fillna("")
+    return text.str.lower().str.replace(r"\s+", " ", regex=True).str.strip()
+
+def band_keys(signatures: np.ndarray, bands: int) -> np.ndarray:
+    """
+    Hash every band of the signatures to one 64-bit bucket key.
+
+    Args:
+        signatures (np.ndarray): MinHash signatures of shape texts x permutations.
+        bands (int): The number of bands, must divide the number of permutations.
+
+    Returns:
+        np.ndarray: uint64 keys of shape bands x texts.
+    """
+    blocks = signatures.reshape(len(signatures), bands, signatures.shape[1] // bands)
+    keys = np.zeros((bands, len(signatures)), dtype=np.uint64)
+    for column in range(blocks.shape[2]):
+        keys = (keys ^ blocks[:, :, column].T) * np.uint64(0x100000001B3)
+    return keys
+
+def _signature_batch(args: tuple) -> int:
+    database, folder, n_reviews, start, first, last, k, a, b, bands = args
+    con = sqlite3.connect(database)
+    batch = pd.read_sql_query(
+        "SELECT title, content FROM reviews WHERE rowid BETWEEN ? AND ? ORDER BY rowid",
+        con,
+        params=(int(first), int(last)),
+    )
+    con.close()
+    texts = _normalize(batch["title"], batch["content"]).tolist()
+    hashes, text = shingle_hashes(texts, k)
+    signatures = minhash(hashes, text, len(texts), a, b)
+    stored = np.memmap(
+        Path(folder) / "signatures.u32",
+        dtype=np.uint32,
+        mode="r+",
+        shape=(n_reviews, len(a)),
+    )
+    stored[start : start + len(texts)] = signatures
+    stored.flush()
+    keys = np.memmap(
+        Path(folder) / "keys.u64", dtype=np.uint64, mode="r+", shape=(bands, n_reviews)
+    )
+    keys[:, start : start + len(texts)] = band_keys(signatures, bands)
+    keys.flush()
+    shingled = np.memmap(
+        Path(folder) / "shingled.bool", dtype=bool, mode="r+", shape=(n_reviews,)
+    )
+    shingled[start : start + len(texts)] = np.bincount(text, minlength=len(texts)) > 0
+    shingled.flush()
+    return len(texts)
+
+def _band_edges(
+    keys: np.ndarray, signatures: np.ndarray, rows: np.ndarray, threshold: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Candidate pairs sharing a bucket in one band, kept when their estimated Jaccard similarity reaches the threshold.
+
+    Every member of a bucket is paired with its first member, so a band adds at most
+    one edge per review.
+    """
+    order = rows[np.argsort(keys[rows], kind="stable")]
+    sorted_keys = keys[order]
+    new_bucket = np.ones(len(order), dtype=bool)
+    new_bucket[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    bucket_first = order[
+        np.maximum.accumulate(np.where(new_bucket, np.arange(len(order)), 0))
+    ]
+    left, right = bucket_first[~new_bucket], order[~new_bucket]
+    if len(left) == 0:
+        return left, right
+    similarity = (signatures[left] == signatures[right]).mean(axis=1)
+    close = similarity >= threshold
+    return left[close], right[close]
+
+def detect_near_duplicates(
+    con: sqlite3.Connection,
+    threshold: float = 0.8,
+    num_perm: int = 64,
+    bands: int = 8,
+    k: int = 5,
+    min_length: int = 40,
+    batch_size: int = 20000,
+    n_jobs: int | None = None,
+    seed: int = 0,
+) -> DataFrame:
+    """
+    Find groups of near-duplicate reviews and write their quality flag to the review_quality table.
+
+    The title and content of every review are lowercased, whitespace is collapsed
+    and the text is cut into character shingles. Worker processes each read a range
+    of rowids and write MinHash signatures into a shared memory-mapped file, so the
+    review text never passes through this process. Signatures are split into bands;
+    reviews sharing a band bucket are candidate pairs, which are kept when the share
+    of equal signature values (the estimated Jaccard similarity) reaches the
+    threshold. Connected components of the kept pairs are the near-duplicate groups.
+
+    The earliest review (lowest rowid) of a group is flagged "original" and the rest
+    "duplicate"; reviews in no group are "unique" and are not stored. Reviews whose
+    title and content are shorter than min_length characters together, such as
+    "Great show" / "Love it!", are left out because short stock phrases are repeated
+    by genuine listeners. So are reviews whose normalized text is shorter than k
+    bytes: they have no shingles, and their signatures would all be equal.
+
+    Memory grows only with the signature file (4 * num_perm bytes per review, on disk)
+    and the bucket keys (8 * bands bytes per review, on disk, one band read at a time),
+    so tens of millions of reviews fit.
+
+    Args:
+        con (sqlite3.Connection): Connection to the podcast reviews database file.
+        threshold (float): The estimated Jaccard similarity above which two reviews are near duplicates.
+        num_perm (int): The number of MinHash permutations.
+        bands (int): The number of LSH bands, must divide num_perm; the bucket collision curve is
+            steepest around (1 / bands) ** (bands / num_perm).
+        k (int): The shingle length in bytes, at most 7.
+        min_length (int): The shortest title plus content, in characters, that is compared.
+        batch_size (int): The number of reviews per worker task.
+        n_jobs (int | None): The number of worker processes, all CPUs when None, 1 runs in this process.
+        seed (int): Seed for the permutations.
+
+    Returns:
+        DataFrame: review_rowid, group_id, group_size and quality of every review in a near-duplicate group.
+    """
+    if num_perm % bands:
+        raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm}).")
+    if not 1 <= k <= 7:
+        raise ValueError(f"k must be between 1 and 7, got {k}.")
+    database = con.execute("PRAGMA database_list").fetchone()[2]
+    if not database:
+        raise ValueError(
+            "detect_near_duplicates needs a database file, not an in-memory database."
+        )
+    reviews = pd.read_sql_query(
+        "SELECT rowid, length(coalesce(title, '')) + length(coalesce(content, '')) AS length FROM reviews ORDER BY rowid",
+        con,
+    )
+    rowids = reviews["rowid"].to_numpy()
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 2**63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+    n_jobs = n_jobs or os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as folder:
+        signatures = np.memmap(
+            Path(folder) / "signatures.u32",
+            dtype=np.uint32,
+            mode="w+",
+            shape=(len(rowids), num_perm),
+        )
+        keys = np.memmap(
+            Path(folder) / "keys.u64",
+            dtype=np.uint64,
+            mode="w+",
+            shape=(bands, len(rowids)),
+        )
+        shingled = np.memmap(
+            Path(folder) / "shingled.bool", dtype=bool, mode="w+", shape=(len(rowids),)
+        )
+        tasks = [
+            (
+                database,
+                folder,
+                len(rowids),
+                start,
+                rowids[start],
+                rowids[min(start + batch_size, len(rowids)) - 1],
+                k,
+                a,
+                b,
+                bands,
+            )
+            for start in range(0, len(rowids), batch_size)
+        ]
+        if n_jobs == 1:
+            list(map(_signature_batch, tasks))
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                list(executor.map(_signature_batch, tasks))
+
+        long_enough = reviews["length"].fillna(0).to_numpy() >= min_length
+        rows = np.flatnonzero(long_enough & shingled)
+        edges = [
+            _band_edges(keys[i], signatures, rows, threshold) for i in range(bands)
+        ]
+        del signatures, keys, shingled
+
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    left = np.concatenate([edge[0] for edge in edges])
+    right = np.concatenate([edge[1] for edge in edges])
+    graph = coo_matrix(
+        (np.ones(len(left), dtype=np.int8), (left, right)), shape=(len(rowids),) * 2
+    )
+    _, component = connected_components(graph, directed=False)
+    size = np.bincount(component)
+    grouped = np.flatnonzero(size[component] > 1)
+    _, group = np.unique(component[grouped], return_inverse=True)
+    first = np.full(group.max() + 1 if len(group) else 0, len(rowids))
+    np.minimum.at(first, group, grouped)
+    flagged = pd.DataFrame(
+        {
+            "review_rowid": rowids[grouped],
+            "group_id": group,
+            "group_size": size[component[grouped]],
+            "quality": np.where(grouped == first[group], "original", "duplicate"),
+        }
+    )
+    write_review_quality(con, flagged)
+    return flagged
+
+def write_review_quality(con: sqlite3.Connection, flagged: DataFrame) -> None:
+    """
+    Replace the review_quality table, keyed by the rowid of the review.
+
+    Args:
+        con (sqlite3.Connection): Connection to the podcast reviews database.
+        flagged (DataFrame): The result of detect_near_duplicates.
+    """
+    con.execute("DROP TABLE IF EXISTS review_quality")
+    con.execute(
+        "CREATE TABLE review_quality (review_rowid INTEGER PRIMARY KEY, group_id INTEGER, group_size INTEGER, quality TEXT)"
+    )
+    con.executemany(
+        "INSERT INTO review_quality VALUES (?, ?, ?, ?)",
+        zip(*(flagged[column].tolist() for column in flagged.columns)),
+    )
+    con.commit()
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+from pandas.core.frame import DataFrame
+
+def lttb(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select points of a series with the Largest-Triangle-Three-Buckets algorithm.
+
+    The first and last points are always kept. Each bucket in between keeps the point
+    forming the largest triangle with the previously kept point and the mean of the
+    next bucket, which preserves peaks and the overall shape.
+
+    Args:
+        y (np.ndarray): The series values, equally spaced in time.
+        n_out (int): The number of points to keep.
+
+    Returns:
+        np.ndarray: Sorted indices of the kept points.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        next_x = x[next_start:next_end].mean()
+        next_y = y[next_start:next_end].mean()
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(area.argmax())
+        selected[i + 1] = previous
+    return selected
+
+def minmax(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select the minimum and maximum point of equally sized buckets of a series.
+
+    Args:
+        y (np.ndarray): The series values, equally spaced in time.
+        n_out (int): The approximate number of points to keep.
+
+    Returns:
+        np.ndarray: Sorted indices of the kept points.
+    """
+    n = len(y)
+    n_buckets = max(n_out // 2, 1)
+    if n_out >= n:
+        return np.arange(n)
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    lowest = np.minimum.reduceat(y, edges[:-1])
+    highest = np.maximum.reduceat(y, edges[:-1])
+    bucket = np.repeat(np.arange(n_buckets), np.diff(edges))
+    is_low = y == lowest[bucket]
+    is_high = y == highest[bucket]
+    first_low = np.unique(bucket[is_low], return_index=True)[1]
+    first_high = np.unique(bucket[is_high], return_index=True)[1]
+    return np.union1d(
+        np.flatnonzero(is_low)[first_low], np.flatnonzero(is_high)[first_high]
+    )
+
+def top_categories(
+    df: DataFrame,
+    top_n: int,
+    series: str = "category",
+    period: str = "year_month",
+    value: str = "num_reviews",
+) -> DataFrame:
+    """
+    Keep the largest series and add the remaining ones together as "other".
+
+    Args:
+        df (DataFrame): The DataFrame in the format used by plot_reviews_month.
+        top_n (int): The number of series with the most reviews to keep.
+        series (str): The column identifying each series.
+        period (str): The column with the month of each count.
+        value (str): The column with the counts.
+
+    Returns:
+        DataFrame: The same format with at most top_n + 1 series.
+    """
+    totals = df.groupby(series)[value].sum()
+    if len(totals) <= top_n:
+        return df
+    top = totals.nlargest(top_n).index
+    labels = df[series].where(df[series].isin(top), "other")
+    return (
+        df.assign(**{series: labels})
+        .groupby([series, period], as_index=False)[value]
+        .sum()
+    )
+
+def downsample_series(
+    df: DataFrame,
+    max_points: int,
+    method: str = "lttb",
+    series: str = "category",
+    period: str = "year_month",
+    value: str = "num_reviews",
+) -> DataFrame:
+    """
+    Reduce every series to at most max_points points.
+
+    Args:
+        df (DataFrame): The DataFrame in the format used by plot_reviews_month.
+        max_points (int): The maximum number of points kept per series.
+        method (str): "lttb" to preserve the visual shape or "minmax" to preserve extremes.
+        series (str): The column identifying each series.
+        period (str): The column with the month of each count.
+        value (str): The column with the counts.
+
+    Returns:
+        DataFrame: The downsampled rows, sorted by series and period.
+    """
+    select = {"lttb": lttb, "minmax": minmax}[method]
+    df = df.sort_values(by=[series, period])
+    parts = []
+    for _, group in df.groupby(series, sort=False):
+        indices = select(group[value].to_numpy(dtype=np.float64), max_points)
+        parts.append(group.iloc[indices])
+    return pd.concat(parts, ignore_index=True)
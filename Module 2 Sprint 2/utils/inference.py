@@ -0,0 +1,191 @@
+import numpy as np
+import pandas as pd
+from pandas.core.frame import DataFrame
+
+rating_values = [1, 2, 3, 4, 5]
+
+def rating_counts(df: DataFrame, by: str = "category") -> DataFrame:
+    """
+    Count reviews of each rating for every group.
+
+    Args:
+        df (DataFrame): The DataFrame containing one row per review with a "rating" column.
+        by (str): The column to group the reviews by.
+
+    Returns:
+        DataFrame: Counts with one row per group and one column per rating (1 to 5).
+    """
+    counts = pd.crosstab(df[by], df["rating"])
+    return counts.reindex(columns=rating_values, fill_value=0)
+
+def bootstrap_rating_counts(
+    counts: DataFrame, n_boot: int = 5000, seed: int = 0, batch_size: int = 1000
+) -> np.ndarray:
+    """
+    Draw bootstrap replicates of rating counts for every group at once.
+
+    Resampling a group's reviews with replacement is equivalent to drawing its rating
+    counts from a multinomial distribution with the observed proportions, so the
+    replicates are drawn for all groups together instead of resampling review rows.
+
+    Args:
+        counts (DataFrame): Rating counts with one row per group, as returned by rating_counts.
+        n_boot (int): The number of bootstrap replicates.
+        seed (int): Seed for the random number generator.
+        batch_size (int): The number of replicates drawn per batch, which bounds memory use.
+
+    Returns:
+        np.ndarray: Array of shape (n_boot, number of groups, 5) with the resampled counts.
+    """
+    observed = counts.to_numpy(dtype=np.int64)
+    totals = observed.sum(axis=1)
+    proportions = observed / np.maximum(totals, 1)[:, None]
+    rng = np.random.default_rng(seed)
+    replicates = np.empty((n_boot,) + observed.shape, dtype=np.int64)
+    for start in range(0, n_boot, batch_size):
+        size = min(batch_size, n_boot - start)
+        replicates[start : start + size] = rng.multinomial(
+            totals, proportions, size=(size, len(totals))
+        )
+    return replicates
+
+def _rating_metrics(counts: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Calculate mean rating and polarization metrics along the last axis of a count array.
+
+    Args:
+        counts (np.ndarray): Rating counts with ratings 1 to 5 on the last axis.
+
+    Returns:
+        dict[str, np.ndarray]: Mean rating, share of 1s, share of 5s and their sum.
+    """
+    totals = np.maximum(counts.sum(axis=-1), 1)
+    share_1 = counts[..., 0] / totals
+    share_5 = counts[..., 4] / totals
+    return {
+        "mean_rating": counts @ np.array(rating_values) / totals,
+        "share_1": share_1,
+        "share_5": share_5,
+        "polarization": share_1 + share_5,
+    }
+
+def bootstrap_rating_metrics(
+    counts: DataFrame, n_boot: int = 5000, confidence: float = 0.95, seed: int = 0
+) -> DataFrame:
+    """
+    Calculate bootstrap confidence intervals for mean rating and polarization of each group.
+
+    Polarization is the share of reviews that are either 1 or 5.
+
+    Args:
+        counts (DataFrame): Rating counts with one row per group, as returned by rating_counts.
+        n_boot (int): The number of bootstrap replicates.
+        confidence (float): The confidence level of the intervals.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        DataFrame: Number of reviews, point estimates and interval bounds for each group.
+    """
+    replicates = bootstrap_rating_counts(counts, n_boot=n_boot, seed=seed)
+    observed = _rating_metrics(counts.to_numpy(dtype=np.int64))
+    resampled = _rating_metrics(replicates)
+    tail = (1 - confidence) / 2 * 100
+    result = pd.DataFrame(index=counts.index)
+    result["num_reviews"] = counts.sum(axis=1)
+    for metric, values in observed.items():
+        low, high = np.percentile(resampled[metric], [tail, 100 - tail], axis=0)
+        result[metric] = values
+        result[f"{metric}_low"] = low
+        result[f"{metric}_high"] = high
+    return result
+
+def bootstrap_difference(
+    counts: DataFrame,
+    group_a: str,
+    group_b: str,
+    n_boot: int = 5000,
+    confidence: float = 0.95,
+    seed: int = 0,
+) -> DataFrame:
+    """
+    Calculate bootstrap confidence intervals for the difference in rating metrics between two groups.
+
+    Args:
+        counts (DataFrame): Rating counts with one row per group, as returned by rating_counts.
+        group_a (str): The first group, e.g. niche podcasts.
+        group_b (str): The second group, e.g. large podcasts.
+        n_boot (int): The number of bootstrap replicates.
+        confidence (float): The confidence level of the intervals.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        DataFrame: Observed difference (a - b), interval bounds and the share of replicates
+        on the other side of zero (two-sided) for each metric.
+    """
+    pair = counts.loc[[group_a, group_b]]
+    replicates = _rating_metrics(
+        bootstrap_rating_counts(pair, n_boot=n_boot, seed=seed)
+    )
+    observed = _rating_metrics(pair.to_numpy(dtype=np.int64))
+    tail = (1 - confidence) / 2 * 100
+    rows = {}
+    for metric, values in replicates.items():
+        difference = values[:, 0] - values[:, 1]
+        low, high = np.percentile(difference, [tail, 100 - tail])
+        p_value = 2 * min((difference <= 0).mean(), (difference >= 0).mean())
+        rows[metric] = {
+            "difference": observed[metric][0] - observed[metric][1],
+            "difference_low": low,
+            "difference_high": high,
+            "p_value": min(p_value, 1.0),
+        }
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+def ratings_homogeneity(counts: DataFrame) -> pd.Series:
+    """
+    Test whether the rating distribution is the same across all groups with a chi-square test.
+
+    Args:
+        counts (DataFrame): Rating counts with one row per group, as returned by rating_counts.
+
+    Returns:
+        pd.Series: Chi-square statistic, p-value, degrees of freedom and Cramer's V.
+    """
+    from scipy.stats import chi2_contingency
+
+    table = counts.loc[counts.sum(axis=1) > 0, counts.sum(axis=0) > 0]
+    chi2_stat, p_val, dof, expected = chi2_contingency(table)
+    n = table.to_numpy().sum()
+    r, c = table.shape
+    cramers_v = np.sqrt(chi2_stat / (n * (min(r, c) - 1)))
+    return pd.Series(
+        {
+            "chi2_statistic": chi2_stat,
+            "p_value": p_val,
+            "dof": dof,
+            "cramers_v": cramers_v,
+        }
+    )
+
+def standardized_residuals(counts: DataFrame) -> DataFrame:
+    """
+    Calculate the adjusted standardized residuals of the rating count table.
+
+    Cells with residuals above 2 or below -2 show which groups and ratings drive a
+    significant chi-square result.
+
+    Args:
+        counts (DataFrame): Rating counts with one row per group, as returned by rating_counts.
+
+    Returns:
+        DataFrame: Residuals with the same shape as the count table.
+    """
+    observed = counts.to_numpy(dtype=np.float64)
+    n = observed.sum()
+    row_share = observed.sum(axis=1, keepdims=True) / n
+    col_share = observed.sum(axis=0, keepdims=True) / n
+    expected = n * row_share * col_share
+    variance = expected * (1 - row_share) * (1 - col_share)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        residuals = (observed - expected) / np.sqrt(variance)
+    return pd.DataFrame(residuals, index=counts.index, columns=counts.columns)
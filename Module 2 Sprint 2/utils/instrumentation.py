@@ -0,0 +1,26 @@
+# Stage instrumentation is shared by the three projects and lives in the top-level
+# instrumentation package, so a fix is made once. This module loads it by file path
+# and re-exports it, so `from utils.instrumentation import traced` keeps working.
+import importlib.util
+import sys
+from pathlib import Path
+
+def load_shared(name: str):
+    """
+    Load instrumentation.<name> from the repository root by file path, without changing sys.path.
+
+    The module is registered under its package name, so the projects and the
+    top-level tools that import it share one instance and one set of recorded stages.
+    """
+    module_name = f"instrumentation.{name}"
+    if module_name not in sys.modules:
+        path = Path(__file__).resolve().parents[2] / "instrumentation" / f"{name}.py"
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[module_name]
+
+stages = load_shared("stages")
+__all__ = stages.__all__
+globals().update({name: getattr(stages, name) for name in __all__})
@@ -0,0 +1,265 @@
+import sqlite3
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+from pandas.core.frame import DataFrame
+
+loyalty_query = """
+SELECT r.podcast_id, r.author_id, c.category
+FROM reviews AS r
+INNER JOIN categories AS c ON r.podcast_id = c.podcast_id
+"""
+
+def _hash(values: pd.Series | DataFrame) -> np.ndarray:
+    """
+    Hash values, or rows of a DataFrame, to 64-bit unsigned integers.
+
+    Args:
+        values (pd.Series | DataFrame): The values to hash.
+
+    Returns:
+        np.ndarray: One uint64 hash per value or row.
+    """
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+def _bit_length(x: np.ndarray) -> np.ndarray:
+    """
+    Calculate the number of bits needed to represent each element of a uint64 array.
+
+    Args:
+        x (np.ndarray): Array of uint64 values.
+
+    Returns:
+        np.ndarray: Bit length of every value, 0 for zero.
+    """
+    x = x.copy()
+    length = np.zeros(x.shape, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = x >= np.uint64(1 << shift)
+        length += high * shift
+        x = np.where(high, x >> np.uint64(shift), x)
+    return length + (x > 0)
+
+class HyperLogLog:
+    """
+    HyperLogLog sketches estimating the number of distinct values in many groups at once.
+
+    Each group owns 2 ** precision one-byte registers, so memory does not grow with
+    the number of values added.
+    """
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.registers = np.zeros((0, 2**precision), dtype=np.uint8)
+
+    def add(self, groups: np.ndarray, hashes: np.ndarray) -> None:
+        """
+        Add hashed values to the sketches of their groups.
+
+        Args:
+            groups (np.ndarray): Integer group code of every value.
+            hashes (np.ndarray): uint64 hash of every value.
+
+        Returns:
+            None
+        """
+        if len(groups) and groups.max() >= len(self.registers):
+            missing = groups.max() + 1 - len(self.registers)
+            self.registers = np.vstack(
+                [self.registers, np.zeros((missing, 2**self.precision), np.uint8)]
+            )
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        remaining = hashes & np.uint64((1 << (64 - p)) - 1)
+        rank = (64 - p) - _bit_length(remaining) + 1
+        np.maximum.at(self.registers, (groups, index), rank.astype(np.uint8))
+
+    def estimate(self) -> np.ndarray:
+        """
+        Estimate the number of distinct values in every group.
+
+        Returns:
+            np.ndarray: Estimated distinct counts, one per group.
+        """
+        m = 2**self.precision
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m**2 / np.exp2(-self.registers.astype(np.float64)).sum(axis=1)
+        zeros = (self.registers == 0).sum(axis=1)
+        with np.errstate(divide="ignore"):
+            linear = m * np.log(m / np.maximum(zeros, 1))
+        return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+class CountMinSketch:
+    """
+    Count-min sketch of how often each hashed key has been seen, with fixed memory.
+
+    Estimates never undercount; they overcount only when keys collide in every row.
+    """
+
+    def __init__(self, width_bits: int = 20, depth: int = 4, seed: int = 0):
+        self.width_bits = width_bits
+        self.table = np.zeros((depth, 2**width_bits), dtype=np.uint32)
+        rng = np.random.default_rng(seed)
+        self.multipliers = rng.integers(1, 2**63, size=depth, dtype=np.uint64) * 2 + 1
+
+    def _columns(self, hashes: np.ndarray) -> np.ndarray:
+        shift = np.uint64(64 - self.width_bits)
+        return ((hashes[None, :] * self.multipliers[:, None]) >> shift).astype(np.int64)
+
+    def add(self, hashes: np.ndarray, counts: np.ndarray) -> None:
+        """
+        Increase the counts of hashed keys.
+
+        Args:
+            hashes (np.ndarray): uint64 hash of every key.
+            counts (np.ndarray): The amount to add for every key.
+
+        Returns:
+            None
+        """
+        columns = self._columns(hashes)
+        for row in range(len(self.table)):
+            np.add.at(self.table[row], columns[row], counts.astype(np.uint32))
+
+    def query(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Estimate the counts of hashed keys.
+
+        Args:
+            hashes (np.ndarray): uint64 hash of every key.
+
+        Returns:
+            np.ndarray: Estimated count of every key.
+        """
+        columns = self._columns(hashes)
+        rows = np.arange(len(self.table))[:, None]
+        return self.table[rows, columns].min(axis=0)
+
+class LoyaltyAggregator:
+    """
+    Single-pass aggregator of podcast review concentration and reviewer loyalty per category.
+
+    Review counts are kept exactly per category and podcast, which is bounded by the
+    podcast catalogue. Authors are never stored: distinct authors are estimated with
+    HyperLogLog and repeat reviewers are detected with a count-min sketch of
+    (category, author) pairs.
+    """
+
+    def __init__(self, precision: int = 12, width_bits: int = 20, depth: int = 4):
+        self.category_codes: dict[str, int] = {}
+        self.podcast_counts: pd.Series | None = None
+        self.authors = HyperLogLog(precision)
+        self.repeat_authors = HyperLogLog(precision)
+        self.pair_counts = CountMinSketch(width_bits, depth)
+
+    def _encode(self, categories: pd.Series) -> np.ndarray:
+        for category in categories.unique():
+            self.category_codes.setdefault(category, len(self.category_codes))
+        return categories.map(self.category_codes).to_numpy(dtype=np.int64)
+
+    def update(self, chunk: DataFrame) -> None:
+        """
+        Add a chunk of reviews with podcast_id, author_id and category columns.
+
+        Args:
+            chunk (DataFrame): The chunk of reviews.
+
+        Returns:
+            None
+        """
+        counts = chunk.groupby(["category", "podcast_id"]).size()
+        if self.podcast_counts is None:
+            self.podcast_counts = counts
+        else:
+            self.podcast_counts = self.podcast_counts.add(counts, fill_value=0)
+
+        codes = self._encode(chunk["category"])
+        author_hashes = _hash(chunk["author_id"])
+        self.authors.add(codes, author_hashes)
+
+        pair_hashes = _hash(chunk[["category", "author_id"]])
+        unique_pairs, first, chunk_counts = np.unique(
+            pair_hashes, return_index=True, return_counts=True
+        )
+        seen_before = self.pair_counts.query(unique_pairs)
+        repeat = seen_before + chunk_counts >= 2
+        self.repeat_authors.add(codes[first[repeat]], author_hashes[first[repeat]])
+        self.pair_counts.add(unique_pairs, chunk_counts)
+
+    def result(self) -> DataFrame:
+        """
+        Calculate the loyalty metrics of every category seen so far.
+
+        Returns:
+            DataFrame: One row per category with num_podcasts, total_reviews, review share
+            concentration (HHI, Gini, top podcast share), distinct_authors and repeat_reviewer_rate.
+        """
+        counts = self.podcast_counts.astype(np.int64)
+        grouped = counts.groupby(level="category")
+        shares = counts / grouped.transform("sum")
+        result = pd.DataFrame(
+            {
+                "num_podcasts": grouped.size(),
+                "total_reviews": grouped.sum(),
+                "hhi": (shares**2).groupby(level="category").sum(),
+                "gini": grouped.apply(lambda x: _gini(x.to_numpy())),
+                "top_podcast_share": shares.groupby(level="category").max(),
+            }
+        )
+        codes = result.index.map(self.category_codes).to_numpy()
+        distinct = self.authors.estimate()[codes]
+        repeat = self.repeat_authors.estimate()
+        repeat = np.pad(repeat, (0, len(self.category_codes) - len(repeat)))[codes]
+        result["distinct_authors"] = np.round(distinct).astype(np.int64)
+        result["repeat_reviewer_rate"] = np.clip(repeat / distinct, 0, 1)
+        return result.rename_axis("category").reset_index()
+
+def _gini(counts: np.ndarray) -> float:
+    """
+    Calculate the Gini coefficient of review counts across podcasts.
+
+    Args:
+        counts (np.ndarray): Number of reviews of every podcast.
+
+    Returns:
+        float: 0 when reviews are spread evenly, close to 1 when one podcast gets them all.
+    """
+    n = len(counts)
+    if n < 2 or counts.sum() == 0:
+        return 0.0
+    ordered = np.sort(counts)
+    ranks = np.arange(1, n + 1)
+    return float(2 * (ranks * ordered).sum() / (n * ordered.sum()) - (n + 1) / n)
+
+def category_loyalty(
+    chunks: Iterable[DataFrame], precision: int = 12, width_bits: int = 20
+) -> DataFrame:
+    """
+    Calculate loyalty metrics per category from an iterable of review chunks in one pass.
+
+    Args:
+        chunks (Iterable[DataFrame]): Chunks with podcast_id, author_id and category columns.
+        precision (int): HyperLogLog precision, 2 ** precision registers per category.
+        width_bits (int): Count-min sketch width, 2 ** width_bits counters per row.
+
+    Returns:
+        DataFrame: The loyalty metrics, usable with plot_podcasts_reviews and plot_loyalty.
+    """
+    aggregator = LoyaltyAggregator(precision=precision, width_bits=width_bits)
+    for chunk in chunks:
+        aggregator.update(chunk)
+    return aggregator.result()
+
+def sql_category_loyalty(con: sqlite3.Connection, chunksize: int = 200000) -> DataFrame:
+    """
+    Calculate loyalty metrics per category by streaming the reviews table of the podcast database.
+
+    Args:
+        con (sqlite3.Connection): Connection to the podcast reviews database.
+        chunksize (int): The number of rows read per chunk.
+
+    Returns:
+        DataFrame: The loyalty metrics, usable with plot_podcasts_reviews and plot_loyalty.
+    """
+    return category_loyalty(pd.read_sql_query(loyalty_query, con, chunksize=chunksize))
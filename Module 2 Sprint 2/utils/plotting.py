@@ -0,0 +1,569 @@
+from __future__ import annotations
+
+import itertools
+from typing import TYPE_CHECKING
+from pandas.core.frame import DataFrame
+from utils.downsample import downsample_series, top_categories
+from utils.instrumentation import span, traced
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+__all__ = [
+    "hist_figure",
+    "plot_hist",
+    "line_figure",
+    "plot_line",
+    "counts_figure",
+    "plot_counts",
+    "counts_series_figure",
+    "plot_counts_series",
+    "box_figure",
+    "plot_box",
+    "ratings_categories_figure",
+    "plot_ratings_categories",
+    "reviews_month_figure",
+    "plot_reviews_month",
+    "true_crime_month_figure",
+    "plot_true_crime_month",
+    "podcasts_reviews_figure",
+    "plot_podcasts_reviews",
+    "loyalty_figure",
+    "plot_loyalty",
+    "term_month_figure",
+    "plot_term_month",
+]
+
+def hist_figure(df: DataFrame, counts: str | None = None) -> go.Figure:
+    """
+    Build the histogram of ratings drawn by plot_hist.
+
+    Args:
+        df (DataFrame): The DataFrame containing the ratings data.
+        counts (str | None): Column holding the number of reviews of each rating when df is already
+            counted, which keeps the figure small; None for one row per review.
+
+    Returns:
+        go.Figure: The figure.
+    """
+    import plotly.express as px
+
+    if counts is None:
+        data = dict(data_frame=df)
+    else:
+        data = dict(x=df[df.columns.drop(counts)[0]], y=df[counts], histfunc="sum")
+    fig = px.histogram(
+        **data,
+        title="Distribution of Podcast Ratings",
+        template="plotly_white",
+        color_discrete_sequence=["#1f77b4"],
+    )
+    fig.update_layout(
+        yaxis=dict(title="Frequency"),
+        xaxis=dict(title="Ratings"),
+        bargap=0.1,
+        showlegend=False,
+        title_x=0.5,
+        title_y=0.9,
+    )
+    return fig
+
+@traced("render")
+def plot_hist(df: DataFrame) -> None:
+    """
+    Plot histogram of ratings from a DataFrame.
+
+    Args:
+        df (DataFrame): The DataFrame containing the ratings data.
+
+    Returns:
+        None
+    """
+    hist_figure(df).show()
+
+def line_figure(df: DataFrame) -> go.Figure:
+    """
+    Build the line chart of weekly reviews drawn by plot_line.
+
+    Args:
+        df (DataFrame): The DataFrame containing the data.
+
+    Returns:
+        go.Figure: The figure.
+    """
+    import plotly.express as px
+
+    fig = px.line(
+        df,
+        x="review_week",
+        y="num_reviews",
+        title="Total Number Of Weekly Reviews",
+        template="plotly_white",
+        color_discrete_sequence=["#1f77b4"],
+    )
+    fig.update_layout(
+        yaxis=dict(title="Number Of Reviews"),
+        xaxis=dict(title="Time"),
+        title_x=0.5,
+        title_y=0.9,
+    )
+    return fig
+
+@traced("render")
+def plot_line(df: DataFrame) -> None:
+    """
+    Plot line chart of data from a DataFrame.
+
+    Args:
+        df (DataFrame): The DataFrame containing the data.
+
+    Returns:
+        None
+    """
+    line_figure(df).show()
+
+def counts_figure(df: DataFrame, title: str) -> go.Figure:
+    """
+    Build the bar chart of counts drawn by plot_counts.
+
+    Args:
+        df (DataFrame): The DataFrame containing the data.
+        title (str): The title of the plot.
+
+    Returns:
+        go.Figure: The figure.
+    """
+    import plotly.express as px
+
+    fig = px.bar(
+        df,
+        x="category",
+        y="counts",
+        title=title,
+        template="plotly_white",
+        color_discrete_sequence=["#1f77b4"],
+    )
+    fig.update_layout(
+        xaxis=dict(title="Number Of Podcasts"),
+        yaxis=dict(title="Categories"),
+        title_x=0.5,
+        title_y=0.93,
+        xaxis_tickfont=dict(size=11),
+    )
+    return fig
+
+@traced("render")
+def plot_counts(df: DataFrame, title: str) -> None:
+    """
+    Plot bar chart of counts from a DataFrame.
+
+    Args:
+        df (DataFrame): The DataFrame containing the data.
+        title (str): The title of the plot.
+
+    Returns:
+        None
+    """
+    counts_figure(df, title).show()
+
+def counts_series_figure(df: DataFrame) -> go.Figure:
+    """
+    Build the bar chart of counts from a Series drawn by plot_counts_series.
+
+    Args:
+        df (DataFrame): The DataFrame containing the data.
+
+    Returns:
+        go.Figure: The figure.
+    """
+    import plotly.express as px
+
+    fig = px.bar(
+        df,
+        title="Distribution of New Categories (By Selecting Largest Category)",
+        template="plotly_white",
+        color_discrete_sequence=["#1f77b4"],
+    )
+    fig.update_layout(
+        yaxis=dict(title="Number Of Podcasts"),
+        xaxis=dict(title="Categories"),
+        showlegend=False,
+        title_x=0.5,
+        title_y=0.9,
+        xaxis_tickfont=dict(size=11),
+    )
+    return fig
+
+@traced("render")
+def plot_counts_series(df: DataFrame) -> None:
+    """
+    Plot bar chart of counts from a Series.
+
+    Args:
+        df (DataFrame): The DataFrame containing the data.
+
+    Returns:
+        None
+    """
+    counts_series_figure(df).show()
+
+def box_figure(df: DataFrame) -> go.Figure:
+    """
+    Build the box plot of category review counts drawn by plot_box.
+
+    Args:
+        df (DataFrame): The DataFrame containing the data.
+
+    Returns:
+        go.Figure: The figure.
+    """
+    import plotly.express as px
+
+    fig = px.box(
+        df["category"].value_counts(),
+        title="Number Of Reviews In Each Category",
+        template="plotly_white",
+        color_discrete_sequence=["#1f77b4"],
+    )
+    fig.update_layout(
+        yaxis=dict(title="Number Of Reviews"),
+        xaxis=dict(title="All Podcasts"),
+        title_x=0.5,
+        title_y=0.9,
+        xaxis_tickfont=dict(size=1),
+    )
+    return fig
+
+@traced("render")
+def plot_box(df: DataFrame) -> None:
+    """
+    Plot box plot of each categorie counts from a DataFrame.
+
+    Args:
+        df (DataFrame): The DataFrame containing the data.
+
+    Returns:
+        None
+    """
+    box_figure(df).show()
+
+def ratings_categories_figure(df: DataFrame) -> go.Figure:
+    """
+    Build the stacked bar chart of rating proportions drawn by plot_ratings_categories.
+
+    Args:
+        df (DataFrame): The DataFrame containing the data.
+
+    Returns:
+        go.Figure: The figure.
+    """
+    import plotly.express as px
+
+    fig = px.bar(
+        df,
+        x="category",
+        y=[1, 2, 3, 4, 5],
+        labels={"value": "Proportion", "category": "Category", "variable": "Rating"},
+        color_discrete_sequence=px.colors.qualitative.Pastel,
+        title="Proportions of Ratings Across Categories",
+        template="plotly_white",
+    )
+    fig.update_layout(
+        xaxis_tickangle=45,
+        title_x=0.5,
+        legend_title="Rating",
+        height=420,
+        xaxis_tickfont=dict(size=11),
+    )
+    return fig
+
+@traced("render")
+def plot_ratings_categories(df: DataFrame) -> None:
+    """
+    Plot proportional stacked bar chart of ratings across categories.
+
+    Args:
+        df (DataFrame): The DataFrame containing the data.
+
+    Returns:
+        None
+    """
+    ratings_categories_figure(df).show()
+
+def reviews_month_figure(
+    df: DataFrame,
+    top_n: int | None = None,
+    max_points: int | None = None,
+    method: str = "lttb",
+) -> go.Figure:
+    """
+    Build the line chart of monthly reviews by category drawn by plot_reviews_month.
+
+    Setting top_n or max_points switches to a compact rendering mode: only the top_n
+    categories are drawn with the rest summed as "other", every trace is downsampled to
+    max_points points and WebGL traces are used, so the figure size does not grow with
+    the number of months and categories.
+
+    Args:
+        df (DataFrame): The DataFrame containing the data.
+        top_n (int | None): The number of categories with the most reviews to draw.
+        max_points (int | None): The maximum number of points per category.
+        method (str): The downsampling method, "lttb" or "minmax".
+
+    Returns:
+        go.Figure: The figure.
+    """
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    if top_n is None and max_points is None:
+        fig = px.line(
+            df,
+            x="year_month",
+            y="num_reviews",
+            title="Number Of Monthly Reviews By Category",
+            color="category",
+            template="plotly_white",
+        )
+    else:
+        with span("downsample", "compute") as stage:
+            stage.rows = len(df)
+            if top_n is not None:
+                df = top_categories(df, top_n)
+            if max_points is not None:
+                df = downsample_series(df, max_points, method=method)
+        fig = go.Figure(
+            [
+                go.Scattergl(
+                    x=group["year_month"],
+                    y=group["num_reviews"],
+                    mode="lines",
+                    name=category,
+                    line=dict(color=color),
+                )
+                for (category, group), color in zip(
+                    df.sort_values(by="year_month").groupby("category"),
+                    itertools.cycle(px.colors.qualitative.Plotly),
+                )
+            ]
+        )
+        fig.update_layout(
+            title="Number Of Monthly Reviews By Category", template="plotly_white"
+        )
+    fig.update_layout(
+        yaxis=dict(title="Number of Reviews"),
+        xaxis=dict(title="Months"),
+        legend=dict(title="Categories"),
+        height=600,
+        title_x=0.42,
+        title_y=0.93,
+    )
+    return fig
+
+@traced("render")
+def plot_reviews_month(
+    df: DataFrame,
+    top_n: int | None = None,
+    max_points: int | None = None,
+    method: str = "lttb",
+) -> None:
+    """
+    Plot line chart of number of reviews per month by category.
+
+    Setting top_n or max_points switches to a compact rendering mode: only the top_n
+    categories are drawn with the rest summed as "other", every trace is downsampled to
+    max_points points and WebGL traces are used, so the figure size does not grow with
+    the number of months and categories.
+
+    Args:
+        df (DataFrame): The DataFrame containing the data.
+        top_n (int | None): The number of categories with the most reviews to draw.
+        max_points (int | None): The maximum number of points per category.
+        method (str): The downsampling method, "lttb" or "minmax".
+
+    Returns:
+        None
+    """
+    reviews_month_figure(df, top_n, max_points, method).show()
+
+def true_crime_month_figure(df: DataFrame) -> go.Figure:
+    """
+    Build the line chart of True-Crime rating proportions drawn by plot_true_crime_month.
+
+    Args:
+        df (DataFrame): The DataFrame containing the data.
+
+    Returns:
+        go.Figure: The figure.
+    """
+    import plotly.express as px
+
+    fig = px.line(
+        df,
+        x="year_month",
+        y="proportion",
+        color="rating",
+        template="plotly_white",
+        title="Rating Change For True-Crime Podcasts",
+    )
+    fig.update_layout(
+        yaxis=dict(title="Proportion of Ratings"),
+        xaxis=dict(title="Months"),
+        legend=dict(title="Ratings"),
+        title_x=0.5,
+        title_y=0.9,
+    )
+    return fig
+
+@traced("render")
+def plot_true_crime_month(df: DataFrame) -> None:
+    """
+    Plot line chart of proportion of ratings over time for True-Crime podcasts.
+
+    Args:
+        df (DataFrame): The DataFrame containing the data.
+
+    Returns:
+        None
+    """
+    true_crime_month_figure(df).show()
+
+def podcasts_reviews_figure(df: DataFrame) -> go.Figure:
+    """
+    Build the scatter plot of podcasts and reviews per category drawn by plot_podcasts_reviews.
+
+    Args:
+        df (DataFrame): The DataFrame containing the data.
+
+    Returns:
+        go.Figure: The figure.
+    """
+    import plotly.express as px
+
+    fig = px.scatter(
+        df,
+        x="num_podcasts",
+        y="total_reviews",
+        hover_name="category",
+        title="Number of Podcasts And Reviews For Each Category",
+        labels={"num_podcasts": "Number of Podcasts", "total_reviews": "Total Reviews"},
+        template="plotly_white",
+        color_discrete_sequence=["#1f77b4"],
+    )
+    fig.update_traces(marker=dict(size=6, opacity=0.8))
+    fig.update_layout(title_x=0.5, title_y=0.9)
+    return fig
+
+@traced("render")
+def plot_podcasts_reviews(df: DataFrame) -> None:
+    """
+    Plot scatter plot of number of podcasts and total reviews for each category.
+
+    Args:
+        df (DataFrame): The DataFrame containing the data.
+
+    Returns:
+        None
+    """
+    podcasts_reviews_figure(df).show()
+
+def loyalty_figure(
+    df: DataFrame, x: str = "hhi", y: str = "repeat_reviewer_rate"
+) -> go.Figure:
+    """
+    Build the scatter plot of listener loyalty metrics drawn by plot_loyalty.
+
+    Args:
+        df (DataFrame): The DataFrame containing the loyalty metrics of each category.
+        x (str): The metric plotted on the x axis.
+        y (str): The metric plotted on the y axis.
+
+    Returns:
+        go.Figure: The figure.
+    """
+    import plotly.express as px
+
+    labels = {
+        "hhi": "Review Concentration (HHI)",
+        "gini": "Review Concentration (Gini)",
+        "top_podcast_share": "Review Share Of Top Podcast",
+        "repeat_reviewer_rate": "Repeat Reviewer Rate",
+        "num_podcasts": "Number of Podcasts",
+        "total_reviews": "Total Reviews",
+    }
+    fig = px.scatter(
+        df,
+        x=x,
+        y=y,
+        hover_name="category",
+        title="Listener Loyalty For Each Category",
+        labels=labels,
+        template="plotly_white",
+        color_discrete_sequence=["#1f77b4"],
+    )
+    fig.update_traces(marker=dict(size=6, opacity=0.8))
+    fig.update_layout(title_x=0.5, title_y=0.9)
+    return fig
+
+@traced("render")
+def plot_loyalty(
+    df: DataFrame, x: str = "hhi", y: str = "repeat_reviewer_rate"
+) -> None:
+    """
+    Plot scatter plot of listener loyalty metrics for each category.
+
+    Args:
+        df (DataFrame): The DataFrame containing the loyalty metrics of each category.
+        x (str): The metric plotted on the x axis.
+        y (str): The metric plotted on the y axis.
+
+    Returns:
+        None
+    """
+    loyalty_figure(df, x, y).show()
+
+def term_month_figure(df: DataFrame, y: str = "num_reviews") -> go.Figure:
+    """
+    Build the line chart of search term mentions drawn by plot_term_month.
+
+    Args:
+        df (DataFrame): The DataFrame containing the data.
+        y (str): "num_reviews" for counts or "proportion" for the share of monthly reviews.
+
+    Returns:
+        go.Figure: The figure.
+    """
+    import plotly.express as px
+
+    fig = px.line(
+        df,
+        x="year_month",
+        y=y,
+        title="Monthly Reviews Mentioning Search Terms",
+        color="term",
+        template="plotly_white",
+    )
+    fig.update_layout(
+        yaxis=dict(
+            title="Number of Reviews" if y == "num_reviews" else "Proportion of Reviews"
+        ),
+        xaxis=dict(title="Months"),
+        legend=dict(title="Terms"),
+        title_x=0.5,
+        title_y=0.9,
+    )
+    return fig
+
+@traced("render")
+def plot_term_month(df: DataFrame, y: str = "num_reviews") -> None:
+    """
+    Plot line chart of reviews mentioning each search term per month.
+
+    Args:
+        df (DataFrame): The DataFrame containing the data.
+        y (str): "num_reviews" for counts or "proportion" for the share of monthly reviews.
+
+    Returns:
+        None
+    """
+    term_month_figure(df, y).show()
@@ -0,0 +1,193 @@
+import sqlite3
+
+import pandas as pd
+from pandas.core.frame import DataFrame
+
+def build_review_index(con: sqlite3.Connection) -> int:
+    """
+    Build a full-text index over review titles and contents in bulk.
+
+    The index is an FTS5 table that reads its text from the reviews table, so the
+    review text is not stored twice. Building it again drops the old index.
+
+    Args:
+        con (sqlite3.Connection): Connection to the podcast reviews database.
+
+    Returns:
+        int: The number of indexed reviews.
+    """
+    con.executescript(
+        """
+        DROP TABLE IF EXISTS review_search;
+        CREATE VIRTUAL TABLE review_search USING fts5(
+            title, content, content='reviews', content_rowid='rowid',
+            tokenize='porter unicode61'
+        );
+        INSERT INTO review_search(review_search) VALUES('rebuild');
+        INSERT INTO review_search(review_search) VALUES('optimize');
+        CREATE TABLE IF NOT EXISTS review_search_state (last_rowid INTEGER);
+        DELETE FROM review_search_state;
+        INSERT INTO review_search_state SELECT COALESCE(MAX(rowid), 0) FROM reviews;
+        """
+    )
+    con.commit()
+    return con.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+
+def update_review_index(con: sqlite3.Connection) -> int:
+    """
+    Add reviews inserted since the last build or update to the full-text index.
+
+    Reviews are only ever appended to the dataset, so new reviews are found by rowid.
+
+    Args:
+        con (sqlite3.Connection): Connection to the podcast reviews database.
+
+    Returns:
+        int: The number of newly indexed reviews.
+    """
+    last_rowid = con.execute("SELECT last_rowid FROM review_search_state").fetchone()[0]
+    cursor = con.execute(
+        """
+        INSERT INTO review_search(rowid, title, content)
+        SELECT rowid, title, content FROM reviews WHERE rowid > ?
+        """,
+        (last_rowid,),
+    )
+    added = cursor.rowcount
+    con.execute(
+        "UPDATE review_search_state SET last_rowid = (SELECT MAX(rowid) FROM reviews)"
+    )
+    con.commit()
+    return added
+
+def _filters(
+    category: str | None,
+    rating: int | list[int] | None,
+    start_month: str | None,
+    end_month: str | None,
+) -> tuple[str, list]:
+    """
+    Build the SQL conditions and parameters for the review filters.
+
+    Args:
+        category (str | None): Keep only reviews of podcasts in this category.
+        rating (int | list[int] | None): Keep only reviews with this rating or these ratings.
+        start_month (str | None): Keep only reviews from this month on, as "YYYY-MM".
+        end_month (str | None): Keep only reviews up to this month, as "YYYY-MM".
+
+    Returns:
+        tuple[str, list]: The conditions joined with AND (empty when there are none) and their parameters.
+    """
+    conditions = []
+    params = []
+    if category is not None:
+        conditions.append(
+            "r.podcast_id IN (SELECT podcast_id FROM categories WHERE category = ?)"
+        )
+        params.append(category)
+    if rating is not None:
+        ratings = [rating] if isinstance(rating, int) else list(rating)
+        conditions.append(f"r.rating IN ({', '.join('?' * len(ratings))})")
+        params.extend(ratings)
+    if start_month is not None:
+        conditions.append("substr(r.created_at, 1, 7) >= ?")
+        params.append(start_month)
+    if end_month is not None:
+        conditions.append("substr(r.created_at, 1, 7) <= ?")
+        params.append(end_month)
+    return " AND ".join(conditions), params
+
+def search_reviews(
+    con: sqlite3.Connection,
+    query: str,
+    category: str | None = None,
+    rating: int | list[int] | None = None,
+    start_month: str | None = None,
+    end_month: str | None = None,
+    limit: int = 100,
+) -> DataFrame:
+    """
+    Find the reviews that best match a full-text query.
+
+    Args:
+        con (sqlite3.Connection): Connection to the podcast reviews database with a built index.
+        query (str): FTS5 query, e.g. "ads", "boring OR repetitive" or '"too many ads"'.
+        category (str | None): Keep only reviews of podcasts in this category.
+        rating (int | list[int] | None): Keep only reviews with this rating or these ratings.
+        start_month (str | None): Keep only reviews from this month on, as "YYYY-MM".
+        end_month (str | None): Keep only reviews up to this month, as "YYYY-MM".
+        limit (int): The maximum number of reviews returned.
+
+    Returns:
+        DataFrame: Matching reviews ordered by relevance.
+    """
+    conditions, params = _filters(category, rating, start_month, end_month)
+    sql = f"""
+    SELECT r.podcast_id, r.title, r.content, r.rating, r.created_at
+    FROM review_search AS s
+    INNER JOIN reviews AS r ON r.rowid = s.rowid
+    WHERE review_search MATCH ? {"AND " + conditions if conditions else ""}
+    ORDER BY bm25(review_search)
+    LIMIT ?
+    """
+    return pd.read_sql_query(sql, con, params=[query, *params, limit])
+
+def term_month_counts(
+    con: sqlite3.Connection,
+    terms: list[str],
+    category: str | None = None,
+    rating: int | list[int] | None = None,
+    start_month: str | None = None,
+    end_month: str | None = None,
+) -> DataFrame:
+    """
+    Count the reviews matching each term in every month.
+
+    Args:
+        con (sqlite3.Connection): Connection to the podcast reviews database with a built index.
+        terms (list[str]): FTS5 queries, one time series is returned for each.
+        category (str | None): Keep only reviews of podcasts in this category.
+        rating (int | list[int] | None): Keep only reviews with this rating or these ratings.
+        start_month (str | None): Keep only reviews from this month on, as "YYYY-MM".
+        end_month (str | None): Keep only reviews up to this month, as "YYYY-MM".
+
+    Returns:
+        DataFrame: Columns year_month, term, num_reviews and proportion, the share of all
+        reviews in that month (with the same filters) that match the term.
+    """
+    conditions, params = _filters(category, rating, start_month, end_month)
+    where = f"WHERE {conditions}" if conditions else ""
+    totals = pd.read_sql_query(
+        f"""
+        SELECT substr(r.created_at, 1, 7) AS year_month, COUNT(*) AS total_reviews
+        FROM reviews AS r
+        {where}
+        GROUP BY year_month
+        """,
+        con,
+        params=params,
+    )
+    frames = []
+    for term in terms:
+        counts = pd.read_sql_query(
+            f"""
+            SELECT substr(r.created_at, 1, 7) AS year_month, COUNT(*) AS num_reviews
+            FROM review_search AS s
+            INNER JOIN reviews AS r ON r.rowid = s.rowid
+            WHERE review_search MATCH ? {"AND " + conditions if conditions else ""}
+            GROUP BY year_month
+            """,
+            con,
+            params=[term, *params],
+        )
+        counts = totals.merge(counts, on="year_month", how="left").fillna(
+            {"num_reviews": 0}
+        )
+        counts["term"] = term
+        frames.append(counts)
+    result = pd.concat(frames, ignore_index=True)
+    result["num_reviews"] = result["num_reviews"].astype(int)
+    result["proportion"] = result["num_reviews"] / result["total_reviews"]
+    return result[["year_month", "term", "num_reviews", "proportion"]].sort_values(
+        by=["term", "year_month"]
+    )
@@ -0,0 +1,192 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from pandas.core.frame import DataFrame
+
+def monthly_matrix(
+    df: DataFrame,
+    series: str = "category",
+    period: str = "year_month",
+    value: str = "num_reviews",
+) -> DataFrame:
+    """
+    Pivot long monthly review counts into a series by month matrix.
+
+    Args:
+        df (DataFrame): The DataFrame in the format used by plot_reviews_month.
+        series (str): The column identifying each series, e.g. category or podcast.
+        period (str): The column with the month of each count.
+        value (str): The column with the counts.
+
+    Returns:
+        DataFrame: Matrix with one row per series and one sorted column per month, missing months filled with 0.
+    """
+    matrix = df.pivot_table(
+        index=series, columns=period, values=value, aggfunc="sum", fill_value=0
+    )
+    return matrix.sort_index(axis=1)
+
+def _masked_slope(
+    values: np.ndarray, time: np.ndarray, mask: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fit a least squares line to every row of a matrix, using only the cells selected by a mask.
+
+    Args:
+        values (np.ndarray): Matrix of series values, one row per series.
+        time (np.ndarray): Time index of the columns.
+        mask (np.ndarray): Boolean matrix selecting the cells used for each row.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Slope, standard error of the slope and number of points per row.
+    """
+    weights = mask.astype(np.float64)
+    n = weights.sum(axis=1)
+    safe_n = np.maximum(n, 1)
+    t_mean = weights @ time / safe_n
+    y_mean = (weights * values).sum(axis=1) / safe_n
+    t_centered = (time[None, :] - t_mean[:, None]) * weights
+    y_centered = (values - y_mean[:, None]) * weights
+    sxx = (t_centered**2).sum(axis=1)
+    sxy = (t_centered * y_centered).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = sxy / sxx
+        residuals = y_centered - slope[:, None] * t_centered
+        sse = (residuals**2).sum(axis=1)
+        slope_se = np.sqrt(sse / (n - 2) / sxx)
+    return slope, slope_se, n
+
+def _changepoints(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Find the single mean-shift changepoint of every row with one cumulative sum scan.
+
+    For a split after k of T points the reduction in squared error is
+    k * (T - k) / T * (left mean - right mean) ** 2, which is evaluated for all
+    splits and rows at once. With fewer than two points there is no split, and every
+    row gets index 0 and strength 0.
+
+    Args:
+        values (np.ndarray): Matrix of series values, one row per series.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Index of the first point after the change and the share of variance explained by the split.
+    """
+    T = values.shape[1]
+    if T < 2:
+        return np.zeros(len(values), dtype=np.int64), np.zeros(len(values))
+    k = np.arange(1, T)
+    cumulative = np.cumsum(values, axis=1)
+    total = cumulative[:, -1:]
+    left_mean = cumulative[:, :-1] / k
+    right_mean = (total - cumulative[:, :-1]) / (T - k)
+    gain = k * (T - k) / T * (left_mean - right_mean) ** 2
+    best = gain.argmax(axis=1)
+    total_ss = ((values - values.mean(axis=1, keepdims=True)) ** 2).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        explained = np.where(
+            total_ss > 0, gain[np.arange(len(values)), best] / total_ss, 0.0
+        )
+    return best + 1, explained
+
+def _fit_block(values: np.ndarray, confidence: float) -> dict[str, np.ndarray]:
+    """
+    Fit the trend and changepoint models to a block of series.
+
+    Args:
+        values (np.ndarray): Matrix of series values, one row per series.
+        confidence (float): The confidence level of the slope intervals.
+
+    Returns:
+        dict[str, np.ndarray]: Model results for every row of the block.
+    """
+    from scipy.stats import t as t_dist
+
+    T = values.shape[1]
+    time = np.arange(T, dtype=np.float64)
+    full = np.ones(values.shape, dtype=bool)
+    slope, slope_se, n = _masked_slope(values, time, full)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_stat = slope / slope_se
+    p_value = 2 * t_dist.sf(np.abs(t_stat), df=np.maximum(n - 2, 1))
+    margin = t_dist.ppf(0.5 + confidence / 2, df=np.maximum(n - 2, 1)) * slope_se
+
+    change_at, explained = _changepoints(values)
+    after = time[None, :] >= change_at[:, None]
+    recent_slope, _, _ = _masked_slope(values, time, after)
+    before_sum = np.where(~after, values, 0).sum(axis=1)
+    after_sum = np.where(after, values, 0).sum(axis=1)
+    mean = values.mean(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_before = before_sum / change_at
+        mean_after = after_sum / (T - change_at)
+        relative_slope = np.where(mean > 0, slope / mean * 100, np.nan)
+    return {
+        "slope": slope,
+        "slope_low": slope - margin,
+        "slope_high": slope + margin,
+        "relative_slope_%": relative_slope,
+        "t_stat": t_stat,
+        "p_value": p_value,
+        "changepoint": change_at,
+        "changepoint_strength": explained,
+        "mean_before": mean_before,
+        "mean_after": mean_after,
+        "recent_slope": recent_slope,
+    }
+
+def fit_trends(
+    matrix: DataFrame,
+    log: bool = False,
+    confidence: float = 0.95,
+    parallel_threshold: int = 20000,
+    max_workers: int | None = None,
+) -> DataFrame:
+    """
+    Fit a linear trend and a single changepoint to every series of a monthly matrix and rank them.
+
+    Series are fitted together with vectorized least squares. When the number of
+    series exceeds parallel_threshold, blocks of rows are fitted in worker processes.
+
+    Args:
+        matrix (DataFrame): Series by month matrix, as returned by monthly_matrix.
+        log (bool): Fit the models to log(1 + counts) so that slopes measure relative growth.
+        confidence (float): The confidence level of the slope intervals.
+        parallel_threshold (int): The number of series above which the fit runs in parallel.
+        max_workers (int | None): The number of worker processes, defaults to the number of CPUs.
+
+    Returns:
+        DataFrame: One row per series, ranked from the strongest growth to the strongest decline,
+        with slope, confidence interval, p-value and changepoint month; the changepoint is None when
+        the matrix has fewer than two months.
+    """
+    values = matrix.to_numpy(dtype=np.float64)
+    if log:
+        values = np.log1p(values)
+    if len(values) > parallel_threshold:
+        workers = max_workers or os.cpu_count() or 1
+        blocks = np.array_split(values, workers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(_fit_block, blocks, [confidence] * len(blocks)))
+        results = {
+            key: np.concatenate([part[key] for part in parts]) for key in parts[0]
+        }
+    else:
+        results = _fit_block(values, confidence)
+
+    trends = pd.DataFrame(results, index=matrix.index)
+    months = np.asarray(matrix.columns)
+    if len(months) > 1:
+        trends["changepoint"] = months[trends["changepoint"].to_numpy()]
+    else:
+        trends["changepoint"] = None
+    trends["trend"] = np.select(
+        [
+            (trends["p_value"] < 1 - confidence) & (trends["slope"] > 0),
+            (trends["p_value"] < 1 - confidence) & (trends["slope"] < 0),
+        ],
+        ["growing", "declining"],
+        default="no trend",
+    )
+    return trends.sort_values(by="t_stat", ascending=False)
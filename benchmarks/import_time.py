@@ -0,0 +1,78 @@
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+root = Path(__file__).resolve().parent.parent
+
+# Project folder and module, the compute layers are what batch workers import.
+modules = [
+    ("Module 1 Capstone", "src.functions"),
+    ("Module 1 Capstone", "src.compute"),
+    ("Module 2 Sprint 1", "utils.functions"),
+    ("Module 2 Sprint 1", "utils.compute"),
+    ("Module 2 Sprint 1", "utils.model"),
+    ("Module 2 Sprint 2", "utils.functions"),
+    ("Module 2 Sprint 2", "utils.inference"),
+    ("Module 2 Sprint 2", "utils.trends"),
+]
+
+heavy_packages = ["matplotlib", "seaborn", "scipy", "sklearn", "plotly", "geopandas"]
+
+
+def import_profile(project: str, module: str) -> tuple[float, list[str]]:
+    """
+    Import a module in a fresh interpreter and measure it with -X importtime.
+
+    Args:
+        project (str): The project folder used as the import root.
+        module (str): The module to import.
+
+    Returns:
+        tuple[float, list[str]]: Cumulative import time in seconds and the heavy packages it loaded.
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root / project,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    cumulative = 0
+    loaded = set()
+    for line in output.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)", line)
+        if not match:
+            continue
+        microseconds, indent, name = match.groups()
+        if not indent:
+            cumulative += int(microseconds)
+        if name.split(".")[0] in heavy_packages:
+            loaded.add(name.split(".")[0])
+    return cumulative / 1e6, sorted(loaded)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure the import time of the helper modules in fresh interpreters."
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'Module':45} {'median s':>9} {'min s':>7}  heavy imports")
+    for project, module in modules:
+        timings = []
+        for _ in range(args.repeat):
+            seconds, loaded = import_profile(project, module)
+            timings.append(seconds)
+        print(
+            f"{project + ': ' + module:45} {statistics.median(timings):9.3f} "
+            f"{min(timings):7.3f}  {', '.join(loaded) or '-'}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+here = Path(__file__).resolve().parent
+
+
+def time_case(function, repeat: int) -> dict:
+    """
+    Time a function after one warm-up call.
+
+    Args:
+        function: The function to time.
+        repeat (int): The number of timed calls.
+
+    Returns:
+        dict: Minimum, median, mean and standard deviation in seconds.
+    """
+    function()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "stdev": statistics.stdev(timings) if repeat > 1 else 0.0,
+        "repeat": repeat,
+    }
+
+
+def run_worker(suite: str, scale: int, repeat: int, data_dir: Path, output: Path):
+    """
+    Run one suite at one scale in this process and write the timings as JSON.
+
+    Each suite runs in its own process because the survey and podcast projects both
+    name their helper package utils.
+    """
+    from suites import suites
+
+    prepare, _ = suites[suite]
+    cases = prepare(scale, data_dir)
+    results = {
+        f"{suite}.{name}@x{scale}": time_case(function, repeat)
+        for name, function in cases.items()
+    }
+    output.write_text(json.dumps(results))
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=here,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: dict, previous: dict, threshold: float) -> list[str]:
+    """
+    List benchmarks whose median time grew by more than the threshold.
+
+    Args:
+        current (dict): Results of this run.
+        previous (dict): Results of an earlier run.
+        threshold (float): Allowed relative slowdown, 0.2 for 20%.
+
+    Returns:
+        list[str]: One line per regression.
+    """
+    lines = []
+    for name, result in current.items():
+        if name not in previous:
+            continue
+        ratio = result["median"] / previous[name]["median"]
+        if ratio > 1 + threshold:
+            lines.append(
+                f"{name}: {previous[name]['median']:.4f}s -> {result['median']:.4f}s ({ratio:.2f}x)"
+            )
+    return lines
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the election, survey and podcast hot paths on synthetic data."
+    )
+    parser.add_argument("--suite", nargs="+", default=["election", "survey", "podcast"])
+    parser.add_argument("--scales", nargs="+", type=int, default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--max-rows",
+        type=int,
+        default=50_000_000,
+        help="Skip suite and scale combinations whose largest table exceeds this many rows.",
+    )
+    parser.add_argument("--data-dir", type=Path, default=here / ".data")
+    parser.add_argument("--results-dir", type=Path, default=here / "results")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative slowdown of the median reported as a regression.",
+    )
+    parser.add_argument("--worker", nargs=2, metavar=("SUITE", "SCALE"))
+    parser.add_argument("--worker-output", type=Path)
+    args = parser.parse_args()
+
+    if args.worker:
+        suite, scale = args.worker
+        run_worker(suite, int(scale), args.repeat, args.data_dir, args.worker_output)
+        return 0
+
+    from suites import suites
+
+    args.data_dir.mkdir(parents=True, exist_ok=True)
+    args.results_dir.mkdir(parents=True, exist_ok=True)
+    results, skipped = {}, []
+    for suite in args.suite:
+        _, rows = suites[suite]
+        for scale in args.scales:
+            if rows(scale) > args.max_rows:
+                skipped.append(f"{suite}@x{scale}")
+                continue
+            print(f"Running {suite} at {scale}x", flush=True)
+            with tempfile.TemporaryDirectory() as tmp:
+                output = Path(tmp) / "result.json"
+                subprocess.run(
+                    [
+                        sys.executable,
+                        __file__,
+                        "--worker",
+                        suite,
+                        str(scale),
+                        "--repeat",
+                        str(args.repeat),
+                        "--data-dir",
+                        str(args.data_dir),
+                        "--worker-output",
+                        str(output),
+                    ],
+                    check=True,
+                )
+                results.update(json.loads(output.read_text()))
+
+    for name, result in results.items():
+        print(f"{name:60} median {result['median']:.4f}s  min {result['min']:.4f}s")
+    if skipped:
+        print("Skipped (over --max-rows):", ", ".join(skipped))
+
+    previous_runs = sorted(args.results_dir.glob("*.json"))
+    record = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    path = args.results_dir / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    path.write_text(json.dumps(record, indent=2))
+    print(f"Results written to {path}")
+
+    if previous_runs:
+        previous = json.loads(previous_runs[-1].read_text())
+        regressions = compare(results, previous["results"], args.threshold)
+        print(f"Compared with {previous_runs[-1].name}:")
+        print("\n".join(regressions) if regressions else "No regressions.")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+import contextlib
+import io
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+import synthetic
+
+root = Path(__file__).resolve().parent.parent
+sys.path.append(str(root))
+
+from projects import import_project
+
+reviews_month_query = """
+SELECT c.category, substr(r.created_at, 1, 7) AS year_month, COUNT(*) AS num_reviews
+FROM reviews AS r
+INNER JOIN categories AS c ON r.podcast_id = c.podcast_id
+GROUP BY c.category, year_month
+"""
+
+ratings_categories_query = """
+SELECT c.category, r.rating, COUNT(*) AS count
+FROM reviews AS r
+INNER JOIN categories AS c ON r.podcast_id = c.podcast_id
+GROUP BY c.category, r.rating
+"""
+
+
+def election_cases(scale: int, data_dir: Path) -> dict[str, Callable]:
+    """
+    Prepare the election benchmarks on synthetic county_facts and primary_results.
+
+    Args:
+        scale (int): Multiple of the real data size.
+        data_dir (Path): Folder for generated data files.
+
+    Returns:
+        dict[str, Callable]: Benchmark name and the function to time.
+    """
+    functions = import_project("Module 1 Capstone", "src.functions")
+    features = [
+        name
+        for name in functions.new_column_names.values()
+        if name not in functions.features_to_calculate
+    ]
+    features += [name for name in functions.new_feature_names if name not in features]
+    demographics = synthetic.county_facts(features, scale)
+    primary = synthetic.primary_results(demographics)
+    merged = functions.merge_demographics_with_votes_frame(
+        demographics, primary, synthetic.states
+    )
+    return {
+        "merge_demographics_with_votes": lambda: functions.merge_demographics_with_votes(
+            demographics, primary, synthetic.states
+        ),
+        "calculate_correlations": lambda: functions.calculate_correlations(merged),
+        "no_iqr_calculate_correlations": lambda: functions.no_iqr_calculate_correlations(
+            merged
+        ),
+        "feature_research": lambda: functions.feature_research(merged, "White %"),
+    }
+
+
+def survey_cases(scale: int, data_dir: Path) -> dict[str, Callable]:
+    """
+    Prepare the mental health survey benchmarks on a synthetic answer table.
+
+    Args:
+        scale (int): Multiple of the real data size.
+        data_dir (Path): Folder for generated data files.
+
+    Returns:
+        dict[str, Callable]: Benchmark name and the function to time.
+    """
+    functions = import_project("Module 2 Sprint 1", "utils.functions")
+    query_text = import_project("Module 2 Sprint 1", "utils.query_text")
+    path = data_dir / f"mental_health_x{scale}.sqlite"
+    if not path.exists():
+        synthetic.mental_health_db(path.with_suffix(".tmp"), scale).rename(path)
+    con = sqlite3.connect(path)
+
+    def no_plot_relationship():
+        with contextlib.redirect_stdout(io.StringIO()):
+            functions.no_plot_relationship(con, 6)
+
+    return {
+        "query_1": lambda: pd.read_sql_query(query_text.query_1, con),
+        "no_plot_relationship": no_plot_relationship,
+        "possible_answers": lambda: functions.possible_answers(con, 6),
+    }
+
+
+def podcast_cases(scale: int, data_dir: Path) -> dict[str, Callable]:
+    """
+    Prepare the podcast benchmarks on synthetic reviews and categories tables.
+
+    Args:
+        scale (int): Multiple of the real data size.
+        data_dir (Path): Folder for generated data files.
+
+    Returns:
+        dict[str, Callable]: Benchmark name and the function to time.
+    """
+    path = data_dir / f"podcasts_x{scale}.sqlite"
+    if not path.exists():
+        synthetic.podcast_db(path.with_suffix(".tmp"), scale).rename(path)
+    con = sqlite3.connect(path)
+    columnar = import_project("Module 2 Sprint 2", "utils.columnar")
+    store_path = data_dir / f"podcasts_x{scale}_store"
+    if not (store_path / "metadata.json").exists():
+        columnar.export_columnar(con, store_path)
+    store = columnar.ReviewStore(store_path)
+
+    def ratings_categories():
+        counts = pd.read_sql_query(ratings_categories_query, con)
+        table = counts.pivot(index="category", columns="rating", values="count")
+        return table.div(table.sum(axis=1), axis=0).reset_index()
+
+    return {
+        "reviews_month_data": lambda: pd.read_sql_query(reviews_month_query, con),
+        "ratings_categories_data": ratings_categories,
+        "reviews_month_store": store.monthly_reviews,
+        "ratings_categories_store": store.ratings_by_category,
+    }
+
+
+suites = {
+    "election": (election_cases, lambda scale: synthetic.county_rows * 8 * scale),
+    "survey": (
+        survey_cases,
+        lambda scale: synthetic.survey_users * synthetic.survey_questions * scale,
+    ),
+    "podcast": (podcast_cases, lambda scale: synthetic.review_rows * scale),
+}
@@ -0,0 +1,175 @@
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+# Sizes of the real datasets, scale 1 generates data of this size.
+county_rows = 3195
+survey_users = 4218
+survey_questions = 105
+podcast_count = 100000
+review_rows = 2000000
+
+states = [f"State {i:02d}" for i in range(50)]
+survey_years = [2014, 2016, 2017, 2018, 2019]
+survey_answers = ["Yes", "No", "Maybe", "Possibly", "Don't Know", "-1"]
+disorder_answers = ["Yes", "No", "Possibly", "Don't Know"]
+categories = [f"category-{i}" for i in range(110)]
+
+
+def county_facts(feature_names: list[str], scale: int = 1, seed: int = 0) -> DataFrame:
+    """
+    Generate a cleaned county_facts table in the layout used by merge_demographics_with_votes.
+
+    Args:
+        feature_names (list[str]): Names of the numeric demographic features; "Population 2014" is always added.
+        scale (int): Multiple of the real number of counties.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        DataFrame: fips, County, state_abbreviation, the features and State.
+    """
+    rng = np.random.default_rng(seed)
+    n = county_rows * scale
+    state = rng.integers(0, len(states), n)
+    data = {
+        "fips": np.arange(n) + 1000,
+        "County": [f"County {i}" for i in range(n)],
+        "state_abbreviation": [f"S{s:02d}" for s in state],
+        "Population 2014": rng.integers(1000, 1000000, n),
+    }
+    for name in feature_names:
+        if name != "Population 2014":
+            data[name] = rng.gamma(2.0, 10.0, n)
+    data["State"] = np.array(states)[state]
+    return pd.DataFrame(data)
+
+
+def primary_results(demographics: DataFrame, seed: int = 0) -> DataFrame:
+    """
+    Generate primary results with three Democratic and five Republican candidates per county.
+
+    Args:
+        demographics (DataFrame): County table returned by county_facts.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        DataFrame: state, state_abbreviation, county, fips, party, candidate, votes and fraction_votes.
+    """
+    rng = np.random.default_rng(seed)
+    candidates = [("Democrat", f"Democrat {i}") for i in range(3)] + [
+        ("Republican", f"Republican {i}") for i in range(5)
+    ]
+    n = len(demographics)
+    repeated = demographics.loc[
+        np.repeat(demographics.index, len(candidates)),
+        ["State", "state_abbreviation", "County", "fips"],
+    ].reset_index(drop=True)
+    repeated.columns = ["state", "state_abbreviation", "county", "fips"]
+    repeated["party"] = [party for party, _ in candidates] * n
+    repeated["candidate"] = [candidate for _, candidate in candidates] * n
+    repeated["votes"] = rng.integers(0, 20000, len(repeated))
+    party_total = repeated.groupby(["fips", "party"])["votes"].transform("sum")
+    repeated["fraction_votes"] = repeated["votes"] / party_total.clip(lower=1)
+    repeated["fips"] = repeated["fips"].astype(float)
+    return repeated
+
+
+def mental_health_db(path: Path, scale: int = 1, seed: int = 0) -> Path:
+    """
+    Write a mental health survey database with answer and question tables.
+
+    Args:
+        path (Path): The SQLite file to create.
+        scale (int): Multiple of the real number of respondents.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        Path: The path of the database.
+    """
+    rng = np.random.default_rng(seed)
+    con = sqlite3.connect(path)
+    con.execute(
+        "CREATE TABLE answer (AnswerText TEXT, SurveyID INTEGER, UserID INTEGER, QuestionID INTEGER)"
+    )
+    con.execute("CREATE TABLE question (questiontext TEXT, questionid INTEGER)")
+    con.executemany(
+        "INSERT INTO question VALUES (?, ?)",
+        [(f"Question {q}?", q) for q in range(1, survey_questions + 1)],
+    )
+    users_per_batch = 2000
+    for start in range(0, survey_users * scale, users_per_batch):
+        users = np.arange(start, min(start + users_per_batch, survey_users * scale))
+        survey = rng.choice(survey_years, len(users))
+        user = np.repeat(users, survey_questions)
+        question = np.tile(np.arange(1, survey_questions + 1), len(users))
+        answer = rng.choice(survey_answers, len(user)).astype(object)
+        disorder = question == 33
+        answer[disorder] = rng.choice(disorder_answers, disorder.sum())
+        con.executemany(
+            "INSERT INTO answer VALUES (?, ?, ?, ?)",
+            zip(
+                answer.tolist(),
+                np.repeat(survey, survey_questions).tolist(),
+                user.tolist(),
+                question.tolist(),
+            ),
+        )
+    con.commit()
+    con.close()
+    return path
+
+
+def podcast_db(path: Path, scale: int = 1, seed: int = 0) -> Path:
+    """
+    Write a podcast reviews database with reviews and categories tables.
+
+    Args:
+        path (Path): The SQLite file to create.
+        scale (int): Multiple of the real number of reviews and podcasts.
+        seed (int): Seed for the random number generator.
+
+    Returns:
+        Path: The path of the database.
+    """
+    rng = np.random.default_rng(seed)
+    con = sqlite3.connect(path)
+    con.execute(
+        "CREATE TABLE reviews (podcast_id TEXT, title TEXT, content TEXT, rating INTEGER, author_id TEXT, created_at TEXT)"
+    )
+    con.execute("CREATE TABLE categories (podcast_id TEXT, category TEXT)")
+    podcasts = podcast_count * scale
+    podcast_category = rng.integers(0, len(categories), podcasts)
+    con.executemany(
+        "INSERT INTO categories VALUES (?, ?)",
+        zip(
+            [f"p{i:08x}" for i in range(podcasts)],
+            np.array(categories)[podcast_category].tolist(),
+        ),
+    )
+    start_day = np.datetime64("2006-01-01")
+    days = (np.datetime64("2023-02-01") - start_day).astype(int)
+    batch = 500000
+    for start in range(0, review_rows * scale, batch):
+        size = min(batch, review_rows * scale - start)
+        podcast = rng.zipf(1.5, size) % podcasts
+        created = start_day + rng.integers(0, days, size).astype("timedelta64[D]")
+        created_at = np.char.add(created.astype(str), "T12:00:00-07:00")
+        con.executemany(
+            "INSERT INTO reviews VALUES (?, ?, ?, ?, ?, ?)",
+            zip(
+                [f"p{i:08x}" for i in podcast],
+                ["Great show"] * size,
+                ["I listen to every episode."] * size,
+                rng.choice(
+                    [1, 2, 3, 4, 5], size, p=[0.1, 0.03, 0.04, 0.08, 0.75]
+                ).tolist(),
+                [f"a{i:x}" for i in rng.integers(0, 1500000 * scale, size)],
+                created_at.tolist(),
+            ),
+        )
+    con.commit()
+    con.close()
+    return path
@@ -0,0 +1,328 @@
+import argparse
+import json
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+from pandas import DataFrame
+
+here = Path(__file__).resolve().parent
+root = here.parent
+sys.path.append(str(root))
+
+from projects import import_project
+
+
+def view(
+    title: str,
+    figure=None,
+    figures: dict | None = None,
+    table: DataFrame | None = None,
+    filter_by: str | None = None,
+) -> dict:
+    """
+    Describe one dashboard view: a figure, a set of figures to choose from and/or a table.
+
+    Args:
+        title (str): The title shown in the dashboard.
+        figure: A Plotly figure.
+        figures (dict | None): Plotly figures by label, shown one at a time.
+        table (DataFrame | None): A table, also written as Arrow when pyarrow is installed.
+        filter_by (str | None): Column of the table the dashboard offers to filter on.
+
+    Returns:
+        dict: The view.
+    """
+    payload = {"title": title}
+    if figure is not None:
+        payload["figure"] = json.loads(figure.to_json())
+    if figures is not None:
+        payload["figures"] = {
+            label: json.loads(item.to_json()) for label, item in figures.items()
+        }
+    if table is not None:
+        table = table.rename(columns=str).reset_index(drop=True)
+        payload["table"] = json.loads(table.to_json(orient="split", index=False))
+        payload["filter_by"] = filter_by
+    return {"payload": payload, "table": table}
+
+
+def podcast_views(database: Path, drop_duplicates: bool = False) -> dict[str, dict]:
+    """
+    Build the podcast views from the columnar store, exporting it first when it is missing or stale.
+
+    Args:
+        database (Path): The podcast reviews SQLite database.
+        drop_duplicates (bool): Leave out reviews flagged as near duplicates.
+
+    Returns:
+        dict[str, dict]: Views by name.
+    """
+    columnar = import_project("Module 2 Sprint 2", "utils.columnar")
+    plotting = import_project("Module 2 Sprint 2", "utils.plotting")
+    con = sqlite3.connect(database)
+    store_path = Path(database).with_name(columnar.store_directory)
+    if not (store_path / "metadata.json").exists() or columnar.ReviewStore(
+        store_path
+    ).is_stale(con):
+        columnar.export_columnar(con, store_path)
+    store = columnar.ReviewStore(store_path, drop_duplicates=drop_duplicates)
+
+    ratings = (
+        store.ratings()["rating"]
+        .value_counts()
+        .sort_index()
+        .rename_axis("rating")
+        .reset_index(name="count")
+    )
+    by_category = store.ratings_by_category()
+    monthly = store.monthly_reviews()
+    podcasts_reviews = store.podcasts_reviews()
+    views = {
+        "ratings": view(
+            "Distribution of ratings",
+            plotting.hist_figure(ratings, counts="count"),
+            table=ratings,
+        ),
+        "weekly_reviews": view(
+            "Weekly reviews", plotting.line_figure(store.weekly_reviews())
+        ),
+        "podcasts_per_category": view(
+            "Podcasts per category",
+            plotting.counts_figure(
+                store.podcasts_per_category(), "Number Of Podcasts In Each Category"
+            ),
+        ),
+        "largest_category": view(
+            "Podcasts per largest category",
+            plotting.counts_series_figure(store.largest_category_counts()),
+        ),
+        "reviews_per_category": view(
+            "Reviews per category", plotting.box_figure(store.review_categories())
+        ),
+        "ratings_by_category": view(
+            "Ratings by category",
+            plotting.ratings_categories_figure(by_category),
+            table=by_category,
+        ),
+        "reviews_month": view(
+            "Monthly reviews by category",
+            plotting.reviews_month_figure(monthly, top_n=10),
+            table=monthly,
+            filter_by="category",
+        ),
+        "podcasts_reviews": view(
+            "Podcasts and reviews per category",
+            plotting.podcasts_reviews_figure(podcasts_reviews),
+            table=podcasts_reviews,
+        ),
+    }
+    if "true-crime" in store.categories:
+        views["true_crime_month"] = view(
+            "True-Crime ratings by month",
+            plotting.true_crime_month_figure(
+                store.category_month_ratings("true-crime")
+            ),
+        )
+    return views
+
+
+def survey_views(database: Path) -> dict[str, dict]:
+    """
+    Build the survey views: the crosstab of every question against question 33 and the association tests.
+
+    All crosstabs come from the one grouped scan of stratified_relationships, summed
+    over survey years, and are drawn with the figure of analyze_relationship.
+
+    Args:
+        database (Path): The mental health survey SQLite database.
+
+    Returns:
+        dict[str, dict]: Views by name.
+    """
+    stratified = import_project("Module 2 Sprint 1", "utils.stratified")
+    plotting = import_project("Module 2 Sprint 1", "utils.plotting")
+    con = sqlite3.connect(database)
+    counts = pd.read_sql_query(stratified.stratified_query(), con)
+    texts = pd.read_sql_query("SELECT questionid, questiontext FROM question", con)
+    texts = texts.set_index("questionid")["questiontext"]
+
+    figures = {}
+    for question, cross_tab in stratified.pooled_crosstabs(counts).items():
+        cross_tab = cross_tab.div(cross_tab.sum(axis=1), axis=0)
+        text = texts.get(question, f"Question {question}")
+        figures[f"{question}: {text}"] = plotting.relationship_figure(cross_tab, text)
+
+    by_year, pooled = stratified.stratified_relationships(con)
+    return {
+        "relationships": view("Answers by disorder status", figures=figures),
+        "associations": view(
+            "Association with disorder status", table=pooled.reset_index()
+        ),
+        "associations_by_year": view(
+            "Association with disorder status by survey year",
+            table=by_year.reset_index(),
+            filter_by="QuestionID",
+        ),
+    }
+
+
+def election_views(county_facts: Path, primary_results: Path) -> dict[str, dict]:
+    """
+    Build the election views: state outcomes and per-state correlations of features with vote shares.
+
+    Args:
+        county_facts (Path): The raw county_facts.csv file.
+        primary_results (Path): The raw primary_results.csv file.
+
+    Returns:
+        dict[str, dict]: Views by name.
+    """
+    compute = import_project("Module 1 Capstone", "src.compute")
+    demographics = compute.clean_demographics(pd.read_csv(county_facts))
+    primary = compute.clean_primary_results(pd.read_csv(primary_results))
+    outcomes = compute.election_outcomes(primary, "state")
+
+    both_parties = primary.groupby("state")["party"].nunique() == 2
+    merged = compute.merge_by_state(
+        demographics, primary, list(both_parties[both_parties].index)
+    )
+    return {
+        "state_outcomes": view("Primary outcome by state", table=outcomes),
+        "state_correlations": view(
+            "Feature correlations with vote share by state",
+            table=compute.correlations_by_state(
+                merged, remove_outliers=False
+            ).reset_index(),
+            filter_by="State",
+        ),
+        "state_correlations_iqr": view(
+            "Feature correlations with vote share by state, IQR outliers removed",
+            table=compute.correlations_by_state(merged).reset_index(),
+            filter_by="State",
+        ),
+    }
+
+
+def write_views(views: dict[str, dict], folder: Path) -> None:
+    """
+    Write every view as compact JSON and its table as an Arrow IPC file when pyarrow is installed.
+
+    Args:
+        views (dict[str, dict]): Views by name.
+        folder (Path): The project folder of the artifacts.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        pa = None
+    folder.mkdir(parents=True, exist_ok=True)
+    for name, item in views.items():
+        (folder / f"{name}.json").write_text(
+            json.dumps(item["payload"], separators=(",", ":"))
+        )
+        if pa is not None and item["table"] is not None:
+            table = pa.Table.from_pandas(item["table"], preserve_index=False)
+            with pa.OSFile(str(folder / f"{name}.arrow"), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+
+def write_index(artifacts: Path) -> Path:
+    """
+    List the built views in index.json.
+
+    Args:
+        artifacts (Path): The artifacts folder.
+
+    Returns:
+        Path: The index file.
+    """
+    views = []
+    for path in sorted(artifacts.glob("*/*.json")):
+        payload = json.loads(path.read_text())
+        views.append(
+            {
+                "project": path.parent.name,
+                "name": path.stem,
+                "title": payload["title"],
+                "arrow": path.with_suffix(".arrow").exists(),
+            }
+        )
+    index = artifacts / "index.json"
+    index.write_text(
+        json.dumps(
+            {"built": datetime.now().isoformat(timespec="seconds"), "views": views}
+        )
+    )
+    return index
+
+
+def run_worker(project: str, args: argparse.Namespace) -> None:
+    """
+    Build the views of one project in this process.
+
+    Each project is built in its own process because the survey and podcast projects
+    both name their helper package utils.
+    """
+    if project == "podcast":
+        views = podcast_views(args.podcast_db, args.drop_duplicates)
+    elif project == "survey":
+        views = survey_views(args.survey_db)
+    else:
+        views = election_views(args.county_facts, args.primary_results)
+    write_views(views, args.artifacts / project)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Precompute the dashboard views of the election, survey and podcast projects."
+    )
+    parser.add_argument("--podcast-db", type=Path)
+    parser.add_argument(
+        "--drop-duplicates",
+        action="store_true",
+        help="Leave out reviews flagged by detect_near_duplicates.",
+    )
+    parser.add_argument("--survey-db", type=Path)
+    parser.add_argument("--county-facts", type=Path)
+    parser.add_argument("--primary-results", type=Path)
+    parser.add_argument("--artifacts", type=Path, default=here / "artifacts")
+    parser.add_argument("--worker", choices=["podcast", "survey", "election"])
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args)
+        return 0
+
+    projects = []
+    if args.podcast_db:
+        projects.append("podcast")
+    if args.survey_db:
+        projects.append("survey")
+    if args.county_facts and args.primary_results:
+        projects.append("election")
+    if not projects:
+        parser.error(
+            "pass --podcast-db, --survey-db or --county-facts with --primary-results"
+        )
+    workers = {
+        project: subprocess.Popen(
+            [sys.executable, __file__, *sys.argv[1:], "--worker", project]
+        )
+        for project in projects
+    }
+    failed = [project for project, worker in workers.items() if worker.wait() != 0]
+    index = write_index(args.artifacts)
+    print(f"Views written to {index.parent}")
+    if failed:
+        print("Failed:", ", ".join(failed))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+import argparse
+import gzip
+import hashlib
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+here = Path(__file__).resolve().parent
+
+content_types = {
+    ".json": "application/json",
+    ".arrow": "application/vnd.apache.arrow.file",
+    ".html": "text/html; charset=utf-8",
+    ".js": "application/javascript",
+}
+
+
+class Resource(NamedTuple):
+    body: bytes
+    gzipped: bytes | None
+    etag: str
+    content_type: str
+    cache_control: str
+
+
+def make_resource(body: bytes, content_type: str, cache_control: str) -> Resource:
+    """
+    Prepare a response body once: its gzip encoding and a strong ETag from its hash.
+
+    Args:
+        body (bytes): The response body.
+        content_type (str): The Content-Type header.
+        cache_control (str): The Cache-Control header.
+
+    Returns:
+        Resource: The body, gzipped body (None when gzip does not make it smaller), ETag and headers.
+    """
+    gzipped = gzip.compress(body, compresslevel=6, mtime=0)
+    return Resource(
+        body=body,
+        gzipped=gzipped if len(gzipped) < len(body) else None,
+        etag=f'"{hashlib.sha256(body).hexdigest()[:20]}"',
+        content_type=content_type,
+        cache_control=cache_control,
+    )
+
+
+def load_resources(artifacts: Path, max_age: int = 300) -> dict[str, Resource]:
+    """
+    Read the page, plotly.js and every built view into memory.
+
+    The index and page are revalidated on every load (no-cache) so a rebuild shows up
+    at once; views may be reused for max_age seconds and are revalidated with their
+    ETag afterwards; plotly.js is cached for a day.
+
+    Args:
+        artifacts (Path): The folder written by build.py.
+        max_age (int): Seconds browsers may reuse a view without asking.
+
+    Returns:
+        dict[str, Resource]: Resources by URL path.
+    """
+    from plotly.offline import get_plotlyjs
+
+    resources = {
+        "/": make_resource(
+            (here / "index.html").read_bytes(), content_types[".html"], "no-cache"
+        ),
+        "/plotly.min.js": make_resource(
+            get_plotlyjs().encode(), content_types[".js"], "public, max-age=86400"
+        ),
+        "/api/index.json": make_resource(
+            (artifacts / "index.json").read_bytes(), content_types[".json"], "no-cache"
+        ),
+    }
+    for path in sorted(artifacts.glob("*/*")):
+        if path.suffix not in (".json", ".arrow"):
+            continue
+        resources[f"/api/{path.parent.name}/{path.name}"] = make_resource(
+            path.read_bytes(), content_types[path.suffix], f"public, max-age={max_age}"
+        )
+    return resources
+
+
+def matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag with the weak comparison of RFC 9110.
+
+    Args:
+        if_none_match (str | None): The header value.
+        etag (str): The current ETag.
+
+    Returns:
+        bool: True if the client's copy is current.
+    """
+    if if_none_match is None:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """
+    Check whether an Accept-Encoding header allows gzip, honouring q-values.
+
+    gzip is used when it is listed with a q-value above 0, or when it is not listed and
+    the wildcard * is, so "gzip;q=0" and "*;q=0" both turn it off.
+
+    Args:
+        accept_encoding (str | None): The header value.
+
+    Returns:
+        bool: True if the response may be gzipped.
+    """
+    qualities = {}
+    for item in (accept_encoding or "").split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    server_version = "Dashboard/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def respond(self, send_body: bool):
+        resource = self.server.resources.get(urlsplit(self.path).path)
+        if resource is None:
+            self.send_error(404)
+            return
+        encode = resource.gzipped is not None and accepts_gzip(
+            self.headers.get("Accept-Encoding")
+        )
+        etag = f'{resource.etag[:-1]}-gzip"' if encode else resource.etag
+        if matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(304)
+            self.send_cache_headers(resource, etag)
+            self.end_headers()
+            return
+        body = resource.gzipped if encode else resource.body
+        self.send_response(200)
+        self.send_cache_headers(resource, etag)
+        self.send_header("Content-Type", resource.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if encode:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def send_cache_headers(self, resource: Resource, etag: str):
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", resource.cache_control)
+        self.send_header("Vary", "Accept-Encoding")
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class DashboardServer(ThreadingHTTPServer):
+    """
+    Serve the prebuilt views to any number of concurrent viewers.
+
+    Every response body, its gzip encoding and ETag are prepared when the server
+    starts; requests only look them up in a dict that is never written to, so each
+    request thread answers without locking or recomputing anything.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        resources: dict[str, Resource],
+        quiet: bool = False,
+    ):
+        super().__init__(address, DashboardHandler)
+        self.resources = resources
+        self.quiet = quiet
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Serve the dashboard views built by build.py."
+    )
+    parser.add_argument("--artifacts", type=Path, default=here / "artifacts")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8050)
+    parser.add_argument(
+        "--max-age",
+        type=int,
+        default=300,
+        help="Seconds browsers may reuse a view before revalidating it.",
+    )
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args()
+
+    if not (args.artifacts / "index.json").exists():
+        parser.error(f"{args.artifacts} has no index.json, run build.py first")
+    resources = load_resources(args.artifacts, args.max_age)
+    server = DashboardServer((args.host, args.port), resources, args.quiet)
+    print(f"Serving {len(resources) - 3} files on http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+import pytest
+
+from server import accepts_gzip, matches
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, False),
+        ("", False),
+        ("gzip", True),
+        ("deflate, gzip;q=0.5", True),
+        ("GZIP; Q=1", True),
+        ("gzip;q=0", False),
+        ("gzip;q=0.0, deflate", False),
+        ("gzip;q=bad", False),
+        ("*", True),
+        ("*;q=0", False),
+        ("br, *;q=0.1", True),
+        ("gzip;q=0, *", False),
+        ("identity", False),
+    ],
+)
+def test_accepts_gzip(header, expected):
+    assert accepts_gzip(header) is expected
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"xyz", "abc"', True),
+        ('"xyz"', False),
+        ("*", True),
+        ('"ab"', False),
+    ],
+)
+def test_matches(header, expected):
+    assert matches(header, '"abc"') is expected
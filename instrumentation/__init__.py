@@ -0,0 +1,4 @@
+# Instrumentation shared by the three projects: stage timing and Chrome traces in
+# instrumentation.stages, and the profiled SQLite connection in
+# instrumentation.profiling. Each project re-exports them from its own modules, which
+# load them by file path without changing sys.path.
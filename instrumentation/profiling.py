@@ -0,0 +1,272 @@
+import logging
+import re
+import sqlite3
+import time
+import pandas as pd
+from pandas import DataFrame
+
+__all__ = ["ProfiledCursor", "ProfiledConnection", "connect", "normalize", "full_scans"]
+
+logger = logging.getLogger(__name__)
+
+sql_keywords = {
+    "WHERE",
+    "INNER",
+    "LEFT",
+    "CROSS",
+    "NATURAL",
+    "JOIN",
+    "ON",
+    "USING",
+    "GROUP",
+    "ORDER",
+    "LIMIT",
+    "HAVING",
+    "UNION",
+    "WINDOW",
+}
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """
+    Cursor that times every statement, including the time spent fetching its rows.
+
+    SQLite produces rows lazily, so a statement is only recorded once its rows are
+    exhausted, the cursor runs another statement or the cursor is closed.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        super().__init__(connection)
+        self._entry = None
+
+    def execute(self, sql: str, parameters=()) -> "ProfiledCursor":
+        self._finish()
+        entry = {"statement": sql, "parameters": parameters, "rows": 0}
+        start = time.perf_counter()
+        super().execute(sql, parameters)
+        entry["duration"] = time.perf_counter() - start
+        self._entry = entry
+        if self.description is None:
+            entry["rows"] = max(self.rowcount, 0)
+            self._finish()
+        return self
+
+    def executemany(self, sql: str, parameters) -> "ProfiledCursor":
+        self._finish()
+        start = time.perf_counter()
+        super().executemany(sql, parameters)
+        self._entry = {
+            "statement": sql,
+            "parameters": (),
+            "rows": max(self.rowcount, 0),
+            "duration": time.perf_counter() - start,
+        }
+        self._finish()
+        return self
+
+    def _fetch(self, fetch, *args) -> list:
+        start = time.perf_counter()
+        rows = fetch(*args)
+        if self._entry is not None:
+            self._entry["duration"] += time.perf_counter() - start
+            self._entry["rows"] += len(rows)
+        return rows
+
+    def fetchall(self) -> list:
+        rows = self._fetch(super().fetchall)
+        self._finish()
+        return rows
+
+    def fetchmany(self, size: int | None = None) -> list:
+        size = self.arraysize if size is None else size
+        rows = self._fetch(super().fetchmany, size)
+        if len(rows) < size:
+            self._finish()
+        return rows
+
+    def fetchone(self):
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def close(self) -> None:
+        self._finish()
+        super().close()
+
+    def _finish(self) -> None:
+        if self._entry is not None:
+            self.connection._record(self._entry)
+            self._entry = None
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """
+    SQLite connection that logs every statement with its duration and rows returned.
+
+    Statements slower than the threshold are explained with EXPLAIN QUERY PLAN and full
+    scans of the watched tables are flagged, as these are the queries that need an
+    index or a materialized table. Create it with connect.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threshold = 0.1
+        self.watched_tables = ()
+        self.statements = []
+
+    def cursor(self, factory=ProfiledCursor) -> sqlite3.Cursor:
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters=()) -> ProfiledCursor:
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, parameters) -> ProfiledCursor:
+        return self.cursor().executemany(sql, parameters)
+
+    def _record(self, entry: dict) -> None:
+        entry["plan"] = None
+        entry["full_scans"] = []
+        is_query = entry["statement"].lstrip().upper().startswith(("SELECT", "WITH"))
+        if entry["duration"] >= self.threshold and is_query:
+            plan = (
+                super()
+                .cursor()
+                .execute(
+                    "EXPLAIN QUERY PLAN " + entry["statement"], entry["parameters"]
+                )
+                .fetchall()
+            )
+            entry["plan"] = "\n".join(row[3] for row in plan)
+            entry["full_scans"] = full_scans(
+                entry["statement"], entry["plan"], self.watched_tables
+            )
+            logger.warning(
+                "Slow statement (%.3fs, %d rows, full scans: %s): %s",
+                entry["duration"],
+                entry["rows"],
+                ", ".join(entry["full_scans"]) or "none",
+                normalize(entry["statement"]),
+            )
+        else:
+            logger.debug(
+                "Statement (%.3fs, %d rows): %s",
+                entry["duration"],
+                entry["rows"],
+                normalize(entry["statement"]),
+            )
+        self.statements.append(entry)
+
+    def statement_log(self) -> DataFrame:
+        """
+        Return every recorded statement in the order it finished.
+
+        Returns:
+            DataFrame: Statement, duration in seconds, rows, query plan and full scans.
+        """
+        return pd.DataFrame(
+            {
+                "Statement": [normalize(e["statement"]) for e in self.statements],
+                "Duration s": [e["duration"] for e in self.statements],
+                "Rows": [e["rows"] for e in self.statements],
+                "Plan": [e["plan"] for e in self.statements],
+                "Full Scans": [", ".join(e["full_scans"]) for e in self.statements],
+            }
+        )
+
+    def report(self) -> DataFrame:
+        """
+        Aggregate the session by statement text, slowest total time first.
+
+        Returns:
+            DataFrame: Calls, total, mean and max duration, rows, slow calls, full scans and the last plan per statement.
+        """
+        log = self.statement_log()
+        if log.empty:
+            return log
+        log["Slow"] = log["Duration s"] >= self.threshold
+        report = log.groupby("Statement").agg(
+            **{
+                "Calls": ("Duration s", "size"),
+                "Total s": ("Duration s", "sum"),
+                "Mean s": ("Duration s", "mean"),
+                "Max s": ("Duration s", "max"),
+                "Rows": ("Rows", "sum"),
+                "Slow Calls": ("Slow", "sum"),
+                "Full Scans": ("Full Scans", "max"),
+                "Plan": ("Plan", "last"),
+            }
+        )
+        return report.sort_values(by="Total s", ascending=False)
+
+
+def connect(
+    database: str,
+    threshold: float = 0.1,
+    watched_tables: tuple[str, ...] = (),
+) -> ProfiledConnection:
+    """
+    Open a SQLite database with statement profiling.
+
+    The connection can be passed to every function that takes a sqlite3.Connection.
+    Each project's profiling module wraps this with its own watched tables.
+
+    Args:
+        database (str): The path of the database.
+        threshold (float): Statements taking at least this many seconds are explained, 0 explains all of them.
+        watched_tables (tuple[str, ...]): Tables whose full scans are flagged.
+
+    Returns:
+        ProfiledConnection: The connection.
+    """
+    con = sqlite3.connect(database, factory=ProfiledConnection)
+    con.threshold = threshold
+    con.watched_tables = watched_tables
+    return con
+
+
+def normalize(statement: str) -> str:
+    """
+    Collapse whitespace so that the same statement is grouped in the report.
+
+    Args:
+        statement (str): The SQL statement.
+
+    Returns:
+        str: The statement on one line.
+    """
+    return " ".join(statement.split())
+
+
+def full_scans(statement: str, plan: str, tables: tuple[str, ...]) -> list[str]:
+    """
+    Find full table scans of the given tables in a query plan.
+
+    The plan refers to tables by alias, so aliases are resolved from the FROM and
+    JOIN clauses of the statement. Scans through an index are not reported.
+
+    Args:
+        statement (str): The SQL statement.
+        plan (str): The EXPLAIN QUERY PLAN details, one per line.
+        tables (tuple[str, ...]): The tables to report.
+
+    Returns:
+        list[str]: Scanned tables, with the alias when one was used.
+    """
+    aliases = {}
+    for table, alias in re.findall(
+        r"(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", statement, flags=re.IGNORECASE
+    ):
+        aliases[table] = table
+        if alias and alias.upper() not in sql_keywords:
+            aliases[alias] = table
+    scans = []
+    for name, rest in re.findall(r"^SCAN (\w+)(.*)$", plan, flags=re.MULTILINE):
+        table = aliases.get(name, name)
+        if table in tables and "INDEX" not in rest:
+            scans.append(table if table == name else f"{table} AS {name}")
+    return scans
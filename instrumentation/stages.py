@@ -0,0 +1,256 @@
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+
+import pandas as pd
+from pandas import DataFrame
+
+__all__ = [
+    "enable",
+    "disable",
+    "reset",
+    "span",
+    "traced",
+    "read_sql_query",
+    "summary",
+    "write_chrome_trace",
+]
+
+_state = {"enabled": os.environ.get("ANALYSIS_TRACE") == "1", "memory": False}
+_events = []
+_local = threading.local()
+
+
+def enable(track_memory: bool = False) -> None:
+    """
+    Turn instrumentation on.
+
+    Takes effect for functions decorated with traced whenever they were imported;
+    ANALYSIS_TRACE=1 turns it on from the start. While it is off, a decorated call
+    costs one dictionary lookup.
+
+    Args:
+        track_memory (bool): Also record bytes allocated per stage with tracemalloc, which slows the code down.
+
+    Returns:
+        None
+    """
+    _state["enabled"] = True
+    _state["memory"] = track_memory
+    if track_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def disable() -> None:
+    """
+    Turn instrumentation off; spans and decorated functions stop recording.
+
+    Returns:
+        None
+    """
+    _state["enabled"] = False
+    if _state["memory"] and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _state["memory"] = False
+
+
+def reset() -> None:
+    """
+    Forget all recorded stages.
+
+    Returns:
+        None
+    """
+    _events.clear()
+
+
+class _Span:
+    def __init__(self, name: str, phase: str):
+        self.name = name
+        self.phase = phase
+        self.rows = None
+        self.children = 0.0
+
+    def __enter__(self):
+        stack = _local.__dict__.setdefault("stack", [])
+        if _state["memory"]:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+            self.start_memory = self.peak = current
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter() - self.start
+        stack = _local.stack
+        stack.pop()
+        if stack:
+            stack[-1].children += duration
+        event = {
+            "name": self.name,
+            "phase": self.phase,
+            "start": self.start,
+            "duration": duration,
+            "self": duration - self.children,
+            "rows": self.rows,
+            "bytes": None,
+            "thread": threading.get_ident(),
+            "depth": len(stack),
+        }
+        if _state["memory"]:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            event["bytes"] = self.peak - self.start_memory
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, self.peak)
+        _events.append(event)
+        return False
+
+
+class _NullSpan:
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_null_span = _NullSpan()
+
+
+def span(name: str, phase: str):
+    """
+    Time a block of code as one stage.
+
+    Use as `with span("read_sql_query", "query") as stage:` and set stage.rows to
+    record the number of rows processed.
+
+    Args:
+        name (str): The name of the stage.
+        phase (str): "query", "compute" or "render".
+
+    Returns:
+        A context manager, a shared no-op object when instrumentation is off.
+    """
+    if not _state["enabled"]:
+        return _null_span
+    return _Span(name, phase)
+
+
+def traced(phase: str):
+    """
+    Decorate a function so that each call is recorded as one stage.
+
+    The number of rows of the first argument with a shape is recorded as rows processed.
+
+    Args:
+        phase (str): "query", "compute" or "render".
+
+    Returns:
+        The decorator; the wrapper checks at every call whether instrumentation is on.
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _state["enabled"]:
+                return function(*args, **kwargs)
+            with _Span(function.__name__, phase) as stage:
+                for arg in args:
+                    if hasattr(arg, "shape"):
+                        stage.rows = arg.shape[0]
+                        break
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def read_sql_query(query: str, con: sqlite3.Connection) -> DataFrame:
+    """
+    Run pd.read_sql_query as a query stage and record the number of rows returned.
+
+    Args:
+        query (str): The SQL query.
+        con (sqlite3.Connection): A SQLite connection object.
+
+    Returns:
+        DataFrame: The query result.
+    """
+    with span("read_sql_query", "query") as stage:
+        data = pd.read_sql_query(query, con)
+        stage.rows = len(data)
+    return data
+
+
+def summary() -> DataFrame:
+    """
+    Summarize the recorded stages.
+
+    Self time excludes the time spent in nested stages, so summing it per phase splits
+    the wall time between query, compute and render without counting anything twice.
+
+    Returns:
+        DataFrame: Calls, total, self and mean wall time, rows and peak bytes per stage, slowest first.
+    """
+    totals = defaultdict(
+        lambda: {
+            "Calls": 0,
+            "Total s": 0.0,
+            "Self s": 0.0,
+            "Rows": 0,
+            "Peak Bytes": None,
+        }
+    )
+    for event in _events:
+        total = totals[(event["phase"], event["name"])]
+        total["Calls"] += 1
+        total["Total s"] += event["duration"]
+        total["Self s"] += event["self"]
+        total["Rows"] += event["rows"] or 0
+        if event["bytes"] is not None:
+            total["Peak Bytes"] = max(total["Peak Bytes"] or 0, event["bytes"])
+    table = pd.DataFrame.from_dict(totals, orient="index")
+    if table.empty:
+        return table
+    table.index.names = ["Phase", "Stage"]
+    table["Mean s"] = table["Total s"] / table["Calls"]
+    return table.sort_values(by="Total s", ascending=False)
+
+
+def write_chrome_trace(path: str) -> None:
+    """
+    Write the recorded stages as a Chrome trace, viewable in chrome://tracing or Perfetto.
+
+    Args:
+        path (str): The JSON file to write.
+
+    Returns:
+        None
+    """
+    origin = min((event["start"] for event in _events), default=0)
+    trace = [
+        {
+            "name": event["name"],
+            "cat": event["phase"],
+            "ph": "X",
+            "ts": (event["start"] - origin) * 1e6,
+            "dur": event["duration"] * 1e6,
+            "pid": os.getpid(),
+            "tid": event["thread"],
+            "args": {"rows": event["rows"], "bytes": event["bytes"]},
+        }
+        for event in _events
+    ]
+    with open(path, "w") as file:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, file)
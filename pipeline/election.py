@@ -0,0 +1,91 @@
+from pathlib import Path
+
+import pandas as pd
+from pandas import DataFrame
+from runner import Pipeline, import_project
+
+compute = import_project("Module 1 Capstone", "src.compute")
+plotting = import_project("Module 1 Capstone", "src.plotting")
+
+pipeline = Pipeline("election", county_facts=None, primary_results=None)
+
+
+@pipeline.step
+def raw_demographics(county_facts: Path) -> DataFrame:
+    return pd.read_csv(county_facts)
+
+
+@pipeline.step
+def raw_primary_results(primary_results: Path) -> DataFrame:
+    return pd.read_csv(primary_results)
+
+
+@pipeline.step
+def demographics(
+    raw_demographics: DataFrame,
+    columns_to_drop: list[str] = compute.columns_to_drop,
+    correlated_features: list[str] = compute.correlated_features,
+) -> DataFrame:
+    return compute.clean_demographics(
+        raw_demographics, columns_to_drop, correlated_features
+    )
+
+
+@pipeline.step
+def primary(raw_primary_results: DataFrame) -> DataFrame:
+    return compute.clean_primary_results(raw_primary_results)
+
+
+@pipeline.step
+def outcomes(primary: DataFrame, margin: float = 0.1) -> DataFrame:
+    return compute.election_outcomes(primary, "state", [margin])
+
+
+@pipeline.step
+def swing_states(primary: DataFrame, outcomes: DataFrame) -> list[str]:
+    """
+    Name the states whose margin is within the swing threshold, as the notebook's swing_states.
+    """
+    swing = outcomes.loc[
+        outcomes.filter(like="swing_").iloc[:, 0], "state_abbreviation"
+    ]
+    names = primary.drop_duplicates("state_abbreviation").set_index(
+        "state_abbreviation"
+    )["state"]
+    return sorted(set(names[swing]))
+
+
+@pipeline.step
+def merged(
+    demographics: DataFrame, primary: DataFrame, swing_states: list[str]
+) -> dict[str, DataFrame]:
+    return compute.merge_by_state(demographics, primary, swing_states)
+
+
+@pipeline.step
+def correlations(merged: dict[str, DataFrame]) -> DataFrame:
+    return compute.correlations_by_state(merged, remove_outliers=False)
+
+
+@pipeline.step
+def correlations_iqr(merged: dict[str, DataFrame]) -> DataFrame:
+    return compute.correlations_by_state(merged)
+
+
+@pipeline.step
+def top_features_plots(
+    merged: dict[str, DataFrame], correlations_iqr: DataFrame, n_features: int = 4
+) -> dict:
+    """
+    Plot the features most correlated with the Democrat vote share in every swing state, IQR outliers highlighted.
+    """
+    import matplotlib.pyplot as plt
+
+    figures = {}
+    for state, data in merged.items():
+        coefficients = correlations_iqr.loc[state, "Democrat Corr Coeff"].dropna()
+        features = list(coefficients.abs().nlargest(n_features).index)
+        axes = plotting.plot_features_no_outliers(data, features)
+        figures[state] = axes.flat[0].figure
+        plt.close(figures[state])
+    return figures
@@ -0,0 +1,67 @@
+import sqlite3
+from pathlib import Path
+
+from pandas import DataFrame
+from runner import Pipeline, import_project
+
+columnar = import_project("Module 2 Sprint 2", "utils.columnar")
+plotting = import_project("Module 2 Sprint 2", "utils.plotting")
+
+pipeline = Pipeline("podcast", database=None, drop_duplicates=False)
+
+
+@pipeline.step(cache=False)
+def store(database: Path) -> Path:
+    """
+    Export the columnar review store next to the database when it is missing or stale.
+    """
+    con = sqlite3.connect(database)
+    directory = database.with_name(columnar.store_directory)
+    if not (directory / "metadata.json").exists() or columnar.ReviewStore(
+        directory
+    ).is_stale(con):
+        columnar.export_columnar(con, directory)
+    return directory
+
+
+@pipeline.step
+def ratings(store: Path, drop_duplicates: bool) -> DataFrame:
+    return (
+        columnar.ReviewStore(store, drop_duplicates)
+        .ratings()["rating"]
+        .value_counts()
+        .sort_index()
+        .rename_axis("rating")
+        .reset_index(name="count")
+    )
+
+
+@pipeline.step
+def monthly_reviews(store: Path, drop_duplicates: bool) -> DataFrame:
+    return columnar.ReviewStore(store, drop_duplicates).monthly_reviews()
+
+
+@pipeline.step
+def ratings_by_category(store: Path, drop_duplicates: bool) -> DataFrame:
+    return columnar.ReviewStore(store, drop_duplicates).ratings_by_category()
+
+
+@pipeline.step
+def podcasts_reviews(store: Path, drop_duplicates: bool) -> DataFrame:
+    return columnar.ReviewStore(store, drop_duplicates).podcasts_reviews()
+
+
+@pipeline.step
+def plots(
+    ratings: DataFrame,
+    monthly_reviews: DataFrame,
+    ratings_by_category: DataFrame,
+    podcasts_reviews: DataFrame,
+    top_n: int = 10,
+) -> dict:
+    return {
+        "ratings": plotting.hist_figure(ratings, counts="count"),
+        "reviews_month": plotting.reviews_month_figure(monthly_reviews, top_n=top_n),
+        "ratings_categories": plotting.ratings_categories_figure(ratings_by_category),
+        "podcasts_reviews": plotting.podcasts_reviews_figure(podcasts_reviews),
+    }
@@ -0,0 +1,144 @@
+import argparse
+import importlib
+import json
+import sys
+from pathlib import Path
+
+from pandas import DataFrame, Series
+
+here = Path(__file__).resolve().parent
+projects = ["election", "survey", "podcast"]
+
+
+def parse_overrides(items: list[str]) -> dict:
+    """
+    Parse NAME=VALUE parameter overrides, reading each value as JSON and as a plain string otherwise.
+
+    Args:
+        items (list[str]): The overrides, NAME is "step.param" or "param" for every step with that parameter.
+
+    Returns:
+        dict: Values by name.
+    """
+    overrides = {}
+    for item in items:
+        name, separator, value = item.partition("=")
+        if not separator:
+            raise ValueError(f"expected NAME=VALUE, got {item}")
+        try:
+            overrides[name] = json.loads(value)
+        except json.JSONDecodeError:
+            overrides[name] = value
+    return overrides
+
+
+def write_output(value, path: Path) -> list[Path]:
+    """
+    Write a step output: tables as CSV, Plotly figures as HTML and matplotlib figures as PNG.
+
+    Dicts, lists and tuples are written item by item; other values are not written.
+
+    Args:
+        value: The step output.
+        path (Path): The file path without suffix.
+
+    Returns:
+        list[Path]: The files written.
+    """
+    if isinstance(value, (DataFrame, Series)):
+        value.to_csv(path.with_suffix(".csv"))
+        return [path.with_suffix(".csv")]
+    if hasattr(value, "write_html"):
+        value.write_html(path.with_suffix(".html"), include_plotlyjs="cdn")
+        return [path.with_suffix(".html")]
+    if hasattr(value, "savefig"):
+        value.savefig(path.with_suffix(".png"))
+        return [path.with_suffix(".png")]
+    if not isinstance(value, (dict, list, tuple)):
+        return []
+    items = value.items() if isinstance(value, dict) else enumerate(value)
+    written = []
+    for key, item in items:
+        written.extend(write_output(item, path.with_name(f"{path.name}_{key}")))
+    return written
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Run a project pipeline, recomputing only the steps whose code, parameters or inputs changed."
+    )
+    parser.add_argument("project", choices=projects)
+    parser.add_argument(
+        "targets", nargs="*", help="Steps to compute, the final steps by default."
+    )
+    parser.add_argument(
+        "--set",
+        dest="overrides",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help='Set a parameter of one step ("step.param") or of every step that has it ("param"); VALUE is read as JSON when it parses.',
+    )
+    parser.add_argument(
+        "--force",
+        action="append",
+        default=[],
+        metavar="STEP",
+        help="Run a step even when its output is cached.",
+    )
+    parser.add_argument("--cache-dir", type=Path, default=here / "artifacts")
+    parser.add_argument("--jobs", type=int, help="Worker threads, all CPUs by default.")
+    parser.add_argument("--output", type=Path, help="Write the target outputs here.")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Show the plan without running it."
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="Delete cached outputs of other parameter values or code versions afterwards.",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="List the steps and their parameters."
+    )
+    args = parser.parse_intermixed_args()
+
+    import matplotlib
+
+    matplotlib.use("Agg")
+    pipeline = importlib.import_module(args.project).pipeline
+    if args.list:
+        print("Pipeline-wide parameters:", pipeline.shared)
+        for step in pipeline.steps.values():
+            params = {
+                name: parameter.default
+                for name, parameter in step.params.items()
+                if name not in pipeline.shared
+            }
+            print(f"{step.name}({', '.join(step.inputs)}) {params}")
+        return 0
+
+    try:
+        overrides = parse_overrides(args.overrides)
+        plan = pipeline.plan(args.targets, overrides, args.cache_dir, tuple(args.force))
+    except ValueError as error:
+        parser.error(str(error))
+    if not args.dry_run:
+        outputs, plan = pipeline.run(
+            args.targets, overrides, args.cache_dir, tuple(args.force), args.jobs
+        )
+    print(plan.drop(columns="path").to_string(index=False))
+
+    if args.prune:
+        every_step = list(pipeline.steps)
+        keep = pipeline.plan(every_step, overrides, args.cache_dir)
+        print(f"Pruned {pipeline.prune(keep, args.cache_dir)} cached outputs")
+    if args.output and not args.dry_run:
+        args.output.mkdir(parents=True, exist_ok=True)
+        for name, value in outputs.items():
+            for path in write_output(value, args.output / name):
+                print(f"Wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
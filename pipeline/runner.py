@@ -0,0 +1,390 @@
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+import types
+import typing
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+from pandas import DataFrame
+
+here = Path(__file__).resolve().parent
+root = here.parent
+sys.path.append(str(root))
+
+from projects import import_project
+
+required = inspect.Parameter.empty
+
+
+def is_project_file(path: str | None) -> bool:
+    return path is not None and Path(path).resolve().is_relative_to(root)
+
+
+def project_module(value: Any) -> types.ModuleType | None:
+    """
+    Return the project module a value is or was defined in, None for installed packages and builtins.
+    """
+    if not isinstance(value, types.ModuleType):
+        value = sys.modules.get(getattr(value, "__module__", None) or "")
+    if value is not None and is_project_file(getattr(value, "__file__", None)):
+        return value
+    return None
+
+
+def module_closure(module: types.ModuleType) -> set[types.ModuleType]:
+    """
+    Find a project module and every project module it imports, directly or through other project modules.
+
+    A module counts as imported when one of its globals is that module or was defined in it,
+    which covers `import src.compute as compute` and `from src.features import FeatureFrame`.
+    """
+    found, pending = set(), [module]
+    while pending:
+        module = pending.pop()
+        if module in found:
+            continue
+        found.add(module)
+        for value in list(vars(module).values()):
+            imported = project_module(value)
+            if imported is not None and imported not in found:
+                pending.append(imported)
+    return found
+
+
+def code_fingerprint(function: Callable) -> str:
+    """
+    Hash the source of a step function and of all the project code it depends on.
+
+    Helper functions defined next to the step are hashed by their source and followed
+    in turn. Project modules the step refers to, directly or through such a helper or
+    an imported function, are hashed by their file contents together with every project
+    module they import, transitively: editing src/features.py invalidates the steps that
+    call src/compute.py, which imports it. Installed packages are not hashed.
+
+    Args:
+        function (Callable): The step function.
+
+    Returns:
+        str: The hex digest.
+    """
+    function = inspect.unwrap(function)
+    home = function.__module__
+    sources, modules, pending = {}, set(), [function]
+    while pending:
+        function = pending.pop()
+        name = f"{function.__module__}.{function.__qualname__}"
+        if name in sources:
+            continue
+        sources[name] = inspect.getsource(function)
+        references = inspect.getclosurevars(function)
+        for value in [*references.nonlocals.values(), *references.globals.values()]:
+            if inspect.isfunction(value):
+                value = inspect.unwrap(value)
+                if value.__module__ == home and is_project_file(
+                    inspect.getsourcefile(value)
+                ):
+                    pending.append(value)
+                    continue
+            module = project_module(value)
+            if module is not None and module.__name__ != home:
+                modules.update(module_closure(module))
+    digest = hashlib.sha256()
+    for name in sorted(sources):
+        digest.update(sources[name].encode())
+    for path in sorted(str(Path(module.__file__).resolve()) for module in modules):
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+def encode_param(value: Any) -> Any:
+    """
+    Encode a parameter value for hashing: files by path, size and modification time, anything else by repr.
+    """
+    if isinstance(value, Path):
+        path = value.resolve()
+        if path.is_file():
+            stat = path.stat()
+            return [str(path), stat.st_size, stat.st_mtime_ns]
+        return str(path)
+    return repr(value)
+
+
+def coerce(annotation: Any, value: Any) -> Any:
+    """
+    Convert a parameter value given on the command line to the annotated type.
+
+    Strings become Paths and lists become tuples where the step function asks for them.
+    """
+    if annotation is Path and isinstance(value, str):
+        return Path(value)
+    if typing.get_origin(annotation) is tuple and isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+class Step(NamedTuple):
+    name: str
+    function: Callable
+    inputs: tuple[str, ...]
+    params: dict[str, inspect.Parameter]
+    cache: bool
+
+
+class Pipeline:
+    """
+    A DAG of named steps whose outputs are cached by a hash of their code, parameters and inputs.
+
+    Every argument of a step function named after an earlier step receives that step's
+    output, the others are parameters: a step's own defaults, or pipeline-wide values
+    such as the database path that several steps share. A step's key hashes its code,
+    its parameters (files by size and modification time) and the keys of its inputs,
+    so all keys are known before anything runs and a changed parameter changes the
+    key of its step and of every step downstream of it, and of nothing else.
+    """
+
+    def __init__(self, name: str, **shared):
+        self.name = name
+        self.shared = shared
+        self.steps: dict[str, Step] = {}
+
+    def step(self, function: Callable | None = None, *, cache: bool = True):
+        """
+        Register a function as a step named after it, usable as @pipeline.step or @pipeline.step(cache=False).
+
+        Args:
+            function (Callable | None): The step function.
+            cache (bool): Store the output in the artifact cache, False for steps that are cheaper to rerun than to load.
+
+        Returns:
+            Callable: The function, unchanged.
+        """
+        if function is None:
+            return lambda function: self.step(function, cache=cache)
+        name = function.__name__
+        if name in self.steps or name in self.shared:
+            raise ValueError(f"{self.name} already has a step or parameter {name}")
+        inputs, params = [], {}
+        for parameter in inspect.signature(function).parameters.values():
+            if parameter.name in self.steps:
+                inputs.append(parameter.name)
+            else:
+                params[parameter.name] = parameter
+        self.steps[name] = Step(name, function, tuple(inputs), params, cache)
+        return function
+
+    def resolve_params(
+        self, names: list[str], overrides: dict[str, Any]
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Resolve the parameters of some steps.
+
+        Args:
+            names (list[str]): The steps.
+            overrides (dict[str, Any]): Values by "step.param", or by "param" for every step with that parameter.
+
+        Returns:
+            dict[str, dict[str, Any]]: Parameter values by step.
+        """
+        known = set(self.shared)
+        for step in self.steps.values():
+            known.update(step.params)
+            known.update(f"{step.name}.{param}" for param in step.params)
+        unknown = sorted(set(overrides) - known)
+        if unknown:
+            raise ValueError(f"{self.name} has no parameter {', '.join(unknown)}")
+        shared = {**self.shared, **overrides}
+        resolved = {}
+        for step in map(self.steps.get, names):
+            values = {}
+            for param, parameter in step.params.items():
+                value = overrides.get(f"{step.name}.{param}", required)
+                if value is required:
+                    value = shared.get(param, parameter.default)
+                if value is required or value is None and param in self.shared:
+                    raise ValueError(f"step {step.name} needs the parameter {param}")
+                values[param] = coerce(parameter.annotation, value)
+            resolved[step.name] = values
+        return resolved
+
+    def leaves(self) -> list[str]:
+        """
+        List the steps no other step depends on.
+        """
+        used = {name for step in self.steps.values() for name in step.inputs}
+        return [name for name in self.steps if name not in used]
+
+    def upstream(self, targets: list[str]) -> list[str]:
+        """
+        List the targets and every step they depend on, in definition order.
+        """
+        unknown = sorted(set(targets) - set(self.steps))
+        if unknown:
+            raise ValueError(f"{self.name} has no step {', '.join(unknown)}")
+        needed = set(targets)
+        for step in reversed(self.steps.values()):
+            if step.name in needed:
+                needed.update(step.inputs)
+        return [name for name in self.steps if name in needed]
+
+    def plan(
+        self,
+        targets: list[str] | None = None,
+        overrides: dict[str, Any] | None = None,
+        cache_dir: Path = here / "artifacts",
+        force: tuple[str, ...] = (),
+    ) -> DataFrame:
+        """
+        Decide which steps to run, which cached outputs to load and which steps to skip.
+
+        A step runs when its output is not cached under its key. A cached output is only
+        loaded when a target or a step that runs needs it, so a change at the end of the
+        pipeline does not load anything above the changed step's inputs.
+
+        Args:
+            targets (list[str] | None): The steps whose outputs are wanted, the leaves when None.
+            overrides (dict[str, Any] | None): Parameter values by "step.param", or by "param" for every step with that parameter.
+            cache_dir (Path): The artifact cache folder.
+            force (tuple[str, ...]): Steps to run even when their output is cached.
+
+        Returns:
+            DataFrame: step, key, status ("run", "load" or "skip") and the artifact path, in definition order.
+        """
+        targets = targets or self.leaves()
+        overrides = overrides or {}
+        names = self.upstream(targets)
+        params = self.resolve_params(names, overrides)
+        keys = {}
+        for name in names:
+            step = self.steps[name]
+            payload = {
+                "step": name,
+                "code": code_fingerprint(step.function),
+                "params": params[name],
+                "inputs": [keys[input] for input in step.inputs],
+            }
+            keys[name] = hashlib.sha256(
+                json.dumps(payload, sort_keys=True, default=encode_param).encode()
+            ).hexdigest()[:16]
+
+        paths = {
+            name: cache_dir / self.name / f"{name}-{keys[name]}.pkl" for name in names
+        }
+        wanted = set(targets)
+        status = {}
+        for name in reversed(names):
+            step = self.steps[name]
+            if name not in wanted:
+                status[name] = "skip"
+            elif step.cache and name not in force and paths[name].exists():
+                status[name] = "load"
+            else:
+                status[name] = "run"
+                wanted.update(step.inputs)
+        return DataFrame(
+            {
+                "step": names,
+                "key": [keys[name] for name in names],
+                "status": [status[name] for name in names],
+                "path": [paths[name] for name in names],
+            }
+        )
+
+    def execute(self, step: Step, params: dict, inputs: list, path: Path, run: bool):
+        start = time.perf_counter()
+        if not run:
+            with open(path, "rb") as file:
+                return pickle.load(file), time.perf_counter() - start
+        output = step.function(*inputs, **params)
+        if step.cache:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as file:
+                pickle.dump(output, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(file.name, path)
+        return output, time.perf_counter() - start
+
+    def run(
+        self,
+        targets: list[str] | None = None,
+        overrides: dict[str, Any] | None = None,
+        cache_dir: Path = here / "artifacts",
+        force: tuple[str, ...] = (),
+        n_jobs: int | None = None,
+    ) -> tuple[dict[str, Any], DataFrame]:
+        """
+        Run the pipeline, reusing cached outputs and running independent steps in threads.
+
+        A step is started as soon as the outputs of all its inputs are available. Outputs
+        are written to the cache under a temporary name and renamed, so an interrupted
+        run never leaves a partial artifact behind.
+
+        Args:
+            targets (list[str] | None): The steps whose outputs are wanted, the leaves when None.
+            overrides (dict[str, Any] | None): Parameter values by "step.param", or by "param" for every step with that parameter.
+            cache_dir (Path): The artifact cache folder.
+            force (tuple[str, ...]): Steps to run even when their output is cached.
+            n_jobs (int | None): The number of worker threads, all CPUs when None.
+
+        Returns:
+            tuple[dict[str, Any], DataFrame]: The outputs of the targets, and the plan with the seconds every step took.
+        """
+        targets = targets or self.leaves()
+        overrides = overrides or {}
+        plan = self.plan(targets, overrides, cache_dir, force)
+        params = self.resolve_params(list(plan["step"]), overrides)
+        paths = dict(zip(plan["step"], plan["path"]))
+        pending = {
+            name: status == "run"
+            for name, status in zip(plan["step"], plan["status"])
+            if status != "skip"
+        }
+        outputs, seconds, running = {}, {}, {}
+        n_jobs = n_jobs or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            while pending or running:
+                for name, run in list(pending.items()):
+                    step = self.steps[name]
+                    if run and not all(input in outputs for input in step.inputs):
+                        continue
+                    inputs = [outputs[input] for input in step.inputs] if run else []
+                    future = executor.submit(
+                        self.execute, step, params[name], inputs, paths[name], run
+                    )
+                    running[future] = name
+                    del pending[name]
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    if future.exception() is not None:
+                        for other in running:
+                            other.cancel()
+                        raise future.exception()
+                    outputs[name], seconds[name] = future.result()
+
+        plan["seconds"] = plan["step"].map(seconds)
+        return {name: outputs[name] for name in targets}, plan
+
+    def prune(self, keep: DataFrame, cache_dir: Path = here / "artifacts") -> int:
+        """
+        Delete the cached outputs of this pipeline that are not in a plan, e.g. those of earlier parameter values.
+
+        Args:
+            keep (DataFrame): A plan returned by plan or run, of all the steps that should keep their outputs.
+            cache_dir (Path): The artifact cache folder.
+
+        Returns:
+            int: The number of files deleted.
+        """
+        keep = set(keep["path"])
+        deleted = 0
+        for path in (cache_dir / self.name).glob("*.pkl"):
+            if path not in keep:
+                path.unlink()
+                deleted += 1
+        return deleted
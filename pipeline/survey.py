@@ -0,0 +1,84 @@
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+from pandas import DataFrame
+from runner import Pipeline, import_project
+
+model = import_project("Module 2 Sprint 1", "utils.model")
+plotting = import_project("Module 2 Sprint 1", "utils.plotting")
+stratified = import_project("Module 2 Sprint 1", "utils.stratified")
+
+pipeline = Pipeline(
+    "survey", database=None, excluded_surveys=(2014, 2016), group_uncertain=True
+)
+
+
+@pipeline.step
+def associations(
+    database: Path, excluded_surveys: tuple[int, ...], group_uncertain: bool
+) -> tuple[DataFrame, DataFrame]:
+    con = sqlite3.connect(database)
+    return stratified.stratified_relationships(con, excluded_surveys, group_uncertain)
+
+
+@pipeline.step
+def crosstabs(
+    database: Path, excluded_surveys: tuple[int, ...], group_uncertain: bool
+) -> dict[int, DataFrame]:
+    """
+    Count every question's answers against question 33, pooled over survey years, as analyze_relationship does.
+    """
+    con = sqlite3.connect(database)
+    query = stratified.stratified_query(excluded_surveys, group_uncertain)
+    return stratified.pooled_crosstabs(pd.read_sql_query(query, con))
+
+
+@pipeline.step
+def relationship_plots(
+    associations: tuple[DataFrame, DataFrame],
+    crosstabs: dict[int, DataFrame],
+    top: int = 10,
+) -> dict:
+    """
+    Draw the relationship figure of the questions most associated with question 33.
+    """
+    _, pooled = associations
+    figures = {}
+    for question, text in pooled["questiontext"].head(top).items():
+        cross_tab = crosstabs[question]
+        cross_tab = cross_tab.div(cross_tab.sum(axis=1), axis=0)
+        figures[question] = plotting.relationship_figure(cross_tab, text)
+    return figures
+
+
+@pipeline.step
+def respondents(
+    database: Path, excluded_surveys: tuple[int, ...], min_count: int = 10
+) -> tuple:
+    con = sqlite3.connect(database)
+    return model.respondent_matrix(con, excluded_surveys, min_count)
+
+
+@pipeline.step
+def target(
+    respondents: tuple,
+    group_uncertain: bool,
+    excluded_questions: tuple[int, ...] = (),
+) -> tuple:
+    matrix, _, columns = respondents
+    return model.disorder_target(matrix, columns, excluded_questions, group_uncertain)
+
+
+@pipeline.step
+def importance(
+    target: tuple,
+    model_name: str = "logistic",
+    n_folds: int = 5,
+    n_jobs: int | None = None,
+    seed: int = 0,
+) -> tuple[DataFrame, DataFrame]:
+    X, y, _, columns = target
+    return model.cross_validate_disorder(
+        X, y, columns, model_name, n_folds, n_jobs, seed
+    )
@@ -0,0 +1,63 @@
+import importlib
+
+import runner
+
+calls = []
+toy = runner.Pipeline("toy", scale=1)
+
+
+@toy.step
+def source(scale: int) -> int:
+    calls.append("source")
+    return 10 * scale
+
+
+@toy.step
+def shifted(source: int, shift: int = 1) -> int:
+    calls.append("shifted")
+    return source + shift
+
+
+@toy.step
+def doubled(source: int) -> int:
+    calls.append("doubled")
+    return source * 2
+
+
+def test_changed_parameter_reruns_only_downstream_steps(tmp_path):
+    calls.clear()
+    outputs, plan = toy.run(cache_dir=tmp_path, n_jobs=1)
+    assert outputs == {"shifted": 11, "doubled": 20}
+    assert sorted(calls) == ["doubled", "shifted", "source"]
+
+    calls.clear()
+    outputs, plan = toy.run(overrides={"shift": 5}, cache_dir=tmp_path, n_jobs=1)
+    assert outputs == {"shifted": 15, "doubled": 20}
+    assert calls == ["shifted"]
+    assert dict(zip(plan["step"], plan["status"])) == {
+        "source": "load",
+        "shifted": "run",
+        "doubled": "load",
+    }
+
+    calls.clear()
+    toy.run(overrides={"scale": 2}, cache_dir=tmp_path, n_jobs=1)
+    assert sorted(calls) == ["doubled", "shifted", "source"]
+
+
+def test_fingerprint_follows_imported_project_modules(tmp_path, monkeypatch):
+    (tmp_path / "fp_base.py").write_text("def scale(x):\n    return x * 2\n")
+    (tmp_path / "fp_middle.py").write_text(
+        "from fp_base import scale\n\n\ndef double(x):\n    return scale(x)\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(runner, "root", tmp_path)
+    middle = importlib.import_module("fp_middle")
+
+    def step(value):
+        return middle.double(value)
+
+    before = runner.code_fingerprint(step)
+    assert runner.code_fingerprint(step) == before
+    (tmp_path / "fp_base.py").write_text("def scale(x):\n    return x * 3\n")
+    assert runner.code_fingerprint(step) != before
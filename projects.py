@@ -0,0 +1,20 @@
+import importlib
+import sys
+from pathlib import Path
+
+root = Path(__file__).resolve().parent
+
+
+def import_project(project: str, module: str):
+    """
+    Import a module of one project with the project folder as the import root.
+
+    Args:
+        project (str): The project folder, e.g. "Module 1 Capstone".
+        module (str): The module name, e.g. "src.compute".
+
+    Returns:
+        module: The imported module.
+    """
+    sys.path.insert(0, str(root / project))
+    return importlib.import_module(module)